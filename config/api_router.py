@@ -2,11 +2,23 @@ from django.conf import settings
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from foros.casos.api.views import CambiosViewSet
+from foros.casos.api.views import CasoViewSet
+from foros.casos.api.views import ClienteViewSet
+from foros.casos.api.views import ExpedienteSipedViewSet
+from foros.casos.api.views import MovimientoViewSet
+from foros.casos.api.views import TareaViewSet
 from foros.users.api.views import UserViewSet
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("clientes", ClienteViewSet)
+router.register("expedientes", ExpedienteSipedViewSet, basename="expediente")
+router.register("movimientos", MovimientoViewSet)
+router.register("casos", CasoViewSet)
+router.register("tareas", TareaViewSet)
+router.register("changes", CambiosViewSet, basename="cambios")
 
 
 app_name = "api"
@@ -48,6 +48,13 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Otra conexión a la misma base: por ella se escribe el progreso de las
+# importaciones que corren en una sola transacción (ver foros/casos/tasks.py).
+DATABASES["progreso"] = {
+    **DATABASES["default"],
+    "ATOMIC_REQUESTS": False,
+    "TEST": {"MIRROR": "default"},
+}
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -69,6 +76,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -352,3 +360,14 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Importación de movimientos SIPED: confirmar la transacción cada N filas.
+# Con 0 todo el archivo se importa en una única transacción (todo o nada) y
+# el progreso de cada lote se escribe por otra conexión a la base de datos.
+CASOS_IMPORTACION_COMMIT_CADA = env.int("CASOS_IMPORTACION_COMMIT_CADA", default=5000)
+# Procesos con que se leen (reparan, parsean y normalizan) los CSV de
+# movimientos. Cada worker de Celery ya es un proceso: subirlo solo en los
+# nodos con núcleos libres. 1 lee en el mismo proceso que importa.
+CASOS_IMPORTACION_PROCESOS = env.int("CASOS_IMPORTACION_PROCESOS", default=1)
+# Compilar todas las plantillas al arrancar cada worker WSGI (ver
+# foros/casos/plantillas.py). Si alguna falta o no compila, no arranca.
+CASOS_PRECARGAR_PLANTILLAS = env.bool("CASOS_PRECARGAR_PLANTILLAS", default=False)
@@ -4,6 +4,7 @@ from .base import DATABASES
 from .base import INSTALLED_APPS
 from .base import REDIS_URL
 from .base import SPECTACULAR_SETTINGS
+from .base import TEMPLATES
 from .base import env
 
 # GENERAL
@@ -74,6 +75,23 @@ STORAGES = {
     },
 }
 
+# TEMPLATES
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/templates/api/#django.template.loaders.cached.Loader
+# Con DEBUG=False Django ya usa el cargador en caché; se fija explícitamente
+# para no depender de DEBUG, y config/wsgi.py precarga las plantillas.
+TEMPLATES[-1]["APP_DIRS"] = False
+TEMPLATES[-1]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+CASOS_PRECARGAR_PLANTILLAS = env.bool("CASOS_PRECARGAR_PLANTILLAS", default=True)
+
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#default-from-email
@@ -18,8 +18,11 @@ import os
 import sys
 from pathlib import Path
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
+from foros.casos.plantillas import precargar_plantillas
+
 # This allows easy placement of apps within the interior
 # foros directory.
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
@@ -30,3 +33,8 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 # file. This includes Django's development server, if the WSGI_APPLICATION
 # setting points here.
 application = get_wsgi_application()
+
+# Compila las plantillas antes del primer pedido y falla al arrancar si
+# alguna no existe.
+if settings.CASOS_PRECARGAR_PLANTILLAS:
+    precargar_plantillas()
@@ -1 +1,10 @@
-# Register your models here.
+from django.contrib import admin
+
+from .models import ReglaTarea
+
+
+@admin.register(ReglaTarea)
+class ReglaTareaAdmin(admin.ModelAdmin):
+    list_display = ["nombre", "activa", "tipo", "estado", "generado_por", "dias_plazo"]
+    list_filter = ["activa"]
+    search_fields = ["nombre", "titulo"]
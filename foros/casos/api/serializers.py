@@ -0,0 +1,221 @@
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+
+from foros.casos.models import Caso
+from foros.casos.models import ExpedienteSiped
+from foros.casos.models import Movimiento
+from foros.casos.models import Tarea
+from foros.clientes.models import Cliente
+
+# Campo del filtro -> lookup sobre Tarea.
+LOOKUPS_FILTRO = {
+    "ids": "pk__in",
+    "caso": "caso",
+    "responsable": "responsable",
+    "estado": "estado__in",
+    "fecha_limite_desde": "fecha_limite__gte",
+    "fecha_limite_hasta": "fecha_limite__lte",
+}
+
+
+class CamposSerializer(serializers.ModelSerializer):
+    """
+    Con ?fields=a,b en la consulta devuelve solo esos campos, para que los
+    clientes que sincronizan no reciban columnas que no usan.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        campos = request.query_params.get("fields") if request else None
+        if campos:
+            pedidos = {campo.strip() for campo in campos.split(",")}
+            for campo in set(self.fields) - pedidos:
+                self.fields.pop(campo)
+
+
+class ClienteSerializer(CamposSerializer):
+    class Meta:
+        model = Cliente
+        fields = [
+            "id",
+            "nombre_razon_social",
+            "cuit_cuil",
+            "email",
+            "telefono",
+            "domicilio",
+        ]
+
+
+class ExpedienteSipedSerializer(CamposSerializer):
+    class Meta:
+        model = ExpedienteSiped
+        fields = [
+            "id",
+            "expediente",
+            "caratula",
+            "partes",
+            "estado",
+            "fec_ult_mov",
+            "localidad",
+            "dependencia",
+            "secretaria",
+            "link_detalle",
+            "cantidad_movimientos",
+            "ultimo_movimiento_fecha",
+            "ultimo_movimiento_tipo",
+            "ultimo_movimiento_estado",
+            "actualizado",
+        ]
+
+
+class MovimientoSerializer(CamposSerializer):
+    class Meta:
+        model = Movimiento
+        fields = [
+            "id",
+            "expediente",
+            "nombre_escrito",
+            "link_escrito",
+            "fecha_presentacion",
+            "tipo",
+            "estado",
+            "generado_por",
+            "descripcion",
+            "fecha_firma",
+            "fecha_publicacion",
+            "actualizado",
+        ]
+
+
+class CasoSerializer(CamposSerializer):
+    # Las relaciones van como id; estos campos salen del select_related.
+    cliente_nombre = serializers.CharField(
+        source="cliente.nombre_razon_social",
+        read_only=True,
+    )
+    expediente_numero = serializers.CharField(
+        source="expediente.expediente",
+        read_only=True,
+        allow_null=True,
+    )
+    responsable_username = serializers.CharField(
+        source="responsable.username",
+        read_only=True,
+        allow_null=True,
+    )
+
+    class Meta:
+        model = Caso
+        fields = [
+            "id",
+            "titulo_interno",
+            "naturaleza",
+            "fecha_ingreso",
+            "cliente",
+            "cliente_nombre",
+            "expediente",
+            "expediente_numero",
+            "responsable",
+            "responsable_username",
+            "actualizado",
+        ]
+
+
+class TareaSerializer(CamposSerializer):
+    class Meta:
+        model = Tarea
+        fields = [
+            "id",
+            "caso",
+            "responsable",
+            "creado_por",
+            "regla",
+            "movimiento",
+            "titulo",
+            "descripcion",
+            "estado",
+            "fecha_inicio",
+            "fecha_limite",
+            "fecha_terminacion",
+            "fecha_creacion",
+            "actualizado",
+        ]
+
+
+class EliminadoSerializer(serializers.Serializer):
+    modelo = serializers.CharField()
+    id = serializers.IntegerField(source="objeto_id")
+
+
+class CambiosSerializer(serializers.Serializer):
+    """Una lectura del feed de cambios (ver foros.casos.cambios)."""
+
+    cursor = serializers.CharField(help_text="Valor de ?since= para seguir")
+    hay_mas = serializers.BooleanField()
+    expedientes = ExpedienteSipedSerializer(many=True)
+    movimientos = MovimientoSerializer(many=True)
+    casos = CasoSerializer(many=True)
+    tareas = TareaSerializer(many=True)
+    eliminados = EliminadoSerializer(many=True)
+
+
+class FiltroTareasSerializer(serializers.Serializer):
+    """Tareas a las que se aplica una operación masiva (todas las condiciones)."""
+
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    caso = serializers.PrimaryKeyRelatedField(
+        queryset=Caso.objects.all(),
+        required=False,
+    )
+    responsable = serializers.PrimaryKeyRelatedField(
+        queryset=get_user_model().objects.all(),
+        required=False,
+        allow_null=True,
+    )
+    estado = serializers.ListField(
+        child=serializers.ChoiceField(choices=Tarea.Estado.choices),
+        required=False,
+    )
+    fecha_limite_desde = serializers.DateField(required=False)
+    fecha_limite_hasta = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            msg = "Indique al menos un filtro."
+            raise serializers.ValidationError(msg)
+        return attrs
+
+
+class CambiosTareasSerializer(serializers.Serializer):
+    estado = serializers.ChoiceField(choices=Tarea.Estado.choices, required=False)
+    responsable = serializers.PrimaryKeyRelatedField(
+        queryset=get_user_model().objects.all(),
+        required=False,
+        allow_null=True,
+    )
+    fecha_limite = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if not attrs:
+            msg = "Indique al menos un cambio."
+            raise serializers.ValidationError(msg)
+        return attrs
+
+
+class TareasMasivoSerializer(serializers.Serializer):
+    filtro = FiltroTareasSerializer()
+    cambios = CambiosTareasSerializer()
+
+    def filtrar(self, tareas):
+        """Las tareas del queryset que cumplen el filtro validado."""
+        filtro = self.validated_data["filtro"]
+        return tareas.filter(
+            **{LOOKUPS_FILTRO[campo]: valor for campo, valor in filtro.items()},
+        )
+
+
+class ResultadoMasivoSerializer(serializers.Serializer):
+    actualizadas = serializers.IntegerField()
+    completadas = serializers.IntegerField(required=False)
+    reabiertas = serializers.IntegerField(required=False)
@@ -0,0 +1,260 @@
+import hashlib
+
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+from drf_spectacular.utils import OpenApiParameter
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from foros.casos.cambios import ELIMINADOS
+from foros.casos.cambios import MODELOS
+from foros.casos.cambios import decodificar_cursor
+from foros.casos.cambios import leer_cambios
+from foros.casos.models import Caso
+from foros.casos.models import Eliminacion
+from foros.casos.models import ExpedienteSiped
+from foros.casos.models import Movimiento
+from foros.casos.models import Tarea
+from foros.casos.tareas import actualizar_tareas
+from foros.clientes.models import Cliente
+
+from .serializers import CambiosSerializer
+from .serializers import CasoSerializer
+from .serializers import ClienteSerializer
+from .serializers import ExpedienteSipedSerializer
+from .serializers import MovimientoSerializer
+from .serializers import ResultadoMasivoSerializer
+from .serializers import TareaSerializer
+from .serializers import TareasMasivoSerializer
+
+
+class PaginacionCursor(CursorPagination):
+    """
+    Paginación por cursor sobre la clave primaria: cada página es un
+    WHERE id > n ORDER BY id LIMIT, sin OFFSET ni COUNT(*), y un cliente que
+    sincroniza puede guardar el cursor `next` y seguir desde ahí.
+    """
+
+    ordering = "pk"
+    page_size = 500
+    page_size_query_param = "page_size"
+    max_page_size = 5000
+
+
+class CondicionalMixin:
+    """
+    GET condicionales para list y retrieve.
+
+    Toda respuesta lleva un ETag con el hash del contenido, así que un
+    cliente que manda If-None-Match recibe un 304 sin el cuerpo. Si la vista
+    define `last_modified_field`, además se manda Last-Modified con el
+    máximo de ese campo, que se calcula antes de serializar: con
+    If-Modified-Since al día el 304 sale de una sola consulta.
+    """
+
+    last_modified_field = None
+
+    def ultima_modificacion(self):
+        if self.last_modified_field is None:
+            return None
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+            )
+        ultima = queryset.order_by().aggregate(ultima=Max(self.last_modified_field))
+        return ultima["ultima"]
+
+    def list(self, request, *args, **kwargs):
+        return self._condicional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._condicional(super().retrieve, request, *args, **kwargs)
+
+    def _condicional(self, vista, request, *args, **kwargs):
+        ultima = self.ultima_modificacion()
+        if ultima is not None:
+            ultima = int(ultima.timestamp())
+            no_modificado = get_conditional_response(request, last_modified=ultima)
+            if no_modificado is not None:
+                return no_modificado
+        response = vista(request, *args, **kwargs)
+        if ultima is not None:
+            response["Last-Modified"] = http_date(ultima)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            request.method in ("GET", "HEAD")
+            and response.status_code == status.HTTP_200_OK
+            and isinstance(response, Response)
+        ):
+            response.render()
+            contenido = hashlib.md5(response.content, usedforsecurity=False)
+            response["ETag"] = quote_etag(contenido.hexdigest())
+            response = get_conditional_response(
+                request,
+                etag=response["ETag"],
+                response=response,
+            )
+        return response
+
+
+class LecturaViewSet(
+    CondicionalMixin,
+    ListModelMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
+):
+    """
+    Listado y detalle de solo lectura, paginados por cursor. Los campos de
+    `filtros` se pueden pasar como ?campo=<id> para filtrar el listado.
+    """
+
+    pagination_class = PaginacionCursor
+    filtros = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        for campo in self.filtros:
+            valor = self.request.query_params.get(campo)
+            if valor is None:
+                continue
+            if not valor.isdigit():
+                raise ValidationError({campo: "Debe ser un id."})
+            queryset = queryset.filter(**{campo: valor})
+        return queryset
+
+    def ultima_modificacion(self):
+        ultima = super().ultima_modificacion()
+        if ultima is None or self.action != "list":
+            return ultima
+        # El máximo de `actualizado` no ve las bajas: una lista de la que se
+        # borró una fila también cambió. Se toma la última baja de cualquier
+        # modelo, que sale del índice por fecha.
+        borrado = Eliminacion.objects.aggregate(ultimo=Max("fecha"))["ultimo"]
+        return max(ultima, borrado) if borrado else ultima
+
+
+class ClienteViewSet(LecturaViewSet):
+    queryset = Cliente.objects.all()
+    serializer_class = ClienteSerializer
+
+
+class ExpedienteSipedViewSet(LecturaViewSet):
+    # Sin el vector de búsqueda ni el hash de importación, que no se envían.
+    queryset = ExpedienteSiped.objects.defer("busqueda", "hash_origen")
+    serializer_class = ExpedienteSipedSerializer
+    last_modified_field = "actualizado"
+
+
+class MovimientoViewSet(LecturaViewSet):
+    queryset = Movimiento.objects.defer("busqueda", "hash_origen")
+    serializer_class = MovimientoSerializer
+    filtros = ("expediente",)
+    last_modified_field = "actualizado"
+
+
+class CasoViewSet(LecturaViewSet):
+    queryset = Caso.objects.select_related(
+        "cliente",
+        "expediente",
+        "responsable",
+    ).only(
+        "titulo_interno",
+        "naturaleza",
+        "fecha_ingreso",
+        "actualizado",
+        # Para el cursor del feed de cambios.
+        "transaccion",
+        "cliente__nombre_razon_social",
+        "expediente__expediente",
+        "responsable__username",
+    )
+    serializer_class = CasoSerializer
+    filtros = ("cliente", "expediente", "responsable")
+    last_modified_field = "actualizado"
+
+
+class TareaViewSet(LecturaViewSet):
+    queryset = Tarea.objects.all()
+    serializer_class = TareaSerializer
+    filtros = ("caso", "responsable")
+    last_modified_field = "actualizado"
+
+    @extend_schema(
+        request=TareasMasivoSerializer,
+        responses=ResultadoMasivoSerializer,
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAdminUser],
+        serializer_class=TareasMasivoSerializer,
+    )
+    def masivo(self, request):
+        """
+        Cambia estado, responsable y/o fecha límite de todas las tareas que
+        cumplen el filtro, con un UPDATE por grupo en lugar de uno por tarea.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        conteos = actualizar_tareas(
+            serializer.filtrar(self.get_queryset()),
+            serializer.validated_data["cambios"],
+            timezone.localdate(),
+        )
+        return Response(status=status.HTTP_200_OK, data=conteos)
+
+
+class CambiosViewSet(GenericViewSet):
+    """
+    Feed de cambios para la sincronización incremental: con ?since=<cursor>
+    devuelve las filas creadas, modificadas o borradas desde la lectura que
+    dio ese cursor; sin él, todas desde el principio. Si `hay_mas` es
+    verdadero quedan cambios y hay que volver a pedir con el cursor nuevo.
+    """
+
+    serializer_class = CambiosSerializer
+    pagination_class = None
+
+    VISTAS = (
+        ExpedienteSipedViewSet,
+        MovimientoViewSet,
+        CasoViewSet,
+        TareaViewSet,
+    )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("since", str, description="Cursor de la lectura anterior"),
+        ],
+    )
+    def list(self, request):
+        posiciones = None
+        if since := request.query_params.get("since"):
+            posiciones = decodificar_cursor(since)
+            if posiciones is None:
+                raise ValidationError({"since": "Cursor inválido."})
+        fuentes = {
+            MODELOS[vista.queryset.model]: vista.queryset for vista in self.VISTAS
+        }
+        fuentes[ELIMINADOS] = Eliminacion.objects.all()
+        lectura = leer_cambios(fuentes, posiciones)
+        serializer = self.get_serializer(
+            {"cursor": lectura.cursor, "hay_mas": lectura.hay_mas, **lectura.filas},
+        )
+        return Response(serializer.data)
@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class CasosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "foros.casos"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import foros.casos.signals  # noqa: F401, PLC0415
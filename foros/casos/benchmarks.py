@@ -0,0 +1,458 @@
+"""
+Benchmark de las importaciones del SIPED con datos sintéticos.
+
+Genera CSV parecidos a los exportados por el SIPED (con líneas cortadas en
+las descripciones de los movimientos) y mide cada escenario de punta a
+punta: la subida por la vista, la tarea de Celery (en modo eager) y las
+escrituras en la base de datos. Lo usa el comando benchmark_importacion.
+
+medir_plantillas() compara el tiempo de respuesta de dos páginas con cada
+forma de cargar las plantillas (ver plantillas.py).
+"""
+
+import contextlib
+import copy
+import json
+import random
+import resource
+import statistics
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from datetime import date
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from foros.clientes.models import Cliente
+
+from .csv_siped import abrir_texto
+from .csv_siped import partir_en_bloques
+from .csv_siped import reparar_bloques
+from .models import Caso
+from .models import ExpedienteSiped
+from .models import ImportJob
+from .models import Movimiento
+from .plantillas import precargar_plantillas
+
+TAMANIOS = (1_000, 10_000, 100_000, 1_000_000)
+
+ESCENARIOS = ("reparacion", "expedientes", "movimientos", "movimientos_global")
+
+# Proporción de movimientos cuya descripción queda cortada en dos líneas.
+PROPORCION_LINEAS_CORTADAS = 0.1
+
+# En la importación global las filas se reparten entre estos expedientes.
+EXPEDIENTES_GLOBAL = 500
+
+APELLIDOS = [
+    "GONZALEZ",
+    "RODRIGUEZ",
+    "FERNANDEZ",
+    "LOPEZ",
+    "MARTINEZ",
+    "GIMENEZ",
+    "BENITEZ",
+    "NUÑEZ",
+    "ACUÑA",
+    "PEÑALOZA",
+]
+OBJETOS = [
+    "DAÑOS Y PERJUICIOS",
+    "SUCESION AB INTESTATO",
+    "EJECUTIVO",
+    "DIVORCIO",
+    "COBRO DE PESOS",
+    "ALIMENTOS",
+]
+ESTADOS_EXPEDIENTE = ["A DESPACHO", "EN LETRA", "PUBLICADO", "ARCHIVADO"]
+TIPOS_MOVIMIENTO = ["ESCRITO", "DECRETO", "CEDULA", "OFICIO", "ESTESE"]
+GENERADO_POR = ["JUZGADO", "LETRADO PATROCINANTE", "MESA DE ENTRADAS"]
+DESCRIPCIONES = [
+    "Solicita se provea de conformidad",
+    "Téngase presente lo manifestado",
+    "Agréguese y hágase saber",
+    "Córrase traslado a la contraria por el término de ley",
+    "Acompaña documental y solicita audiencia",
+]
+
+CABECERA_EXPEDIENTES = (
+    "expediente,link_detalle,caratula,partes,estado,"
+    "fec_ult_mov,localidad,dependencia,secretaria\n"
+)
+CABECERA_MOVIMIENTOS = (
+    "expediente,nombre_escrito,link_escrito,fecha_presentacion,tipo,estado,"
+    "generado_por,descripcion,fecha_firma,fecha_publicacion\n"
+)
+
+URL_SIPED = "https://siped.example/expediente"
+
+# Formas de cargar las plantillas que compara medir_plantillas: sin caché
+# (cada pedido lee y compila), con el cargador en caché recién arrancado (el
+# primer pedido de cada página compila) y con la caché precargada.
+MODOS_PLANTILLAS = ("sin_cache", "cache_en_frio", "cache_precargada")
+
+CARGADORES = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
+# Pedidos a cada página, en cada modo, después del primero.
+REPETICIONES_PLANTILLAS = 20
+
+
+@dataclass
+class Medicion:
+    escenario: str
+    filas: int
+    tamanio_mb: float
+    segundos: float
+    filas_por_segundo: float
+    consultas: int
+    pico_rss_mb: float
+    # Estado del ImportJob, o un resumen en los escenarios sin importación.
+    resultado: str = ""
+
+
+@dataclass
+class MedicionPlantilla:
+    modo: str
+    plantilla: str
+    # Hasta tener la respuesta completa: las páginas no son streaming, así
+    # que es el tiempo hasta el primer byte.
+    primer_pedido_ms: float
+    mediana_ms: float
+    precarga_ms: float = 0
+
+
+def numero_expediente(n):
+    return f"{n + 1}/2025"
+
+
+def generar_expedientes(destino, filas, semilla=0):
+    """
+    Escribe en `destino` (ruta) un expedientes_completos.csv con `filas`
+    expedientes, en UTF-8 con BOM.
+    """
+    azar = random.Random(semilla)  # noqa: S311
+    inicio = date(2020, 1, 1)
+    with Path(destino).open("w", encoding="utf-8-sig", newline="") as archivo:
+        archivo.write(CABECERA_EXPEDIENTES)
+        for n in range(filas):
+            caratula = (
+                f"{azar.choice(APELLIDOS)} C/ {azar.choice(APELLIDOS)} "
+                f"S/ {azar.choice(OBJETOS)}"
+            )
+            fecha = inicio + timedelta(days=azar.randrange(2000))
+            archivo.write(
+                f"{numero_expediente(n)},{URL_SIPED}/{n},{caratula},"
+                f"{azar.randint(2, 6)},{azar.choice(ESTADOS_EXPEDIENTE)},"
+                f"{fecha:%d/%m/%Y},Posadas,Juzgado Civil Nro {n % 9 + 1},"
+                f"Secretaría {n % 2 + 1}\n",
+            )
+
+
+def generar_movimientos(destino, filas, expedientes=1, semilla=0, prefijo="E"):
+    """
+    Escribe en `destino` (ruta) un CSV de movimientos repartidos entre los
+    primeros `expedientes` expedientes, en latin-1 como los exporta el
+    SIPED. Una parte de las descripciones queda cortada en dos líneas. Los
+    escritos se llaman `prefijo`-N.
+    """
+    azar = random.Random(semilla)  # noqa: S311
+    inicio = date(2020, 1, 1)
+    with Path(destino).open("w", encoding="latin-1", newline="") as archivo:
+        archivo.write(CABECERA_MOVIMIENTOS)
+        for n in range(filas):
+            fecha = inicio + timedelta(days=azar.randrange(2000))
+            presentacion = f"{fecha:%d/%m/%Y} {azar.randrange(8, 14):02}:{n % 60:02}"
+            descripcion = azar.choice(DESCRIPCIONES)
+            if azar.random() < PROPORCION_LINEAS_CORTADAS:
+                descripcion = descripcion.replace(" ", "\n  ", 1)
+            expediente = numero_expediente(n % expedientes)
+            archivo.write(
+                f"{expediente},{prefijo}-{n},{URL_SIPED}/escrito/{n},"
+                f"{presentacion},{azar.choice(TIPOS_MOVIMIENTO)},PUBLICADO,"
+                f"{azar.choice(GENERADO_POR)},{descripcion},"
+                f"{presentacion},{fecha:%d/%m/%Y}\n",
+            )
+
+
+class ContadorConsultas:
+    """Cuenta las consultas sin guardar el SQL, como haría CaptureQueriesContext."""
+
+    def __init__(self):
+        self.consultas = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.consultas += 1
+        return execute(sql, params, many, context)
+
+
+def reiniciar_pico_rss():
+    # En Linux escribir 5 en clear_refs reinicia el pico de memoria (VmHWM).
+    with contextlib.suppress(OSError):
+        Path("/proc/self/clear_refs").write_text("5")
+
+
+def pico_rss_mb():
+    try:
+        for linea in Path("/proc/self/status").read_text().splitlines():
+            if linea.startswith("VmHWM:"):
+                return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    # Sin /proc, ru_maxrss es el pico de todo el proceso (en KB en Linux).
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextlib.contextmanager
+def medir(escenario, filas, archivo):
+    """Mide tiempo, consultas y pico de memoria del bloque."""
+    medicion = Medicion(
+        escenario=escenario,
+        filas=filas,
+        tamanio_mb=round(Path(archivo).stat().st_size / 1024 / 1024, 2),
+        segundos=0,
+        filas_por_segundo=0,
+        consultas=0,
+        pico_rss_mb=0,
+    )
+    contador = ContadorConsultas()
+    reiniciar_pico_rss()
+    inicio = time.perf_counter()
+    with connection.execute_wrapper(contador):
+        yield medicion
+    segundos = time.perf_counter() - inicio
+    medicion.segundos = round(segundos, 3)
+    medicion.filas_por_segundo = round(filas / segundos)
+    medicion.consultas = contador.consultas
+    medicion.pico_rss_mb = round(pico_rss_mb(), 1)
+
+
+def vaciar_tablas():
+    tablas = ", ".join(
+        connection.ops.quote_name(modelo._meta.db_table)  # noqa: SLF001
+        for modelo in (Movimiento, ExpedienteSiped, ImportJob)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {tablas} RESTART IDENTITY CASCADE")
+
+
+def subir(client, url, ruta):
+    """Sube el archivo por la vista y devuelve el ImportJob creado."""
+    # El cliente de pruebas arma el cuerpo multipart en memoria, así que el
+    # pico de memoria incluye una copia del archivo.
+    with (
+        Path(ruta).open("rb") as contenido,
+        TestCase.captureOnCommitCallbacks(execute=True),
+    ):
+        archivo = SimpleUploadedFile(Path(ruta).name, contenido.read())
+        client.post(url, {"archivo_csv": archivo})
+    return ImportJob.objects.order_by("-pk").first()
+
+
+def correr_escenarios(usuario, directorio, tamanios, escenarios=ESCENARIOS):
+    """
+    Corre cada escenario con cada tamaño y devuelve la lista de Medicion.
+    Vacía las tablas de expedientes, movimientos e importaciones: usar
+    solo con una base de datos descartable.
+    """
+    client = Client()
+    client.force_login(usuario)
+    directorio = Path(directorio)
+    resultados = []
+    for filas in tamanios:
+        expedientes_csv = directorio / f"expedientes_{filas}.csv"
+        movimientos_csv = directorio / f"movimientos_{filas}.csv"
+        global_csv = directorio / f"movimientos_global_{filas}.csv"
+        expedientes_global = min(filas, EXPEDIENTES_GLOBAL)
+        generar_expedientes(expedientes_csv, filas)
+        generar_movimientos(movimientos_csv, filas)
+        generar_movimientos(
+            global_csv,
+            filas,
+            expedientes=expedientes_global,
+            prefijo="G",
+        )
+        vaciar_tablas()
+
+        with override_settings(
+            CELERY_TASK_ALWAYS_EAGER=True,
+            MEDIA_ROOT=str(directorio),
+        ):
+            if "reparacion" in escenarios:
+                with (
+                    medir("reparacion", filas, movimientos_csv) as medicion,
+                    movimientos_csv.open("rb") as archivo,
+                    abrir_texto(archivo) as texto,
+                ):
+                    # Sin el encabezado, las filas reparadas son los movimientos.
+                    reparadas = sum(
+                        1 for _ in reparar_bloques(partir_en_bloques(texto))
+                    )
+                    medicion.resultado = f"{reparadas - 1} filas"
+                resultados.append(medicion)
+
+            if set(escenarios) - {"reparacion"}:
+                # Los movimientos necesitan los expedientes cargados.
+                with medir("expedientes", filas, expedientes_csv) as medicion:
+                    url = reverse("casos:expediente_import")
+                    medicion.resultado = subir(client, url, expedientes_csv).estado
+                if "expedientes" in escenarios:
+                    resultados.append(medicion)
+
+            if "movimientos" in escenarios:
+                expediente = ExpedienteSiped.objects.get(
+                    expediente=numero_expediente(0),
+                )
+                url = reverse(
+                    "casos:movimiento_expediente_import",
+                    kwargs={"pk": expediente.pk},
+                )
+                with medir("movimientos", filas, movimientos_csv) as medicion:
+                    medicion.resultado = subir(client, url, movimientos_csv).estado
+                resultados.append(medicion)
+
+            if "movimientos_global" in escenarios:
+                url = reverse("casos:movimiento_import")
+                with medir("movimientos_global", filas, global_csv) as medicion:
+                    medicion.resultado = subir(client, url, global_csv).estado
+                resultados.append(medicion)
+
+        for ruta in (expedientes_csv, movimientos_csv, global_csv):
+            ruta.unlink()
+    return [asdict(resultado) for resultado in resultados]
+
+
+def guardar_corrida(ruta, etiqueta, corrida):
+    """
+    Agrega `corrida` a las que ya tiene el JSON de `ruta` bajo "corridas",
+    con `etiqueta` (o su fecha) como clave, y devuelve la clave. Así las
+    mediciones antes y después de un cambio quedan en el mismo archivo.
+    """
+    ruta = Path(ruta)
+    datos = json.loads(ruta.read_text()) if ruta.exists() else {}
+    if "resultados" in datos:
+        # Archivo de una sola corrida, del formato anterior.
+        anterior = datos.pop("etiqueta", "") or datos["fecha"]
+        datos = {"corridas": {anterior: datos}}
+    etiqueta = etiqueta or corrida["fecha"]
+    datos.setdefault("corridas", {})[etiqueta] = corrida
+    ruta.write_text(json.dumps(datos, indent=2))
+    return etiqueta
+
+
+def configuracion_plantillas(modo):
+    """TEMPLATES de settings con los cargadores del modo y sin debug."""
+    plantillas = copy.deepcopy(settings.TEMPLATES)
+    opciones = plantillas[0]["OPTIONS"]
+    plantillas[0]["APP_DIRS"] = False
+    opciones["debug"] = False
+    if modo == "sin_cache":
+        opciones["loaders"] = CARGADORES
+    else:
+        opciones["loaders"] = [("django.template.loaders.cached.Loader", CARGADORES)]
+    return plantillas
+
+
+def crear_datos_plantillas(usuario, casos=25, movimientos=50):
+    """Un expediente con movimientos y una página llena de casos de `usuario`."""
+    expediente, _ = ExpedienteSiped.objects.get_or_create(
+        expediente="PLANTILLAS/2025",
+        defaults={"caratula": "GONZALEZ C/ LOPEZ S/ DAÑOS Y PERJUICIOS"},
+    )
+    inicio = timezone.now() - timedelta(days=movimientos)
+    Movimiento.objects.bulk_create(
+        Movimiento(
+            expediente=expediente,
+            nombre_escrito=f"P-{n}",
+            fecha_presentacion=inicio + timedelta(days=n),
+            tipo=TIPOS_MOVIMIENTO[n % len(TIPOS_MOVIMIENTO)],
+            estado="PUBLICADO",
+            generado_por=GENERADO_POR[n % len(GENERADO_POR)],
+            descripcion=DESCRIPCIONES[n % len(DESCRIPCIONES)],
+        )
+        for n in range(movimientos)
+    )
+    cliente = Cliente.objects.create(nombre_razon_social="Cliente de prueba")
+    Caso.objects.bulk_create(
+        Caso(
+            cliente=cliente,
+            expediente=expediente,
+            responsable=usuario,
+            titulo_interno=f"Caso {n}",
+        )
+        for n in range(casos)
+    )
+    return expediente
+
+
+def _pedir(client, url):
+    inicio = time.perf_counter()
+    respuesta = client.get(url)
+    milisegundos = (time.perf_counter() - inicio) * 1000
+    if respuesta.status_code != 200:  # noqa: PLR2004
+        msg = f"{url} respondió {respuesta.status_code}"
+        raise RuntimeError(msg)
+    return milisegundos
+
+
+def medir_plantillas(
+    usuario,
+    repeticiones=REPETICIONES_PLANTILLAS,
+    modos=MODOS_PLANTILLAS,
+):
+    """
+    Pide el listado de casos y el detalle de un expediente con cada modo de
+    MODOS_PLANTILLAS y devuelve la lista de MedicionPlantilla. Cada modo
+    empieza como un worker recién arrancado: con un motor de plantillas nuevo
+    y la caché vacía.
+    """
+    expediente = crear_datos_plantillas(usuario)
+    urls = {
+        "casos/caso_list.html": reverse("casos:caso_list"),
+        "casos/expediente_siped_detail.html": reverse(
+            "casos:expediente_detail",
+            kwargs={"pk": expediente.pk},
+        ),
+    }
+    client = Client()
+    client.force_login(usuario)
+    # Un pedido a cada página antes de medir, para que las importaciones y
+    # las consultas que solo se hacen una vez por proceso no cuenten en el
+    # primer modo.
+    with override_settings(TEMPLATES=configuracion_plantillas("sin_cache")):
+        for url in urls.values():
+            _pedir(client, url)
+
+    resultados = []
+    for modo in modos:
+        with override_settings(TEMPLATES=configuracion_plantillas(modo)):
+            cache.clear()
+            precarga_ms = 0
+            if modo == "cache_precargada":
+                inicio = time.perf_counter()
+                precargar_plantillas()
+                precarga_ms = round((time.perf_counter() - inicio) * 1000, 2)
+            for plantilla, url in urls.items():
+                tiempos = [_pedir(client, url) for _ in range(repeticiones + 1)]
+                resultados.append(
+                    MedicionPlantilla(
+                        modo=modo,
+                        plantilla=plantilla,
+                        primer_pedido_ms=round(tiempos[0], 2),
+                        mediana_ms=round(statistics.median(tiempos[1:]), 2),
+                        precarga_ms=precarga_ms,
+                    ),
+                )
+    return [asdict(resultado) for resultado in resultados]
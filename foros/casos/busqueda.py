@@ -0,0 +1,134 @@
+"""
+Búsqueda de texto completo sobre expedientes y movimientos del SIPED.
+
+ExpedienteSiped y Movimiento guardan su SearchVector en la columna
+`busqueda`, con un índice GIN. La importación la actualiza con una sola
+sentencia por lote y las señales post_save la mantienen cuando se guarda
+por el ORM. El número de expediente se indexa con la configuración
+"simple" para que no se le aplique stemming.
+
+Si el servidor tiene pg_trgm, la migración 0009 crea además índices de
+trigramas sobre UPPER() de expediente, carátula, dependencia y descripción,
+que son las expresiones que usa icontains en PostgreSQL.
+"""
+
+from django.contrib.postgres.search import SearchHeadline
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.db.models import F
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import ExpedienteSiped
+from .models import Movimiento
+
+CONFIG = "spanish"
+
+LIMITE_RESULTADOS = 50
+
+# ts_headline devuelve la descripción sin escapar. Las coincidencias se
+# marcan con caracteres de control y resaltar() los cambia por <mark> después
+# de escapar el resto.
+INICIO_RESALTADO = "\x02"
+FIN_RESALTADO = "\x03"
+
+VECTOR_EXPEDIENTE = (
+    SearchVector("expediente", weight="A", config="simple")
+    + SearchVector("caratula", weight="A", config=CONFIG)
+    + SearchVector("dependencia", weight="C", config=CONFIG)
+)
+
+VECTOR_MOVIMIENTO = SearchVector("descripcion", weight="B", config=CONFIG) + (
+    SearchVector("tipo", "nombre_escrito", weight="D", config="simple")
+)
+
+# Campos de los que depende cada vector: si un save() con update_fields no
+# toca ninguno, no hace falta recalcularlo.
+CAMPOS_VECTOR_EXPEDIENTE = {"expediente", "caratula", "dependencia"}
+CAMPOS_VECTOR_MOVIMIENTO = {"descripcion", "tipo", "nombre_escrito"}
+
+
+def actualizar_busqueda_expedientes(expedientes):
+    """Recalcula el vector de los expedientes del queryset en un UPDATE."""
+    return expedientes.update(busqueda=VECTOR_EXPEDIENTE)
+
+
+def actualizar_busqueda_movimientos(movimientos):
+    """Recalcula el vector de los movimientos del queryset en un UPDATE."""
+    return movimientos.update(busqueda=VECTOR_MOVIMIENTO)
+
+
+def consulta(texto):
+    return SearchQuery(texto, config=CONFIG, search_type="websearch")
+
+
+def buscar_expedientes(texto, limite=LIMITE_RESULTADOS):
+    """
+    Expedientes que coinciden con `texto` por carátula, dependencia o
+    número, ordenados por relevancia. También encuentra números parciales
+    (por ejemplo "19827" para "19827/2025").
+    """
+    texto = texto.strip()
+    query = consulta(texto)
+    return (
+        ExpedienteSiped.objects.filter(
+            Q(busqueda=query) | Q(expediente__icontains=texto),
+        )
+        .annotate(rango=SearchRank(F("busqueda"), query))
+        .defer("busqueda")
+        .order_by("-rango", F("fec_ult_mov").desc(nulls_last=True), "-pk")[:limite]
+    )
+
+
+def buscar_movimientos(texto, limite=LIMITE_RESULTADOS):
+    """
+    Lista de los movimientos cuya descripción, tipo o escrito coinciden con
+    `texto`, ordenados por relevancia, con un fragmento resaltado de la
+    descripción.
+
+    Se hace en dos consultas: la primera ordena todas las coincidencias
+    leyendo solo el índice y el vector (con ORDER BY ... LIMIT PostgreSQL
+    guarda únicamente las `limite` mejores mientras recorre), y la segunda
+    trae con su expediente y su fragmento únicamente las filas que se
+    muestran.
+    """
+    query = consulta(texto.strip())
+    pks = list(
+        Movimiento.objects.filter(busqueda=query)
+        .annotate(rango=SearchRank(F("busqueda"), query))
+        .order_by("-rango", "-pk")
+        .values_list("pk", flat=True)[:limite],
+    )
+    movimientos = (
+        Movimiento.objects.filter(pk__in=pks)
+        .annotate(
+            fragmento=SearchHeadline(
+                "descripcion",
+                query,
+                config=CONFIG,
+                start_sel=INICIO_RESALTADO,
+                stop_sel=FIN_RESALTADO,
+                max_words=25,
+                min_words=10,
+            ),
+        )
+        .select_related("expediente")
+        .only(
+            "fecha_presentacion",
+            "tipo",
+            "nombre_escrito",
+            "expediente__expediente",
+            "expediente__caratula",
+        )
+        .in_bulk()
+    )
+    return [movimientos[pk] for pk in pks]
+
+
+def resaltar(fragmento):
+    """HTML seguro de un fragmento de buscar_movimientos()."""
+    html = escape(fragmento or "")
+    html = html.replace(INICIO_RESALTADO, "<mark>").replace(FIN_RESALTADO, "</mark>")
+    return mark_safe(html)  # noqa: S308
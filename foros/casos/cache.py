@@ -0,0 +1,103 @@
+"""
+Caché de las consultas de los listados y del detalle de expedientes.
+
+Los expedientes y sus movimientos solo cambian al importar (o al editarlos
+desde el admin), así que en lugar de vencer por tiempo cada entrada lleva en
+la clave una versión: la del listado para las páginas del listado, y la del
+expediente para su cabecera y su historial. Al escribir se cambian las
+versiones de exactamente los expedientes tocados (y la del listado, que los
+muestra), y las entradas anteriores ya no se leen; TIEMPO solo sirve para
+que desaparezcan. Las versiones duran TIEMPO_VERSION, más que las entradas:
+si una venciera antes, sus entradas todavía vigentes ya no se leerían.
+
+Una versión es un entero de time.time_ns(). Si la clave de una versión se
+pierde (por ejemplo, la saca Redis por memoria) se crea otra, que nunca
+coincide con la de entradas viejas.
+"""
+
+import hashlib
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import ExpedienteSiped
+
+# Segundos que se conserva cada entrada.
+TIEMPO = 60 * 60 * 24
+
+# Segundos que se conserva cada versión.
+TIEMPO_VERSION = 2 * TIEMPO
+
+VERSION_LISTADO = "casos:version:listado"
+
+_FALTA = object()
+
+
+def clave_version_expediente(pk):
+    return f"casos:version:expediente:{pk}"
+
+
+def versiones(claves):
+    """Versión actual de cada clave, creando las que faltan."""
+    actuales = cache.get_many(claves)
+    nuevas = {clave: time.time_ns() for clave in claves if clave not in actuales}
+    if nuevas:
+        # add no pisa la que otro proceso haya creado entretanto.
+        for clave, version in nuevas.items():
+            cache.add(clave, version, TIEMPO_VERSION)
+        actuales |= cache.get_many(nuevas)
+    # Sin caché disponible se usa una versión nueva: no hay aciertos.
+    return {clave: actuales.get(clave, nuevas.get(clave)) for clave in claves}
+
+
+def version_listado():
+    return versiones([VERSION_LISTADO])[VERSION_LISTADO]
+
+
+def version_expediente(pk):
+    """
+    Versión del expediente, o None si no existe. La base solo se consulta
+    cuando falta la versión, que no se crea para expedientes inexistentes.
+    """
+    clave = clave_version_expediente(pk)
+    version = cache.get(clave)
+    if version is not None:
+        return version
+    if not ExpedienteSiped.objects.filter(pk=pk).exists():
+        return None
+    return versiones([clave])[clave]
+
+
+def invalidar_expedientes(expediente_ids):
+    """Cambia la versión de los expedientes y la del listado."""
+    ahora = time.time_ns()
+    claves = [clave_version_expediente(pk) for pk in expediente_ids]
+    cache.set_many(dict.fromkeys([*claves, VERSION_LISTADO], ahora), TIEMPO_VERSION)
+
+
+def invalidar_al_confirmar(expediente_ids):
+    """
+    Invalida cuando se confirma la transacción en curso: antes, una lectura
+    podría volver a guardar en la caché los datos que todavía no cambiaron.
+    """
+    if expediente_ids:
+        transaction.on_commit(partial(invalidar_expedientes, set(expediente_ids)))
+
+
+def cacheado(clave, version, calcular, *partes):
+    """
+    El valor guardado para `clave`, `version` y `partes` (texto libre, por
+    ejemplo el cursor de la página), o el resultado de calcular(), que se
+    guarda.
+    """
+    if partes:
+        extra = hashlib.md5("\x1f".join(partes).encode(), usedforsecurity=False)
+        clave = f"{clave}:{extra.hexdigest()}"
+    clave = f"{clave}:{version}"
+    valor = cache.get(clave, _FALTA)
+    if valor is _FALTA:
+        valor = calcular()
+        cache.set(clave, valor, TIEMPO)
+    return valor
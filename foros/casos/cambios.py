@@ -0,0 +1,124 @@
+"""
+Feed de cambios para la sincronización incremental de los clientes de la API.
+
+ExpedienteSiped, Movimiento, Caso, Tarea y Eliminacion guardan en
+`transaccion` el id de la transacción que escribió cada fila por última vez.
+Lo asigna un trigger (migración 0016) en cada INSERT y UPDATE, así que vale
+también para las escrituras masivas. Los borrados quedan en Eliminacion (ver
+signals.py).
+
+El cursor guarda, para cada fuente, la última posición (transaccion, id)
+entregada, y cada lectura recorre el índice (transaccion, id) desde ahí. Una
+fecha asignada antes del COMMIT no sirve para esto: una transacción larga
+confirmaría filas con fechas anteriores a cursores ya entregados. En cambio
+solo se leen las filas de transacciones anteriores al xmin de la snapshot,
+el id de la más vieja todavía en curso: todas esas ya terminaron, y las que
+confirmen después tienen ids mayores o iguales, es decir, quedan delante de
+cualquier cursor. Mientras haya una transacción abierta (de cualquier base
+del servidor) el feed no pasa de ella.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from dataclasses import field
+
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Caso
+from .models import Eliminacion
+from .models import ExpedienteSiped
+from .models import Movimiento
+from .models import Tarea
+
+# Nombre de cada modelo en el feed y en Eliminacion.modelo.
+MODELOS = {
+    ExpedienteSiped: "expedientes",
+    Movimiento: "movimientos",
+    Caso: "casos",
+    Tarea: "tareas",
+}
+
+ELIMINADOS = "eliminados"
+
+# Filas de cada fuente por lectura.
+LIMITE_CAMBIOS = 1000
+
+# Id de la transacción más vieja en curso para la snapshot de la consulta.
+HORIZONTE = RawSQL("pg_snapshot_xmin(pg_current_snapshot())::text::bigint", [])
+
+
+@dataclass
+class LecturaCambios:
+    # Nombre de la fuente -> filas escritas desde el cursor, en orden.
+    filas: dict = field(default_factory=dict)
+    cursor: str = ""
+    # Si alguna fuente tenía más filas que LIMITE_CAMBIOS.
+    hay_mas: bool = False
+
+
+def codificar_cursor(posiciones):
+    datos = {nombre: list(posicion) for nombre, posicion in posiciones.items()}
+    texto = json.dumps(datos, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(texto).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor):
+    """
+    Devuelve las posiciones (nombre -> (transaccion, id)) del cursor, o None
+    si no es válido.
+    """
+    try:
+        texto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        datos = json.loads(texto)
+        posiciones = {}
+        for nombre, (transaccion, pk) in datos.items():
+            if not isinstance(transaccion, int) or not isinstance(pk, int):
+                return None
+            posiciones[nombre] = (transaccion, pk)
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        return None
+    return posiciones
+
+
+def leer_cambios(fuentes, posiciones=None, limite=LIMITE_CAMBIOS):
+    """
+    Lee de cada fuente (nombre -> queryset) hasta `limite` filas escritas
+    después de su posición en `posiciones`; sin posición, desde el
+    principio. Es una consulta por fuente.
+    """
+    posiciones = dict(posiciones or {})
+    lectura = LecturaCambios()
+    for nombre, queryset in fuentes.items():
+        filas = _leer_fuente(queryset, posiciones.get(nombre), limite)
+        if len(filas) > limite:
+            filas = filas[:limite]
+            lectura.hay_mas = True
+        if filas:
+            posiciones[nombre] = (filas[-1].transaccion, filas[-1].pk)
+        lectura.filas[nombre] = filas
+    lectura.cursor = codificar_cursor(posiciones)
+    return lectura
+
+
+def _leer_fuente(queryset, posicion, limite):
+    """Las filas después de `posicion`, con una de más si quedan cambios."""
+    queryset = queryset.filter(transaccion__lt=HORIZONTE)
+    if posicion is not None:
+        transaccion, pk = posicion
+        # El primer término acota el rango sobre la primera columna del
+        # índice, como en paginacion.py.
+        queryset = queryset.filter(
+            Q(transaccion__gte=transaccion)
+            & (Q(transaccion__gt=transaccion) | Q(pk__gt=pk)),
+        )
+    return list(queryset.order_by("transaccion", "pk")[: limite + 1])
+
+
+def registrar_eliminacion(instancia):
+    Eliminacion.objects.create(
+        modelo=MODELOS[type(instancia)],
+        objeto_id=instancia.pk,
+    )
@@ -0,0 +1,184 @@
+"""
+Lectura en streaming de los CSV exportados por el SIPED.
+
+El archivo subido nunca se carga entero en memoria: se decodifica de a
+bloques, las líneas cortadas se reparan con un generador y csv.DictReader
+consume el resultado a medida que se importa.
+"""
+
+import codecs
+import csv
+import io
+import re
+import zipfile
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain
+
+# Patrón: Inicio de línea + dígitos + / + dígitos + ,
+PATRON_EXPEDIENTE = re.compile(r"^\d+/\d+,")
+
+# Un salto de línea seguido del inicio de un registro: cortar ahí no cambia
+# cómo se agrupan las líneas, así que los bloques a ambos lados se pueden
+# reparar por separado.
+PATRON_CORTE = re.compile(r"\n(?=\d+/\d+,)")
+
+# Un salto de línea (entre líneas ya recortadas) que no empieza un registro.
+PATRON_CONTINUACION = re.compile(r"\n(?!\d+/\d+,)")
+
+# Tamaño de los bloques con que se lee el archivo para detectar la codificación.
+TAMANIO_BLOQUE = 64 * 1024
+
+# Tamaño aproximado (en caracteres) de los bloques de partir_en_bloques().
+TAMANIO_BLOQUE_REGISTROS = 4 * 1024 * 1024
+
+
+def detectar_codificacion(archivo):
+    """
+    Devuelve "utf-8-sig" si todo el archivo es UTF-8 válido (con o sin BOM)
+    y "latin-1" en caso contrario. Recorre el archivo de a bloques.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    archivo.seek(0)
+    try:
+        for chunk in iter(partial(archivo.read, TAMANIO_BLOQUE), b""):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return "latin-1"
+    finally:
+        archivo.seek(0)
+    return "utf-8-sig"
+
+
+@contextmanager
+def abrir_texto(archivo):
+    """
+    Abre el archivo subido como un stream de texto que se decodifica de
+    forma incremental. Las líneas conservan sus finales (newline=""), como
+    espera el módulo csv.
+    """
+    encoding = detectar_codificacion(archivo)
+    texto = io.TextIOWrapper(archivo, encoding=encoding, newline="")
+    try:
+        yield texto
+    finally:
+        # Desacoplar para que el wrapper no cierre el archivo subido.
+        texto.detach()
+
+
+def separar_cabecera(texto):
+    """
+    Separa la primera línea de `texto` (sin su final, con el mismo criterio
+    que str.splitlines()) del resto del texto.
+    """
+    lineas = texto[: texto.find("\n") + 1 or None].splitlines(keepends=True)
+    if not lineas:
+        return "", ""
+    return lineas[0].splitlines()[0], texto[len(lineas[0]) :]
+
+
+def reparar_bloque(texto):
+    """
+    Une las líneas que fueron cortadas incorrectamente en el CSV original y
+    devuelve la lista de registros. Si una línea no empieza con el patrón de
+    expediente (N/N,), se anexa a la anterior con un espacio; las líneas se
+    recortan y las vacías se descartan.
+
+    Todo el bloque se procesa con unas pocas operaciones sobre el texto
+    completo en lugar de línea por línea: al unir las líneas recortadas y no
+    vacías con "\n" queda un único tipo de salto, y las continuaciones son
+    los saltos que no van seguidos de un número de expediente.
+    """
+    texto = "\n".join(filter(None, map(str.strip, texto.splitlines())))
+    if not texto:
+        return []
+    if not PATRON_EXPEDIENTE.match(texto):
+        # Continuación antes del primer registro: el resultado empieza con
+        # un espacio (como siempre).
+        texto = " " + texto
+    return PATRON_CONTINUACION.sub(" ", texto).split("\n")
+
+
+def reparar_bloques(bloques):
+    """
+    Repara los bloques de partir_en_bloques() y genera las líneas del CSV
+    reparado. El encabezado, que está en el primer bloque, se conserva tal
+    cual.
+    """
+    bloques = iter(bloques)
+    primero = next(bloques, None)
+    if primero is None:
+        return
+    cabecera, resto = separar_cabecera(primero)
+    yield cabecera
+    yield from reparar_bloque(resto)
+    for bloque in bloques:
+        yield from reparar_bloque(bloque)
+
+
+def leer_filas(archivo, *, reparar=False, filtro=None):
+    """
+    Itera las filas del CSV subido como diccionarios, sin leerlo completo.
+    Con `reparar=True` se unen antes las líneas cortadas. `filtro` (un
+    delta.FiltroDelta) descarta los bloques de registros que no cambiaron.
+    """
+    with abrir_texto(archivo) as texto:
+        if filtro is None and not reparar:
+            yield from csv.DictReader(texto)
+            return
+        bloques = partir_en_bloques(texto)
+        if filtro is not None:
+            bloques = filtro.filtrar(bloques)
+        if reparar:
+            lineas = reparar_bloques(bloques)
+        else:
+            lineas = chain.from_iterable(
+                io.StringIO(bloque, newline="") for bloque in bloques
+            )
+        yield from csv.DictReader(lineas)
+
+
+def miembros_csv(archivo):
+    """
+    Itera los CSV de un archivo ZIP en orden alfabético, abiertos en modo
+    binario. Cada uno se descomprime a medida que se lee.
+    """
+    with zipfile.ZipFile(archivo) as zip_file:
+        nombres = sorted(
+            nombre for nombre in zip_file.namelist() if nombre.lower().endswith(".csv")
+        )
+        for nombre in nombres:
+            with zip_file.open(nombre) as miembro:
+                yield miembro
+
+
+def leer_filas_zip(archivo, *, reparar=False):
+    """
+    Itera las filas de todos los CSV de un archivo ZIP, en orden alfabético.
+    Cada CSV tiene su propio encabezado.
+    """
+    for miembro in miembros_csv(archivo):
+        yield from leer_filas(miembro, reparar=reparar)
+
+
+def partir_en_bloques(texto, tamanio=TAMANIO_BLOQUE_REGISTROS):
+    """
+    Parte el stream de texto en bloques de al menos `tamanio` caracteres
+    (salvo el último). Cada bloque termina en un salto de línea y el
+    siguiente empieza con el número de expediente de un registro, así que
+    reparar cada bloque por separado da el mismo resultado que reparar el
+    archivo entero. El encabezado queda en el primer bloque.
+    """
+    pendiente = ""
+    while bloque := texto.read(tamanio):
+        # Un corte que no apareció antes solo puede empezar en el último
+        # salto de línea de lo pendiente o en el bloque nuevo.
+        inicio = max(tamanio, pendiente.rfind("\n"))
+        pendiente += bloque
+        while corte := PATRON_CORTE.search(pendiente, inicio):
+            yield pendiente[: corte.end()]
+            pendiente = pendiente[corte.end() :]
+            inicio = tamanio
+    if pendiente:
+        yield pendiente
@@ -0,0 +1,161 @@
+"""
+Importación incremental de los CSV del SIPED.
+
+De cada fuente (el CSV de expedientes, los movimientos de un expediente o
+los de varios expedientes) FuenteImportacion guarda la huella del último
+archivo importado sin errores: el SHA-256 del archivo completo y la de cada
+bloque de registros. Si el archivo nuevo es idéntico no se lee; si no, solo
+se parsean y escriben los bloques cuya huella no estaba.
+
+Los bloques se cortan por contenido y no por posición: un bloque termina en
+el registro cuyo CRC32 es múltiplo de REGISTROS_POR_BLOQUE. Un registro
+agregado, quitado o cambiado altera solo el bloque en que cae, y los demás
+conservan su huella aunque se corran de lugar en el archivo. Cada huella
+incluye el encabezado, así que si cambian las columnas se procesa todo.
+
+Las filas se numeran (en los errores y para retomar) sobre los bloques que
+se procesan, no sobre el archivo completo.
+"""
+
+import hashlib
+import re
+import zlib
+from functools import partial
+from itertools import chain
+
+from .csv_siped import TAMANIO_BLOQUE
+from .csv_siped import TAMANIO_BLOQUE_REGISTROS
+from .csv_siped import separar_cabecera
+from .models import FuenteImportacion
+
+# Como csv_siped.PATRON_CORTE, sobre el texto codificado.
+PATRON_CORTE_BYTES = re.compile(rb"\n(?=\d+/\d+,)")
+
+# Registros por bloque, en promedio.
+REGISTROS_POR_BLOQUE = 64
+
+# Corte forzado, por si ningún registro cumple la condición (por ejemplo, un
+# mismo registro repetido muchas veces).
+MAX_REGISTROS_POR_BLOQUE = REGISTROS_POR_BLOQUE * 8
+
+
+def huella_archivo(archivo):
+    """SHA-256 del archivo subido, leído de a bloques."""
+    archivo.seek(0)
+    huella = hashlib.sha256()
+    for chunk in iter(partial(archivo.read, TAMANIO_BLOQUE), b""):
+        huella.update(chunk)
+    archivo.seek(0)
+    return huella.hexdigest()
+
+
+def fines_de_registro(datos):
+    """
+    Posiciones en que termina cada registro de `datos` (bytes que empiezan
+    en un registro, como los bloques de partir_en_bloques() sin el
+    encabezado). Cada registro incluye sus líneas de continuación.
+    """
+    fines = [corte.end() for corte in PATRON_CORTE_BYTES.finditer(datos)]
+    if datos and (not fines or fines[-1] < len(datos)):
+        fines.append(len(datos))
+    return fines
+
+
+class FiltroDelta:
+    """
+    Deja pasar solo los bloques de registros cuya huella no está en
+    `conocidos` (los de la importación anterior) y junta en `huellas` las de
+    todo el archivo, para guardarlas cuando la importación termina.
+    """
+
+    def __init__(self, conocidos=()):
+        self.conocidos = set(conocidos)
+        self.huellas = []
+        self.omitidos = 0
+
+    def filtrar(self, bloques, tamanio=TAMANIO_BLOQUE_REGISTROS):
+        """
+        Recibe los bloques de partir_en_bloques() y genera otros con el mismo
+        formato, que se reparan y leen igual: el primero empieza con el
+        encabezado y todos empiezan en un registro. Los registros que
+        cambiaron se juntan en bloques de al menos `tamanio` caracteres.
+        """
+        bloques = iter(bloques)
+        primero = next(bloques, None)
+        if primero is None:
+            return
+        _, resto = separar_cabecera(primero)
+        cabecera = primero[: len(primero) - len(resto)]
+        base = hashlib.blake2b(cabecera.encode(), digest_size=16)
+
+        salida = [cabecera]
+        largo = 0
+        # Partes del bloque actual, que puede seguir en el bloque de texto
+        # siguiente, y cantidad de registros que lleva.
+        partes = []
+        cantidad = 0
+        for texto in chain([resto], bloques):
+            # Se codifica una sola vez y los registros se recorren sobre los
+            # bytes, sin copiarlos.
+            datos = texto.encode()
+            vista = memoryview(datos)
+            inicio = anterior = 0
+            for fin in fines_de_registro(datos):
+                cantidad += 1
+                corte = zlib.crc32(vista[anterior:fin]) % REGISTROS_POR_BLOQUE == 0
+                anterior = fin
+                if not corte and cantidad < MAX_REGISTROS_POR_BLOQUE:
+                    continue
+                partes.append(vista[inicio:fin])
+                if cambiado := self._cambiado(base, partes):
+                    salida.append(cambiado)
+                    largo += len(cambiado)
+                    if largo >= tamanio:
+                        yield "".join(salida)
+                        salida = []
+                        largo = 0
+                partes = []
+                cantidad = 0
+                inicio = fin
+            if inicio < len(datos):
+                partes.append(datos[inicio:])
+        if partes and (cambiado := self._cambiado(base, partes)):
+            salida.append(cambiado)
+        if salida:
+            yield "".join(salida)
+
+    def _cambiado(self, base, partes):
+        """
+        Registra la huella del bloque formado por `partes` y devuelve su
+        texto si no estaba en la importación anterior, o "" si estaba.
+        """
+        huella = base.copy()
+        for parte in partes:
+            huella.update(parte)
+        huella = huella.hexdigest()
+        self.huellas.append(huella)
+        if huella in self.conocidos:
+            self.omitidos += 1
+            return ""
+        return b"".join(partes).decode()
+
+
+def fuente_de(job):
+    """La FuenteImportacion del ImportJob, o None si nunca se importó."""
+    return FuenteImportacion.objects.filter(
+        tipo=job.tipo,
+        expediente=job.expediente,
+    ).first()
+
+
+def guardar_fuente(job, huella, filtro):
+    """Registra el archivo del ImportJob como la última versión de su fuente."""
+    FuenteImportacion.objects.update_or_create(
+        tipo=job.tipo,
+        expediente=job.expediente,
+        defaults={
+            "huella": huella,
+            "bloques": filtro.huellas,
+            "ultima_importacion": job,
+        },
+    )
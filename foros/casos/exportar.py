@@ -0,0 +1,120 @@
+"""
+Exportación en CSV de expedientes, movimientos, casos y tareas.
+
+Las filas se leen con values_list().iterator(), que en PostgreSQL declara un
+cursor del servidor y trae TAMANIO_CHUNK filas por vez, y se escriben a
+medida que llegan en una StreamingHttpResponse: la descarga empieza con la
+primera tanda y la memoria no depende del tamaño del archivo. La lectura va
+dentro de una transacción propia para que el cursor no sea WITH HOLD (que
+PostgreSQL materializa completo antes de devolver la primera fila), por eso
+las vistas de exportación no usan ATOMIC_REQUESTS.
+
+Expedientes y movimientos salen con las columnas de expedientes_completos.csv
+y del CSV de movimientos del SIPED, así que se pueden volver a importar.
+"""
+
+import csv
+import io
+from datetime import date
+from datetime import datetime
+
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# Filas por cada FETCH del cursor del servidor.
+TAMANIO_CHUNK = 2000
+
+# Caracteres que se juntan antes de entregar una parte de la respuesta.
+TAMANIO_ESCRITURA = 64 * 1024
+
+# Encabezado -> lookup de cada columna.
+COLUMNAS_EXPEDIENTES = {
+    "expediente": "expediente",
+    "link_detalle": "link_detalle",
+    "caratula": "caratula",
+    "partes": "partes",
+    "estado": "estado",
+    "fec_ult_mov": "fec_ult_mov",
+    "localidad": "localidad",
+    "dependencia": "dependencia",
+    "secretaria": "secretaria",
+}
+
+COLUMNAS_MOVIMIENTOS = {
+    "expediente": "expediente__expediente",
+    "nombre_escrito": "nombre_escrito",
+    "link_escrito": "link_escrito",
+    "fecha_presentacion": "fecha_presentacion",
+    "tipo": "tipo",
+    "estado": "estado",
+    "generado_por": "generado_por",
+    "descripcion": "descripcion",
+    "fecha_firma": "fecha_firma",
+    "fecha_publicacion": "fecha_publicacion",
+}
+
+COLUMNAS_CASOS = {
+    "id": "pk",
+    "titulo_interno": "titulo_interno",
+    "naturaleza": "naturaleza",
+    "fecha_ingreso": "fecha_ingreso",
+    "cliente": "cliente__nombre_razon_social",
+    "cuit_cuil": "cliente__cuit_cuil",
+    "expediente": "expediente__expediente",
+    "responsable": "responsable__username",
+}
+
+COLUMNAS_TAREAS = {
+    "id": "pk",
+    "caso": "caso__titulo_interno",
+    "expediente": "caso__expediente__expediente",
+    "titulo": "titulo",
+    "estado": "estado",
+    "responsable": "responsable__username",
+    "fecha_inicio": "fecha_inicio",
+    "fecha_limite": "fecha_limite",
+    "fecha_terminacion": "fecha_terminacion",
+}
+
+
+def _celda(valor, zona):
+    """Fechas en el formato del SIPED y en la hora local, como se importan."""
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return f"{valor.astimezone(zona):%d/%m/%Y %H:%M:%S}"
+    if isinstance(valor, date):
+        return f"{valor:%d/%m/%Y}"
+    return valor
+
+
+def filas_csv(queryset, columnas):
+    """
+    Genera el CSV de `queryset` (con su orden) con las `columnas`
+    (encabezado -> lookup), en partes de alrededor de TAMANIO_ESCRITURA
+    caracteres. Empieza con el BOM de UTF-8 para que Excel lo reconozca.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(columnas.keys())
+    filas = queryset.values_list(*columnas.values())
+    # Buscar la zona actual en cada celda cuesta más que convertir la fecha.
+    zona = timezone.get_current_timezone()
+    with transaction.atomic():
+        for fila in filas.iterator(chunk_size=TAMANIO_CHUNK):
+            writer.writerow([_celda(valor, zona) for valor in fila])
+            if buffer.tell() >= TAMANIO_ESCRITURA:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue()
+
+
+def respuesta_csv(nombre_archivo, queryset, columnas):
+    return StreamingHttpResponse(
+        filas_csv(queryset, columnas),
+        content_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{nombre_archivo}"'},
+    )
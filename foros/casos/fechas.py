@@ -0,0 +1,127 @@
+"""
+Parseo de las fechas de los CSV exportados por el SIPED.
+
+Una misma columna usa siempre el mismo formato y los valores se repiten
+mucho (un movimiento por día y por expediente), así que cada columna
+recuerda el formato detectado en la primera fecha válida, lo prueba
+primero con una expresión regular precompilada en lugar de strptime y
+guarda los resultados en una caché LRU acotada.
+
+El resultado es el mismo que el de probar datetime.strptime con cada
+formato en orden: los formatos son excluyentes entre sí y todo valor que
+no encaja en el camino rápido se resuelve con strptime.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from django.utils.timezone import get_current_timezone
+
+# Cantidad de valores distintos que recuerda cada columna.
+TAMANIO_CACHE = 4096
+
+
+class Formato:
+    """Un formato de strptime con su camino rápido equivalente."""
+
+    def __init__(self, formato, patron):
+        self.formato = formato
+        self.patron = re.compile(patron)
+
+    def parsear(self, texto):
+        """Devuelve el datetime (naive) o None si el texto no tiene este formato."""
+        coincidencia = self.patron.fullmatch(texto)
+        if coincidencia is None:
+            return None
+        partes = coincidencia.groupdict()
+        try:
+            return datetime(  # noqa: DTZ001
+                int(partes["anio"]),
+                int(partes["mes"]),
+                int(partes["dia"]),
+                int(partes.get("hora") or 0),
+                int(partes.get("minuto") or 0),
+                int(partes.get("segundo") or 0),
+            )
+        except ValueError:
+            return None
+
+
+# Los mismos rangos de dígitos que acepta strptime para cada directiva.
+_DMY = r"(?P<dia>\d{1,2})/(?P<mes>\d{1,2})/(?P<anio>\d{4})"
+_YMD = r"(?P<anio>\d{4})-(?P<mes>\d{1,2})-(?P<dia>\d{1,2})"
+_HM = r"(?P<hora>\d{1,2}):(?P<minuto>\d{1,2})"
+_HMS = _HM + r":(?P<segundo>\d{1,2})"
+
+FORMATO_FECHA = Formato("%d/%m/%Y", _DMY)
+
+FORMATOS_FECHA_HORA = (
+    Formato("%d/%m/%Y %H:%M:%S", rf"{_DMY} {_HMS}"),
+    Formato("%d/%m/%Y %H:%M", rf"{_DMY} {_HM}"),
+    FORMATO_FECHA,
+    Formato("%Y-%m-%d %H:%M:%S", rf"{_YMD} {_HMS}"),
+    Formato("%Y-%m-%d", _YMD),
+)
+
+
+def _strptime(texto, formato):
+    try:
+        return datetime.strptime(texto, formato.formato)  # noqa: DTZ007
+    except ValueError:
+        return None
+
+
+class ColumnaFecha:
+    """
+    Parsea los valores de una columna de fecha y hora del SIPED y los
+    devuelve con la zona horaria actual, como make_aware. Crear una por
+    columna y por archivo: el formato detectado y la caché son propios de
+    la columna.
+    """
+
+    def __init__(self, formatos=FORMATOS_FECHA_HORA, tamanio_cache=TAMANIO_CACHE):
+        self.formatos = formatos
+        self.formato = None
+        self.zona = get_current_timezone()
+        self._parsear = lru_cache(maxsize=tamanio_cache)(self._parsear_sin_cache)
+
+    def __call__(self, texto):
+        if not texto:
+            return None
+        return self._parsear(texto)
+
+    def _parsear_sin_cache(self, texto):
+        # Limpiar espacios múltiples
+        texto = " ".join(texto.split())
+        if not texto:
+            return None
+
+        if self.formato is not None:
+            valor = self.formato.parsear(texto)
+            if valor is not None:
+                return valor.replace(tzinfo=self.zona)
+
+        for formato in self.formatos:
+            valor = formato.parsear(texto) or _strptime(texto, formato)
+            if valor is not None:
+                self.formato = formato
+                return valor.replace(tzinfo=self.zona)
+        return None
+
+
+@lru_cache(maxsize=TAMANIO_CACHE)
+def parsear_fecha(texto):
+    """
+    Parsea una fecha dd/mm/aaaa (como fec_ult_mov) y devuelve un date, o
+    None si el texto está vacío o no es válido.
+    """
+    if not texto:
+        return None
+    valor = FORMATO_FECHA.parsear(texto) or _strptime(texto, FORMATO_FECHA)
+    return valor.date() if valor is not None else None
+
+
+def columnas_fecha(*columnas):
+    """Devuelve un ColumnaFecha nuevo por cada columna indicada."""
+    return {columna: ColumnaFecha() for columna in columnas}
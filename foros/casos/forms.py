@@ -1,16 +1,42 @@
 from django import forms
 
 
-class ExpedienteUploadForm(forms.Form):
+class ImportacionForm(forms.Form):
+    """Opciones comunes a las subidas de CSV del SIPED."""
+
+    completa = forms.BooleanField(
+        label="Procesar el archivo completo",
+        required=False,
+        help_text=(
+            "Por defecto solo se procesan los registros que cambiaron desde la "
+            "última importación del mismo archivo."
+        ),
+    )
+
+    field_order = ["archivo_csv", "completa"]
+
+
+class ExpedienteUploadForm(ImportacionForm):
     archivo_csv = forms.FileField(
         label="Archivo CSV de Expedientes",
         help_text="Seleccione el archivo expedientes_completos.csv",
     )
 
 
-class MovimientoUploadForm(forms.Form):
+class MovimientoUploadForm(ImportacionForm):
     archivo_csv = forms.FileField(
         label="Archivo CSV de Movimientos",
         help_text="Seleccione el archivo CSV correspondiente a este expediente.",
         widget=forms.FileInput(attrs={"accept": ".csv"}),
     )
+
+
+class MovimientoGlobalUploadForm(ImportacionForm):
+    archivo_csv = forms.FileField(
+        label="Archivo CSV o ZIP de Movimientos",
+        help_text=(
+            "Un CSV con movimientos de varios expedientes, o un ZIP con varios "
+            "CSV. Cada fila se asigna al expediente de su primera columna."
+        ),
+        widget=forms.FileInput(attrs={"accept": ".csv,.zip"}),
+    )
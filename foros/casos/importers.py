@@ -0,0 +1,505 @@
+"""
+Importación masiva de los CSV exportados por el SIPED.
+
+Las filas se procesan en lotes: por cada lote se consulta una sola vez qué
+registros ya existen y se escribe todo con unas pocas sentencias bulk, en
+lugar de un update_or_create por fila.
+
+Cada registro guarda en `hash_origen` un hash de su fila normalizada. Al
+reimportar, las filas cuyo hash coincide con el guardado no se escriben y se
+cuentan como sin cambios.
+"""
+
+import hashlib
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from itertools import batched
+from itertools import islice
+
+from django.db import DatabaseError
+from django.db import transaction
+from django.utils import timezone
+
+from .busqueda import actualizar_busqueda_expedientes
+from .busqueda import actualizar_busqueda_movimientos
+from .cache import invalidar_al_confirmar
+from .fechas import columnas_fecha
+from .fechas import parsear_fecha
+from .models import ExpedienteSiped
+from .models import Movimiento
+from .reglas import MotorReglas
+from .resumen import actualizar_resumen
+
+BATCH_SIZE = 1000
+
+# Cantidad máxima de errores por fila que se guardan en el reporte.
+MAX_ERRORES = 500
+
+CAMPOS_EXPEDIENTE = [
+    "caratula",
+    "dependencia",
+    "estado",
+    "fec_ult_mov",
+    "link_detalle",
+    "localidad",
+    "secretaria",
+    "partes",
+]
+
+CAMPOS_MOVIMIENTO = [
+    "nombre_escrito",
+    "link_escrito",
+    "fecha_presentacion",
+    "tipo",
+    "estado",
+    "generado_por",
+    "descripcion",
+    "fecha_firma",
+    "fecha_publicacion",
+]
+
+CAMPOS_FECHA_MOVIMIENTO = [
+    "fecha_presentacion",
+    "fecha_firma",
+    "fecha_publicacion",
+]
+
+
+@dataclass
+class ResultadoImportacion:
+    creados: int = 0
+    actualizados: int = 0
+    sin_cambios: int = 0
+    # Tareas creadas por las reglas para los movimientos nuevos.
+    tareas: int = 0
+    # Número de la última fila de datos confirmada (para retomar).
+    ultima_fila: int = 0
+    fallidas: int = 0
+    errores: list = field(default_factory=list)
+
+    @property
+    def procesadas(self):
+        return self.creados + self.actualizados + self.sin_cambios
+
+    def sumar(self, otro):
+        self.creados += otro.creados
+        self.actualizados += otro.actualizados
+        self.sin_cambios += otro.sin_cambios
+        self.tareas += otro.tareas
+
+    def registrar_error(self, fila, error):
+        self.fallidas += 1
+        if len(self.errores) < MAX_ERRORES:
+            self.errores.append({"fila": fila, "error": str(error)})
+
+
+def calcular_hash(datos, campos):
+    """
+    Hash de los valores normalizados de `campos`, para saber si una fila
+    cambió desde la última importación sin comparar campo por campo.
+    """
+    texto = "\x1f".join(
+        "\x00" if (valor := datos[campo]) is None else str(valor) for campo in campos
+    )
+    return hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()
+
+
+def normalizar_expediente(row):
+    """
+    Convierte una fila de expedientes_completos.csv en los valores del modelo.
+    Devuelve None si la fila no tiene número de expediente.
+    """
+    expediente_nro = (row.get("expediente") or "").strip()
+    if not expediente_nro:
+        return None
+
+    partes = None
+    partes_str = row.get("partes") or ""
+    if partes_str and partes_str.isdigit():
+        partes = int(partes_str)
+
+    datos = {
+        "expediente": expediente_nro[:100],
+        "caratula": (row.get("caratula") or "")[:500],
+        "dependencia": (row.get("dependencia") or "")[:255],
+        "estado": (row.get("estado") or "")[:100],
+        "fec_ult_mov": parsear_fecha(row.get("fec_ult_mov")),
+        "link_detalle": (row.get("link_detalle") or "")[:500],
+        "localidad": (row.get("localidad") or "")[:100],
+        "secretaria": (row.get("secretaria") or "")[:100],
+        "partes": partes,
+    }
+    datos["hash_origen"] = calcular_hash(datos, CAMPOS_EXPEDIENTE)
+    return datos
+
+
+def importar_expedientes(
+    filas,
+    batch_size=BATCH_SIZE,
+    al_guardar_lote=None,
+    desde_fila=0,
+):
+    """
+    Crea o actualiza ExpedienteSiped a partir de las filas del CSV
+    (diccionarios, como los de csv.DictReader), de a `batch_size` filas.
+    Las primeras `desde_fila` filas se saltean sin procesar, para retomar
+    una importación interrumpida. Si se indica, `al_guardar_lote(resultado)`
+    se llama al final de la transacción de cada lote: el progreso que
+    registre se confirma junto con las filas, y al retomar no se repite un
+    lote ya escrito.
+    """
+    resultado = ResultadoImportacion(ultima_fila=desde_fila)
+    numeradas = enumerate(islice(filas, desde_fila, None), start=desde_fila + 1)
+    for lote in batched(numeradas, batch_size, strict=False):
+        datos = [d for _, fila in lote if (d := normalizar_expediente(fila))]
+        with transaction.atomic():
+            if datos:
+                _guardar_lote_expedientes(datos, resultado)
+            resultado.ultima_fila = lote[-1][0]
+            if al_guardar_lote:
+                al_guardar_lote(resultado)
+    return resultado
+
+
+def _guardar_lote_expedientes(lote, resultado):
+    # Si un expediente se repite dentro del lote gana la última fila; las
+    # repeticiones cuentan como actualizaciones, igual que con update_or_create.
+    por_numero = {}
+    for datos in lote:
+        if datos["expediente"] in por_numero:
+            resultado.actualizados += 1
+        por_numero[datos["expediente"]] = datos
+
+    hashes = dict(
+        ExpedienteSiped.objects.filter(
+            expediente__in=por_numero.keys(),
+        ).values_list("expediente", "hash_origen"),
+    )
+    cambiados = []
+    for numero, datos in por_numero.items():
+        if numero not in hashes:
+            resultado.creados += 1
+        elif hashes[numero] == datos["hash_origen"]:
+            resultado.sin_cambios += 1
+            continue
+        else:
+            resultado.actualizados += 1
+        cambiados.append(ExpedienteSiped(**datos))
+    if not cambiados:
+        return
+
+    with transaction.atomic():
+        ExpedienteSiped.objects.bulk_create(
+            cambiados,
+            update_conflicts=True,
+            unique_fields=["expediente"],
+            update_fields=[*CAMPOS_EXPEDIENTE, "hash_origen", "actualizado"],
+        )
+        # bulk_create no dispara post_save: el vector de búsqueda de todo el
+        # lote se recalcula con un solo UPDATE.
+        actualizar_busqueda_expedientes(
+            ExpedienteSiped.objects.filter(
+                expediente__in=[expediente.expediente for expediente in cambiados],
+            ),
+        )
+        # En PostgreSQL el upsert asigna el pk también a los actualizados.
+        invalidar_al_confirmar([expediente.pk for expediente in cambiados])
+
+
+def normalizar_movimiento(row, fechas=None):
+    """
+    Convierte una fila (ya reparada) del CSV de movimientos en los valores
+    del modelo Movimiento. `fechas` mapea cada campo de fecha a su
+    ColumnaFecha; al importar un archivo se reutilizan las mismas para
+    aprovechar el formato detectado y la caché.
+    """
+    if fechas is None:
+        fechas = columnas_fecha(*CAMPOS_FECHA_MOVIMIENTO)
+    datos = {
+        "nombre_escrito": (row.get("nombre_escrito") or "").strip()[:100],
+        "link_escrito": (row.get("link_escrito") or "")[:500],
+        "tipo": (row.get("tipo") or "")[:100],
+        "estado": (row.get("estado") or "")[:100],
+        "generado_por": (row.get("generado_por") or "")[:255],
+        "descripcion": row.get("descripcion") or "",
+    }
+    for campo in CAMPOS_FECHA_MOVIMIENTO:
+        datos[campo] = fechas[campo](row.get(campo))
+    datos["hash_origen"] = calcular_hash(datos, CAMPOS_MOVIMIENTO)
+    return datos
+
+
+def normalizar_movimientos(filas):
+    """
+    Normaliza las filas del CSV de movimientos con las mismas ColumnaFecha.
+    Genera pares (número de expediente, datos del Movimiento).
+    """
+    fechas = columnas_fecha(*CAMPOS_FECHA_MOVIMIENTO)
+    for row in filas:
+        yield (row.get("expediente") or "").strip(), normalizar_movimiento(row, fechas)
+
+
+def _numerar_movimientos(filas, desde_fila, normalizadas):
+    movimientos = islice(filas, desde_fila, None)
+    if not normalizadas:
+        movimientos = normalizar_movimientos(movimientos)
+    return enumerate(movimientos, start=desde_fila + 1)
+
+
+def clave_movimiento(nombre_escrito, fecha_presentacion, tipo):
+    """
+    Clave natural de un movimiento dentro de su expediente: el nombre del
+    escrito o, si no tiene, la fecha de presentación y el tipo. Los
+    movimientos sin ninguna de las dos no tienen clave y siempre se crean.
+    """
+    if nombre_escrito:
+        return ("escrito", nombre_escrito)
+    if fecha_presentacion:
+        return ("presentacion", fecha_presentacion, tipo)
+    return None
+
+
+def importar_movimientos(  # noqa: PLR0913
+    expediente,
+    filas,
+    batch_size=BATCH_SIZE,
+    al_guardar_lote=None,
+    desde_fila=0,
+    *,
+    normalizadas=False,
+    reglas=None,
+):
+    """
+    Crea o actualiza los Movimiento de `expediente` a partir de las filas del
+    CSV. Las claves naturales de los movimientos existentes se cargan una
+    sola vez en un mapa clave -> pk; cada lote de altas y modificaciones se
+    escribe con un bulk_create y un bulk_update.
+
+    Cada lote se escribe en su propio transaction.atomic(): fuera de una
+    transacción eso confirma cada `batch_size` filas, y dentro de una es un
+    savepoint. Si un lote falla se reintenta fila por fila para registrar en
+    el resultado qué filas tienen errores y guardar el resto.
+
+    Las primeras `desde_fila` filas se saltean sin procesar, para retomar
+    una importación interrumpida. Si se indica, `al_guardar_lote(resultado)`
+    se llama al final de la transacción de cada lote, como en
+    importar_expedientes(). Con `normalizadas=True`, `filas` ya son
+    pares (número de expediente, datos) como los de normalizar_movimientos().
+
+    Los movimientos nuevos de cada lote pasan por las reglas de tareas
+    (`reglas`, un reglas.MotorReglas; por defecto las activas).
+    """
+    resultado = ResultadoImportacion(ultima_fila=desde_fila)
+    reglas = MotorReglas.cargar() if reglas is None else reglas
+    existentes = _claves_existentes(expediente.movimientos.all())
+    numerados = _numerar_movimientos(filas, desde_fila, normalizadas)
+    for lote in batched(numerados, batch_size, strict=False):
+        with transaction.atomic():
+            _guardar_lote(
+                [(n, expediente.pk, datos) for n, (_, datos) in lote],
+                existentes,
+                resultado,
+                reglas,
+            )
+            resultado.ultima_fila = lote[-1][0]
+            if al_guardar_lote:
+                al_guardar_lote(resultado)
+    return resultado
+
+
+def importar_movimientos_global(  # noqa: PLR0913
+    filas,
+    batch_size=BATCH_SIZE,
+    al_guardar_lote=None,
+    desde_fila=0,
+    *,
+    normalizadas=False,
+    reglas=None,
+):
+    """
+    Importa movimientos de varios expedientes desde un mismo CSV, usando la
+    columna `expediente` de cada fila. Los números se resuelven a ids con una
+    sola consulta al empezar, y las claves de los movimientos existentes se
+    cargan por lote solo para los expedientes que todavía no aparecieron.
+    Cada lote, con filas de cualquier expediente, se escribe igual que en
+    importar_movimientos(), que también documenta los demás argumentos.
+
+    Las filas de expedientes que no están cargados no se importan: cuentan
+    como fallidas y se registra un error por cada número desconocido.
+    """
+    resultado = ResultadoImportacion(ultima_fila=desde_fila)
+    reglas = MotorReglas.cargar() if reglas is None else reglas
+    ids = dict(ExpedienteSiped.objects.values_list("expediente", "pk"))
+    existentes = {}
+    cargados = set()
+    desconocidos = set()
+    numerados = _numerar_movimientos(filas, desde_fila, normalizadas)
+    for lote in batched(numerados, batch_size, strict=False):
+        lote_normalizado = []
+        for numero, (expediente_nro, datos) in lote:
+            expediente_id = ids.get(expediente_nro)
+            if expediente_id is None:
+                if expediente_nro in desconocidos:
+                    resultado.fallidas += 1
+                else:
+                    desconocidos.add(expediente_nro)
+                    resultado.registrar_error(
+                        numero,
+                        f"Expediente inexistente: {expediente_nro}"
+                        if expediente_nro
+                        else "Fila sin número de expediente",
+                    )
+                continue
+            lote_normalizado.append((numero, expediente_id, datos))
+
+        sin_cargar = {expediente_id for _, expediente_id, _ in lote_normalizado}
+        sin_cargar -= cargados
+        if sin_cargar:
+            existentes.update(
+                _claves_existentes(
+                    Movimiento.objects.filter(expediente_id__in=sin_cargar),
+                ),
+            )
+            cargados |= sin_cargar
+
+        with transaction.atomic():
+            _guardar_lote(lote_normalizado, existentes, resultado, reglas)
+            resultado.ultima_fila = lote[-1][0]
+            if al_guardar_lote:
+                al_guardar_lote(resultado)
+    return resultado
+
+
+def _claves_existentes(movimientos):
+    """
+    Mapa (expediente_id, clave) -> (pk, hash_origen) de los movimientos con
+    clave natural.
+    """
+    existentes = {}
+    for (
+        pk,
+        expediente_id,
+        nombre_escrito,
+        fecha_presentacion,
+        tipo,
+        hash_origen,
+    ) in movimientos.order_by().values_list(
+        "pk",
+        "expediente_id",
+        "nombre_escrito",
+        "fecha_presentacion",
+        "tipo",
+        "hash_origen",
+    ):
+        clave = clave_movimiento(nombre_escrito, fecha_presentacion, tipo)
+        if clave:
+            existentes[expediente_id, clave] = (pk, hash_origen)
+    return existentes
+
+
+def _guardar_lote(lote, existentes, resultado, reglas):
+    """
+    Escribe un lote de (número de fila, expediente_id, datos). Si falla, lo
+    reintenta fila por fila y registra en `resultado` las que tienen errores.
+    """
+    try:
+        parcial = _guardar_lote_movimientos(
+            [(expediente_id, datos) for _, expediente_id, datos in lote],
+            existentes,
+            reglas,
+        )
+    except DatabaseError:
+        parcial = ResultadoImportacion()
+        for numero, expediente_id, datos in lote:
+            try:
+                parcial.sumar(
+                    _guardar_lote_movimientos(
+                        [(expediente_id, datos)],
+                        existentes,
+                        reglas,
+                    ),
+                )
+            except DatabaseError as e:
+                resultado.registrar_error(numero, e)
+    resultado.sumar(parcial)
+
+
+def _escribir_movimientos(nuevos, modificados):
+    Movimiento.objects.bulk_create(nuevos)
+    # bulk_update no pasa por pre_save, que es quien asigna auto_now.
+    ahora = timezone.now()
+    for movimiento in modificados:
+        movimiento.actualizado = ahora
+    Movimiento.objects.bulk_update(
+        modificados,
+        [*CAMPOS_MOVIMIENTO, "hash_origen", "actualizado"],
+    )
+
+
+def _guardar_lote_movimientos(lote, existentes, reglas):
+    parcial = ResultadoImportacion()
+    nuevos = []
+    pendientes = {}
+    modificados = {}
+    for expediente_id, datos in lote:
+        clave = clave_movimiento(
+            datos["nombre_escrito"],
+            datos["fecha_presentacion"],
+            datos["tipo"],
+        )
+        clave = clave and (expediente_id, clave)
+        if clave in pendientes:
+            # Repetido de una fila nueva de este mismo lote.
+            movimiento = pendientes[clave]
+            if movimiento.hash_origen == datos["hash_origen"]:
+                parcial.sin_cambios += 1
+                continue
+            for campo, valor in datos.items():
+                setattr(movimiento, campo, valor)
+            parcial.actualizados += 1
+        elif clave in existentes:
+            pk, hash_origen = existentes[clave]
+            # Si la clave ya se repitió en el lote, gana la última fila.
+            if clave in modificados:
+                hash_origen = modificados[clave].hash_origen
+            if hash_origen == datos["hash_origen"]:
+                parcial.sin_cambios += 1
+                continue
+            modificados[clave] = Movimiento(
+                pk=pk,
+                expediente_id=expediente_id,
+                **datos,
+            )
+            parcial.actualizados += 1
+        else:
+            movimiento = Movimiento(expediente_id=expediente_id, **datos)
+            nuevos.append(movimiento)
+            if clave:
+                pendientes[clave] = movimiento
+            parcial.creados += 1
+    if not nuevos and not modificados:
+        return parcial
+
+    escritos = [*nuevos, *modificados.values()]
+    with transaction.atomic():
+        _escribir_movimientos(nuevos, modificados.values())
+        # Como en los expedientes, un solo UPDATE para el vector del lote.
+        actualizar_busqueda_movimientos(
+            Movimiento.objects.filter(
+                pk__in=[movimiento.pk for movimiento in escritos],
+            ),
+        )
+        actualizar_resumen(
+            {movimiento.expediente_id for movimiento in escritos},
+            Counter(movimiento.expediente_id for movimiento in nuevos),
+        )
+        parcial.tareas = reglas.generar_tareas(nuevos)
+        invalidar_al_confirmar({movimiento.expediente_id for movimiento in escritos})
+    # En PostgreSQL bulk_create asigna los pk, así que los movimientos
+    # creados en este lote pueden actualizarse en los siguientes.
+    existentes.update(
+        (clave, (movimiento.pk, movimiento.hash_origen))
+        for clave, movimiento in [*pendientes.items(), *modificados.items()]
+    )
+    return parcial
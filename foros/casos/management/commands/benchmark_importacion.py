@@ -0,0 +1,132 @@
+import platform
+import tempfile
+from pathlib import Path
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import setup_databases
+from django.test.utils import setup_test_environment
+from django.test.utils import teardown_databases
+from django.test.utils import teardown_test_environment
+from django.utils import timezone
+
+from foros.casos.benchmarks import ESCENARIOS
+from foros.casos.benchmarks import TAMANIOS
+from foros.casos.benchmarks import correr_escenarios
+from foros.casos.benchmarks import guardar_corrida
+from foros.casos.benchmarks import medir_plantillas
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide las importaciones del SIPED con CSV sintéticos y guarda filas por "
+        "segundo, consultas y pico de memoria en un JSON. Corre sobre una base "
+        "de datos de prueba que se crea y se borra al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--filas",
+            type=int,
+            nargs="+",
+            default=list(TAMANIOS),
+            help="Tamaños a medir, en filas (por defecto: %(default)s)",
+        )
+        parser.add_argument(
+            "--escenarios",
+            nargs="+",
+            choices=ESCENARIOS,
+            default=list(ESCENARIOS),
+        )
+        parser.add_argument(
+            "--salida",
+            default="benchmark_importacion.json",
+            help=(
+                "Archivo JSON donde se acumulan los resultados, una corrida por "
+                "etiqueta"
+            ),
+        )
+        parser.add_argument(
+            "--etiqueta",
+            default="",
+            help=(
+                "Texto libre para identificar la corrida, por ejemplo el commit. "
+                "Una corrida con la misma etiqueta reemplaza a la anterior; sin "
+                "etiqueta se usa la fecha"
+            ),
+        )
+        parser.add_argument(
+            "--plantillas",
+            action="store_true",
+            help=(
+                "En lugar de las importaciones, medir el tiempo de respuesta del "
+                "listado de casos y del detalle de expediente con cada forma de "
+                "cargar las plantillas"
+            ),
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Reutilizar la base de datos de prueba si ya existe",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        bases = setup_databases(
+            verbosity=options["verbosity"],
+            interactive=False,
+            keepdb=options["keepdb"],
+        )
+        try:
+            usuario = get_user_model().objects.create_user(
+                username="benchmark",
+                email="benchmark@example.com",
+            )
+            if options["plantillas"]:
+                resultados = medir_plantillas(usuario)
+            else:
+                with tempfile.TemporaryDirectory() as directorio:
+                    resultados = correr_escenarios(
+                        usuario,
+                        directorio,
+                        options["filas"],
+                        options["escenarios"],
+                    )
+        finally:
+            teardown_databases(
+                bases,
+                verbosity=options["verbosity"],
+                keepdb=options["keepdb"],
+            )
+            teardown_test_environment()
+
+        for resultado in resultados:
+            if options["plantillas"]:
+                self.stdout.write(
+                    "{modo:>17} {plantilla:>36} primer pedido "
+                    "{primer_pedido_ms:>8.2f} ms  mediana {mediana_ms:>7.2f} ms  "
+                    "precarga {precarga_ms:>7.2f} ms".format(**resultado),
+                )
+                continue
+            self.stdout.write(
+                "{escenario:>20} {filas:>9} filas {segundos:>9.2f} s "
+                "{filas_por_segundo:>9} filas/s {consultas:>7} consultas "
+                "{pico_rss_mb:>8.1f} MB  {resultado}".format(**resultado),
+            )
+
+        salida = Path(options["salida"])
+        etiqueta = guardar_corrida(
+            salida,
+            options["etiqueta"],
+            {
+                "fecha": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "plantillas": options["plantillas"],
+                "resultados": resultados,
+            },
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Resultados guardados en {salida} como {etiqueta!r}"),
+        )
@@ -0,0 +1,170 @@
+# Sincroniza el estado de las migraciones con foros/casos/models.py:
+# renombra Expediente_SIPED a ExpedienteSiped, pasa los campos de texto a
+# NOT NULL (blank) y agrega los campos nuevos de Tarea.
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+CAMPOS_TEXTO = {
+    "ExpedienteSiped": [
+        "link_detalle",
+        "caratula",
+        "estado",
+        "localidad",
+        "dependencia",
+        "secretaria",
+    ],
+    "Movimiento": [
+        "nombre_escrito",
+        "link_escrito",
+        "tipo",
+        "estado",
+        "generado_por",
+        "descripcion",
+    ],
+}
+
+ESTADOS_TAREA = {
+    "PENDIENTE": "A_REALIZAR",
+    "A_REVISAR": "A_CONTROLAR",
+    "COMPLETADO": "REALIZADA",
+}
+
+
+def nulos_a_vacios(apps, schema_editor):
+    for modelo, campos in CAMPOS_TEXTO.items():
+        model = apps.get_model("casos", modelo)
+        for campo in campos:
+            model.objects.filter(**{f"{campo}__isnull": True}).update(**{campo: ""})
+
+
+def migrar_estados_tarea(apps, schema_editor):
+    Tarea = apps.get_model("casos", "Tarea")
+    for viejo, nuevo in ESTADOS_TAREA.items():
+        Tarea.objects.filter(estado=viejo).update(estado=nuevo)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0002_expediente_siped_alter_movimiento_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='Expediente_SIPED',
+            new_name='ExpedienteSiped',
+        ),
+        # Evita "pending trigger events" al alterar tablas recién actualizadas.
+        migrations.RunSQL("SET CONSTRAINTS ALL IMMEDIATE", migrations.RunSQL.noop),
+        migrations.RunPython(nulos_a_vacios, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='expedientesiped',
+            name='link_detalle',
+            field=models.URLField(blank=True, max_length=500),
+        ),
+        migrations.AlterField(
+            model_name='expedientesiped',
+            name='caratula',
+            field=models.CharField(blank=True, help_text='Carátula oficial (Ej: PEREZ C/ GOMEZ S/ D Y P)', max_length=500),
+        ),
+        migrations.AlterField(
+            model_name='expedientesiped',
+            name='estado',
+            field=models.CharField(blank=True, help_text='Ej: A DESPACHO, PUBLICADO', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='expedientesiped',
+            name='localidad',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='expedientesiped',
+            name='dependencia',
+            field=models.CharField(blank=True, help_text='Ej: Juzgado Civil Nro 1', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='expedientesiped',
+            name='secretaria',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='movimiento',
+            name='nombre_escrito',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='movimiento',
+            name='link_escrito',
+            field=models.URLField(blank=True, max_length=500),
+        ),
+        migrations.AlterField(
+            model_name='movimiento',
+            name='tipo',
+            field=models.CharField(blank=True, help_text='Ej: ESCRITO, ESTESE', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='movimiento',
+            name='estado',
+            field=models.CharField(blank=True, help_text='Ej: PUBLICADO', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='movimiento',
+            name='generado_por',
+            field=models.CharField(blank=True, help_text='Ej: JUZGADO, o nombre de abogado', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='movimiento',
+            name='descripcion',
+            field=models.TextField(blank=True, help_text="Campo 'descripcion' del CSV"),
+        ),
+        migrations.AlterModelOptions(
+            name='tarea',
+            options={'ordering': ['fecha_limite', '-fecha_creacion'], 'verbose_name': 'Tarea Interna', 'verbose_name_plural': 'Tareas Internas'},
+        ),
+        migrations.RenameField(
+            model_name='tarea',
+            old_name='fecha',
+            new_name='fecha_creacion',
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='fecha_inicio',
+            field=models.DateField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='fecha_limite',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='fecha_terminacion',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='responsable',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tareas_asignadas', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='titulo',
+            field=models.CharField(default='', help_text='Título corto para la vista', max_length=200),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='tarea',
+            name='descripcion',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='tarea',
+            name='estado',
+            field=models.CharField(choices=[('A_REALIZAR', 'A Realizar'), ('REALIZADA', 'Realizada'), ('A_CONTROLAR', 'A Controlar'), ('ESPERANDO', 'Esperando')], default='A_REALIZAR', max_length=20),
+        ),
+        migrations.RunPython(migrar_estados_tarea, migrations.RunPython.noop),
+    ]
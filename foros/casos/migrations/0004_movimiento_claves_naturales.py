@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:40
+
+from django.db import migrations, models
+
+# El importador anterior creaba movimientos repetidos. Antes de las
+# restricciones se deja, de cada clave natural, el de menor id.
+BORRAR_REPETIDOS = """
+DELETE FROM casos_movimiento AS repetido
+USING casos_movimiento AS original
+WHERE original.expediente_id = repetido.expediente_id
+    AND original.id < repetido.id
+    AND (
+        (repetido.nombre_escrito <> ''
+            AND original.nombre_escrito = repetido.nombre_escrito)
+        OR (repetido.nombre_escrito = ''
+            AND original.nombre_escrito = ''
+            AND repetido.fecha_presentacion IS NOT NULL
+            AND original.fecha_presentacion = repetido.fecha_presentacion
+            AND original.tipo = repetido.tipo)
+    )
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0003_rename_expediente_siped_tarea_campos'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BORRAR_REPETIDOS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='movimiento',
+            constraint=models.UniqueConstraint(condition=models.Q(('nombre_escrito', ''), _negated=True), fields=('expediente', 'nombre_escrito'), name='casos_movimiento_unico_escrito'),
+        ),
+        migrations.AddConstraint(
+            model_name='movimiento',
+            constraint=models.UniqueConstraint(condition=models.Q(('fecha_presentacion__isnull', False), ('nombre_escrito', '')), fields=('expediente', 'fecha_presentacion', 'tipo'), name='casos_movimiento_unico_sin_escrito'),
+        ),
+    ]
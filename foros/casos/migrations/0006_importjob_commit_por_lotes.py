@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0005_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='filas_con_error',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='ultima_fila_confirmada',
+            field=models.PositiveIntegerField(default=0, help_text='Filas ya confirmadas; una importación interrumpida sigue desde acá'),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='errores',
+            field=models.JSONField(blank=True, default=list, help_text='Lista de {"fila": N, "error": "..."}; fila es null si falló todo'),
+        ),
+    ]
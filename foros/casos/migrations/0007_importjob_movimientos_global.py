@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0006_importjob_commit_por_lotes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='expediente',
+            field=models.ForeignKey(blank=True, help_text='Solo para importaciones de movimientos de un expediente', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='importaciones', to='casos.expedientesiped'),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='tipo',
+            field=models.CharField(choices=[('EXPEDIENTES', 'Expedientes'), ('MOVIMIENTOS', 'Movimientos'), ('MOVIMIENTOS_GLOBAL', 'Movimientos (varios expedientes)')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0007_importjob_movimientos_global'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expedientesiped',
+            index=models.Index(models.OrderBy(models.F('fec_ult_mov'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='casos_exped_ult_mov_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=models.Index(models.F('expediente'), models.OrderBy(models.F('fecha_presentacion'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='casos_mov_exp_fecha_id_idx'),
+        ),
+    ]
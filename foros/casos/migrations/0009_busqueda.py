@@ -0,0 +1,84 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:13
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Los índices de trigramas aceleran icontains (UPPER(col) LIKE UPPER(...)).
+# Solo se crean si el servidor tiene pg_trgm, que no siempre está disponible.
+INDICES_TRIGRAMAS = [
+    ("casos_exped_expediente_trgm", "casos_expedientesiped", "expediente"),
+    ("casos_exped_caratula_trgm", "casos_expedientesiped", "caratula"),
+    ("casos_exped_dependencia_trgm", "casos_expedientesiped", "dependencia"),
+    ("casos_mov_descripcion_trgm", "casos_movimiento", "descripcion"),
+]
+
+CREAR_TRIGRAMAS = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+%s
+    END IF;
+END
+$$;
+""" % "\n".join(
+    f"        CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} "
+    f"USING gin (UPPER({columna}::text) gin_trgm_ops);"
+    for nombre, tabla, columna in INDICES_TRIGRAMAS
+)
+
+BORRAR_TRIGRAMAS = ";".join(
+    f"DROP INDEX IF EXISTS {nombre}" for nombre, _, _ in INDICES_TRIGRAMAS
+)
+
+
+def calcular_vectores(apps, schema_editor):
+    # Las mismas expresiones que busqueda.py, copiadas para que la migración
+    # no cambie si ese módulo cambia.
+    ExpedienteSiped = apps.get_model("casos", "ExpedienteSiped")
+    Movimiento = apps.get_model("casos", "Movimiento")
+    ExpedienteSiped.objects.update(
+        busqueda=(
+            SearchVector("expediente", weight="A", config="simple")
+            + SearchVector("caratula", weight="A", config="spanish")
+            + SearchVector("dependencia", weight="C", config="spanish")
+        ),
+    )
+    Movimiento.objects.update(
+        busqueda=(
+            SearchVector("descripcion", weight="B", config="spanish")
+            + SearchVector("tipo", "nombre_escrito", weight="D", config="simple")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0008_paginacion_keyset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expedientesiped',
+            name='busqueda',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='movimiento',
+            name='busqueda',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='expedientesiped',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['busqueda'], name='casos_exped_busqueda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['busqueda'], name='casos_mov_busqueda_idx'),
+        ),
+        migrations.RunPython(calcular_vectores, migrations.RunPython.noop),
+        migrations.RunSQL(CREAR_TRIGRAMAS, BORRAR_TRIGRAMAS),
+    ]
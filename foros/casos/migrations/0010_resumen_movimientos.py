@@ -0,0 +1,66 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:19
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def calcular_resumen(apps, schema_editor):
+    # La misma cuenta que resumen.recalcular_resumen(), copiada para que la
+    # migración no dependa de ese módulo.
+    ExpedienteSiped = apps.get_model("casos", "ExpedienteSiped")
+    Movimiento = apps.get_model("casos", "Movimiento")
+    movimientos = Movimiento.objects.filter(expediente=OuterRef("pk"))
+    cantidad = (
+        movimientos.order_by()
+        .values("expediente")
+        .annotate(cantidad=Count("pk"))
+        .values("cantidad")
+    )
+    ultimo = movimientos.order_by(
+        F("fecha_presentacion").desc(nulls_last=True),
+        "-pk",
+    )
+    ExpedienteSiped.objects.update(
+        cantidad_movimientos=Coalesce(Subquery(cantidad), Value(0)),
+        ultimo_movimiento_fecha=Subquery(ultimo.values("fecha_presentacion")[:1]),
+        ultimo_movimiento_tipo=Coalesce(
+            Subquery(ultimo.values("tipo")[:1]),
+            Value(""),
+        ),
+        ultimo_movimiento_estado=Coalesce(
+            Subquery(ultimo.values("estado")[:1]),
+            Value(""),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0009_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expedientesiped',
+            name='cantidad_movimientos',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='expedientesiped',
+            name='ultimo_movimiento_estado',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='expedientesiped',
+            name='ultimo_movimiento_fecha',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='expedientesiped',
+            name='ultimo_movimiento_tipo',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(calcular_resumen, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0010_resumen_movimientos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expedientesiped',
+            name='hash_origen',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='sin_cambios',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='movimiento',
+            name='hash_origen',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+    ]
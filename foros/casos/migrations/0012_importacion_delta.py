@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0011_hash_origen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='bloques_omitidos',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='bloques_totales',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='completa',
+            field=models.BooleanField(default=False, help_text='Procesar todo el archivo y no solo lo que cambió'),
+        ),
+        migrations.CreateModel(
+            name='FuenteImportacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('EXPEDIENTES', 'Expedientes'), ('MOVIMIENTOS', 'Movimientos'), ('MOVIMIENTOS_GLOBAL', 'Movimientos (varios expedientes)')], max_length=20)),
+                ('huella', models.CharField(help_text='SHA-256 del archivo completo', max_length=64)),
+                ('bloques', models.JSONField(blank=True, default=list, help_text='Huellas de los bloques de registros del archivo')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('expediente', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='fuentes_importacion', to='casos.expedientesiped')),
+                ('ultima_importacion', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='casos.importjob')),
+            ],
+            options={
+                'verbose_name': 'Fuente de importación',
+                'verbose_name_plural': 'Fuentes de importación',
+                'constraints': [models.UniqueConstraint(fields=('tipo', 'expediente'), name='casos_fuente_tipo_expediente_uniq', nulls_distinct=False)],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0012_importacion_delta'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(models.F('responsable'), models.F('fecha_limite'), models.OrderBy(models.F('fecha_creacion'), descending=True), condition=models.Q(('estado', 'REALIZADA'), _negated=True), name='casos_tarea_resp_pend_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(models.F('caso'), models.F('fecha_limite'), models.OrderBy(models.F('fecha_creacion'), descending=True), condition=models.Q(('estado', 'REALIZADA'), _negated=True), name='casos_tarea_caso_pend_idx'),
+        ),
+    ]
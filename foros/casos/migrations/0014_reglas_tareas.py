@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0013_tareas_pendientes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReglaTarea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=200)),
+                ('activa', models.BooleanField(default=True)),
+                ('tipo', models.CharField(blank=True, max_length=100)),
+                ('estado', models.CharField(blank=True, max_length=100)),
+                ('generado_por', models.CharField(blank=True, max_length=255)),
+                ('titulo', models.CharField(help_text='Título de la tarea creada', max_length=200)),
+                ('dias_plazo', models.PositiveSmallIntegerField(default=0, help_text='Días desde la presentación del movimiento hasta la fecha límite')),
+                ('antiguedad_maxima', models.PositiveSmallIntegerField(blank=True, default=30, help_text='Solo movimientos presentados en los últimos N días (vacío: todos). Evita crear tareas al cargar el historial de un expediente.', null=True)),
+            ],
+            options={
+                'verbose_name': 'Regla de tareas',
+                'verbose_name_plural': 'Reglas de tareas',
+                'ordering': ['pk'],
+            },
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='tareas_creadas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='movimiento',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tareas', to='casos.movimiento'),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='regla',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tareas', to='casos.reglatarea'),
+        ),
+        migrations.AddConstraint(
+            model_name='tarea',
+            constraint=models.UniqueConstraint(fields=('regla', 'movimiento', 'caso'), name='casos_tarea_regla_mov_caso_uniq'),
+        ),
+    ]
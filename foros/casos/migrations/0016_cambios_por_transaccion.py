@@ -0,0 +1,89 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+TABLAS = {
+    "casos_exped": "casos_expedientesiped",
+    "casos_mov": "casos_movimiento",
+    "casos_caso": "casos_caso",
+    "casos_tarea": "casos_tarea",
+    "casos_elim": "casos_eliminacion",
+}
+
+# pg_current_xact_id() es el id de la transacción de nivel superior, también
+# dentro de un SAVEPOINT. Las filas ya existentes quedan con 0.
+CREAR_TRIGGERS = """
+CREATE FUNCTION casos_marcar_transaccion() RETURNS trigger AS $$
+BEGIN
+    NEW.transaccion := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+""" + "".join(
+    f"CREATE TRIGGER {prefijo}_transaccion BEFORE INSERT OR UPDATE ON {tabla} "
+    "FOR EACH ROW EXECUTE FUNCTION casos_marcar_transaccion();\n"
+    for prefijo, tabla in TABLAS.items()
+)
+
+BORRAR_TRIGGERS = "".join(
+    f"DROP TRIGGER IF EXISTS {prefijo}_transaccion ON {tabla};\n"
+    for prefijo, tabla in TABLAS.items()
+) + "DROP FUNCTION IF EXISTS casos_marcar_transaccion();"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('casos', '0015_cambios'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='caso',
+            name='transaccion',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eliminacion',
+            name='transaccion',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='expedientesiped',
+            name='transaccion',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='movimiento',
+            name='transaccion',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tarea',
+            name='transaccion',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='caso',
+            index=models.Index(fields=['transaccion', 'id'], name='casos_caso_transaccion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eliminacion',
+            index=models.Index(fields=['transaccion', 'id'], name='casos_elim_transaccion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expedientesiped',
+            index=models.Index(fields=['transaccion', 'id'], name='casos_exped_transaccion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movimiento',
+            index=models.Index(fields=['transaccion', 'id'], name='casos_mov_transaccion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['transaccion', 'id'], name='casos_tarea_transaccion_idx'),
+        ),
+        migrations.RunSQL(CREAR_TRIGGERS, BORRAR_TRIGGERS),
+    ]
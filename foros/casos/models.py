@@ -1,5 +1,10 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F
+from django.db.models import Q
+from django.urls import reverse
 from django.utils import timezone
 
 from foros.clientes.models import Cliente
@@ -40,10 +45,58 @@ class ExpedienteSiped(models.Model):
         help_text="Ej: Juzgado Civil Nro 1",
     )
     secretaria = models.CharField(max_length=100, blank=True)
+    # Hash de la fila del CSV con la que se importó, para no reescribir el
+    # registro si no cambió (ver importers.calcular_hash). Vacío si no vino
+    # de una importación.
+    hash_origen = models.CharField(max_length=32, blank=True, editable=False)
+    # Resumen de los movimientos importados (ver resumen.py). A diferencia
+    # de fec_ult_mov, que viene del CSV, sale de los Movimiento guardados.
+    cantidad_movimientos = models.PositiveIntegerField(default=0, editable=False)
+    ultimo_movimiento_fecha = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    ultimo_movimiento_tipo = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False,
+    )
+    ultimo_movimiento_estado = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False,
+    )
+    # Vector de texto completo, calculado en la base (ver busqueda.py).
+    busqueda = SearchVectorField(null=True, editable=False)
+    # Última escritura, para Last-Modified en la API. Las escrituras masivas
+    # que no pasan por save() lo asignan explícitamente.
+    actualizado = models.DateTimeField(auto_now=True)
+    # Id de la transacción que escribió la fila por última vez, para el feed
+    # de cambios (ver cambios.py). Lo asigna un trigger en cada INSERT y
+    # UPDATE, también en las escrituras masivas.
+    transaccion = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Expediente SIPED"
         verbose_name_plural = "Expedientes SIPED"
+        indexes = [
+            # Orden y paginación por clave del listado (paginacion.py).
+            models.Index(
+                F("fec_ult_mov").desc(nulls_last=True),
+                F("id").desc(),
+                name="casos_exped_ult_mov_id_idx",
+            ),
+            GinIndex(fields=["busqueda"], name="casos_exped_busqueda_idx"),
+            models.Index(
+                fields=["actualizado", "id"],
+                name="casos_exped_actualizado_idx",
+            ),
+            models.Index(
+                fields=["transaccion", "id"],
+                name="casos_exped_transaccion_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.expediente} - {self.dependencia or ''}"
@@ -89,15 +142,67 @@ class Caso(models.Model):
         default=Naturaleza.JUDICIAL,
     )
     fecha_ingreso = models.DateField(auto_now_add=True)
+    # Como en ExpedienteSiped.
+    actualizado = models.DateTimeField(auto_now=True)
+    transaccion = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Caso"
         verbose_name_plural = "Casos"
+        indexes = [
+            models.Index(
+                fields=["actualizado", "id"],
+                name="casos_caso_actualizado_idx",
+            ),
+            models.Index(
+                fields=["transaccion", "id"],
+                name="casos_caso_transaccion_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.titulo_interno
 
 
+class ReglaTarea(models.Model):
+    """
+    Regla que crea una Tarea para cada Caso vinculado a un expediente cuando
+    la importación trae un movimiento nuevo que coincide. Los criterios
+    vacíos aceptan cualquier valor; se comparan sin distinguir mayúsculas.
+    Ver foros.casos.reglas.
+    """
+
+    nombre = models.CharField(max_length=200)
+    activa = models.BooleanField(default=True)
+
+    tipo = models.CharField(max_length=100, blank=True)
+    estado = models.CharField(max_length=100, blank=True)
+    generado_por = models.CharField(max_length=255, blank=True)
+
+    titulo = models.CharField(max_length=200, help_text="Título de la tarea creada")
+    dias_plazo = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Días desde la presentación del movimiento hasta la fecha límite",
+    )
+    antiguedad_maxima = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        default=30,
+        help_text=(
+            "Solo movimientos presentados en los últimos N días (vacío: todos). "
+            "Evita crear tareas al cargar el historial de un expediente."
+        ),
+    )
+
+    class Meta:
+        verbose_name = "Regla de tareas"
+        verbose_name_plural = "Reglas de tareas"
+        ordering = ["pk"]
+
+    def __str__(self):
+        return self.nombre
+
+
 class Tarea(models.Model):
     """
     Cada una de las novedades o tareas INTERNAS asociadas a un Caso.
@@ -129,6 +234,22 @@ class Tarea(models.Model):
         related_name="tareas_creadas",
     )
 
+    # Origen de las tareas creadas por una regla al importar movimientos.
+    regla = models.ForeignKey(
+        ReglaTarea,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="tareas",
+    )
+    movimiento = models.ForeignKey(
+        "Movimiento",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="tareas",
+    )
+
     titulo = models.CharField(max_length=200, help_text="Título corto para la vista")
     descripcion = models.TextField(blank=True)
 
@@ -142,11 +263,47 @@ class Tarea(models.Model):
         default=Estado.A_REALIZAR,
     )
     fecha_creacion = models.DateTimeField(auto_now_add=True)
+    # Como en ExpedienteSiped.
+    actualizado = models.DateTimeField(auto_now=True)
+    transaccion = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Tarea Interna"
         verbose_name_plural = "Tareas Internas"
         ordering = ["fecha_limite", "-fecha_creacion"]
+        # Tableros de tareas pendientes (tareas.py): las realizadas quedan fuera
+        # de los índices, que crecen solo con las tareas abiertas.
+        indexes = [
+            models.Index(
+                "responsable",
+                "fecha_limite",
+                F("fecha_creacion").desc(),
+                name="casos_tarea_resp_pend_idx",
+                condition=~Q(estado="REALIZADA"),
+            ),
+            models.Index(
+                "caso",
+                "fecha_limite",
+                F("fecha_creacion").desc(),
+                name="casos_tarea_caso_pend_idx",
+                condition=~Q(estado="REALIZADA"),
+            ),
+            models.Index(
+                fields=["actualizado", "id"],
+                name="casos_tarea_actualizado_idx",
+            ),
+            models.Index(
+                fields=["transaccion", "id"],
+                name="casos_tarea_transaccion_idx",
+            ),
+        ]
+        constraints = [
+            # Una regla crea a lo sumo una tarea por movimiento y caso.
+            models.UniqueConstraint(
+                fields=["regla", "movimiento", "caso"],
+                name="casos_tarea_regla_mov_caso_uniq",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.titulo} - {self.get_estado_display()}"
@@ -198,11 +355,228 @@ class Movimiento(models.Model):
     )
     fecha_firma = models.DateTimeField(null=True, blank=True)
     fecha_publicacion = models.DateTimeField(null=True, blank=True)
+    # Como en ExpedienteSiped.
+    hash_origen = models.CharField(max_length=32, blank=True, editable=False)
+    # Vector de texto completo, calculado en la base (ver busqueda.py).
+    busqueda = SearchVectorField(null=True, editable=False)
+    # Como en ExpedienteSiped.
+    actualizado = models.DateTimeField(auto_now=True)
+    transaccion = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Movimiento SIPED"
         verbose_name_plural = "Movimientos SIPED"
         ordering = ["-fecha_presentacion"]
+        indexes = [
+            # Historial de un expediente paginado por clave (paginacion.py).
+            models.Index(
+                "expediente",
+                F("fecha_presentacion").desc(nulls_last=True),
+                F("id").desc(),
+                name="casos_mov_exp_fecha_id_idx",
+            ),
+            GinIndex(fields=["busqueda"], name="casos_mov_busqueda_idx"),
+            models.Index(
+                fields=["actualizado", "id"],
+                name="casos_mov_actualizado_idx",
+            ),
+            models.Index(
+                fields=["transaccion", "id"],
+                name="casos_mov_transaccion_idx",
+            ),
+        ]
+        # Claves naturales con las que la importación identifica movimientos.
+        constraints = [
+            models.UniqueConstraint(
+                fields=["expediente", "nombre_escrito"],
+                condition=~Q(nombre_escrito=""),
+                name="casos_movimiento_unico_escrito",
+            ),
+            models.UniqueConstraint(
+                fields=["expediente", "fecha_presentacion", "tipo"],
+                condition=Q(nombre_escrito="", fecha_presentacion__isnull=False),
+                name="casos_movimiento_unico_sin_escrito",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.fecha_presentacion} - {self.tipo}"
+
+
+class ImportJob(models.Model):
+    """
+    Una importación de CSV del SIPED, procesada en segundo plano por Celery.
+    Guarda el archivo subido y el progreso para poder consultarlo mientras
+    corre.
+    """
+
+    class Tipo(models.TextChoices):
+        EXPEDIENTES = "EXPEDIENTES", "Expedientes"
+        MOVIMIENTOS = "MOVIMIENTOS", "Movimientos"
+        MOVIMIENTOS_GLOBAL = "MOVIMIENTOS_GLOBAL", "Movimientos (varios expedientes)"
+
+    class Estado(models.TextChoices):
+        PENDIENTE = "PENDIENTE", "Pendiente"
+        EN_PROCESO = "EN_PROCESO", "En proceso"
+        COMPLETADO = "COMPLETADO", "Completado"
+        FALLIDO = "FALLIDO", "Fallido"
+
+    tipo = models.CharField(max_length=20, choices=Tipo.choices)
+    estado = models.CharField(
+        max_length=20,
+        choices=Estado.choices,
+        default=Estado.PENDIENTE,
+    )
+    archivo = models.FileField(upload_to="importaciones/%Y/%m/")
+    expediente = models.ForeignKey(
+        ExpedienteSiped,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="importaciones",
+        help_text="Solo para importaciones de movimientos de un expediente",
+    )
+    creado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="importaciones",
+    )
+
+    completa = models.BooleanField(
+        default=False,
+        help_text="Procesar todo el archivo y no solo lo que cambió",
+    )
+
+    filas_procesadas = models.PositiveIntegerField(default=0)
+    creados = models.PositiveIntegerField(default=0)
+    actualizados = models.PositiveIntegerField(default=0)
+    # Filas iguales a lo ya guardado, que no se reescribieron.
+    sin_cambios = models.PositiveIntegerField(default=0)
+    # Tareas creadas por las reglas (ReglaTarea) para los movimientos nuevos.
+    tareas_creadas = models.PositiveIntegerField(default=0)
+    filas_con_error = models.PositiveIntegerField(default=0)
+    ultima_fila_confirmada = models.PositiveIntegerField(
+        default=0,
+        help_text="Filas ya confirmadas; una importación interrumpida sigue desde acá",
+    )
+    errores = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Lista de {"fila": N, "error": "..."}; fila es null si falló todo',
+    )
+    # Importación incremental: bloques de registros del archivo y cuántos
+    # se saltearon por estar iguales en la importación anterior.
+    bloques_totales = models.PositiveIntegerField(default=0)
+    bloques_omitidos = models.PositiveIntegerField(default=0)
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Importación"
+        verbose_name_plural = "Importaciones"
+        ordering = ["-fecha_creacion"]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} #{self.pk} - {self.get_estado_display()}"
+
+    def get_absolute_url(self):
+        return reverse("casos:importacion_detail", kwargs={"pk": self.pk})
+
+    @property
+    def terminado(self):
+        return self.estado in {self.Estado.COMPLETADO, self.Estado.FALLIDO}
+
+    @property
+    def duracion(self):
+        """Segundos de procesamiento (hasta ahora, si sigue corriendo)."""
+        if self.fecha_inicio is None:
+            return None
+        fin = self.fecha_fin or timezone.now()
+        return (fin - self.fecha_inicio).total_seconds()
+
+    @property
+    def filas_por_segundo(self):
+        duracion = self.duracion
+        if not duracion:
+            return None
+        return round(self.filas_procesadas / duracion, 1)
+
+
+class FuenteImportacion(models.Model):
+    """
+    Huella de la última versión importada sin errores de cada fuente del
+    SIPED: el CSV de expedientes, los movimientos de un expediente o los
+    movimientos de varios expedientes. La importación siguiente de la misma
+    fuente procesa solo los bloques de registros que cambiaron (ver
+    foros.casos.delta).
+    """
+
+    tipo = models.CharField(max_length=20, choices=ImportJob.Tipo.choices)
+    expediente = models.ForeignKey(
+        ExpedienteSiped,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="fuentes_importacion",
+    )
+    huella = models.CharField(max_length=64, help_text="SHA-256 del archivo completo")
+    bloques = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Huellas de los bloques de registros del archivo",
+    )
+    ultima_importacion = models.ForeignKey(
+        ImportJob,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="+",
+    )
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Fuente de importación"
+        verbose_name_plural = "Fuentes de importación"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tipo", "expediente"],
+                name="casos_fuente_tipo_expediente_uniq",
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self):
+        if self.expediente_id:
+            return f"{self.get_tipo_display()} {self.expediente}"
+        return self.get_tipo_display()
+
+
+class Eliminacion(models.Model):
+    """
+    Registro de un expediente, movimiento, caso o tarea borrado, para que el
+    feed de cambios (ver cambios.py) informe también las bajas.
+    """
+
+    modelo = models.CharField(max_length=20)
+    objeto_id = models.PositiveBigIntegerField()
+    fecha = models.DateTimeField(default=timezone.now)
+    # Como en ExpedienteSiped.
+    transaccion = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        verbose_name = "Eliminación"
+        verbose_name_plural = "Eliminaciones"
+        indexes = [
+            models.Index(fields=["fecha", "id"], name="casos_elim_fecha_idx"),
+            models.Index(
+                fields=["transaccion", "id"],
+                name="casos_elim_transaccion_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} {self.objeto_id}"
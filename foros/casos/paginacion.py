@@ -0,0 +1,158 @@
+"""
+Paginación por clave (keyset) para listados grandes.
+
+En lugar de OFFSET, cada página se pide a partir de la última fila vista:
+WHERE (campo, id) < (valor, pk) ORDER BY campo DESC NULLS LAST, id DESC.
+Con un índice sobre esas mismas columnas el costo de una página no depende
+de cuán lejos esté del principio, y el id desempata las filas con el mismo
+valor para que el orden sea estable.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import F
+from django.db.models import Q
+
+# Por debajo de esta cantidad de filas se cuenta con COUNT(*): es barato y
+# la estimación de PostgreSQL puede estar desactualizada.
+MINIMO_ESTIMACION = 10_000
+
+SIGUIENTES = "s"
+ANTERIORES = "a"
+
+
+@dataclass
+class PaginaKeyset:
+    objetos: list
+    # Cursores opacos para el parámetro ?cursor=, None si no hay más filas.
+    siguiente: str | None = None
+    anterior: str | None = None
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+    @property
+    def tiene_otras_paginas(self):
+        return bool(self.siguiente or self.anterior)
+
+
+def codificar_cursor(direccion, valor, pk):
+    datos = [direccion, valor.isoformat() if valor is not None else None, pk]
+    texto = json.dumps(datos, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(texto).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor, campo):
+    """
+    Devuelve (dirección, valor, pk) o None si el cursor no es válido. `campo`
+    es el campo del modelo por el que se ordena y convierte el valor.
+    """
+    try:
+        texto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direccion, valor, pk = json.loads(texto)
+        if direccion not in (SIGUIENTES, ANTERIORES) or not isinstance(pk, int):
+            return None
+        return direccion, campo.to_python(valor), pk
+    except (binascii.Error, ValueError, TypeError, ValidationError):
+        return None
+
+
+def _despues_de(nombre, valor, pk):
+    """Filas que van después de (valor, pk) en orden descendente, nulos al final."""
+    if valor is None:
+        return Q(**{f"{nombre}__isnull": True, "pk__lt": pk})
+    # El primer término acota el rango sobre la primera columna del índice.
+    return (
+        Q(**{f"{nombre}__lte": valor}) & (Q(**{f"{nombre}__lt": valor}) | Q(pk__lt=pk))
+    ) | Q(**{f"{nombre}__isnull": True})
+
+
+def _antes_de(nombre, valor, pk):
+    """Filas que van antes de (valor, pk) en el mismo orden."""
+    if valor is None:
+        return Q(**{f"{nombre}__isnull": False}) | Q(
+            **{f"{nombre}__isnull": True, "pk__gt": pk},
+        )
+    return Q(**{f"{nombre}__gte": valor}) & (
+        Q(**{f"{nombre}__gt": valor}) | Q(pk__gt=pk)
+    )
+
+
+def ordenar_keyset(queryset, nombre):
+    return queryset.order_by(F(nombre).desc(nulls_last=True), "-pk")
+
+
+def paginar_keyset(queryset, nombre, cursor=None, tamanio=25):
+    """
+    Devuelve la PaginaKeyset de `queryset` ordenado por `nombre` descendente
+    (nulos al final) e id. Un cursor inválido lleva a la primera página.
+    """
+    campo = queryset.model._meta.get_field(nombre)  # noqa: SLF001
+    posicion = decodificar_cursor(cursor, campo) if cursor else None
+    if posicion is None:
+        direccion = SIGUIENTES
+        queryset = ordenar_keyset(queryset, nombre)
+    else:
+        direccion, valor, pk = posicion
+        if direccion == SIGUIENTES:
+            queryset = ordenar_keyset(queryset, nombre).filter(
+                _despues_de(nombre, valor, pk),
+            )
+        else:
+            # Hacia atrás se recorre en orden inverso y se da vuelta la página.
+            queryset = queryset.filter(_antes_de(nombre, valor, pk)).order_by(
+                F(nombre).asc(nulls_first=True),
+                "pk",
+            )
+
+    # Una fila de más indica si hay otra página en esa dirección.
+    objetos = list(queryset[: tamanio + 1])
+    hay_mas = len(objetos) > tamanio
+    objetos = objetos[:tamanio]
+    if direccion == ANTERIORES:
+        objetos.reverse()
+    if not objetos:
+        return PaginaKeyset(objetos)
+
+    def cursor_de(direccion, objeto):
+        return codificar_cursor(direccion, getattr(objeto, nombre), objeto.pk)
+
+    pagina = PaginaKeyset(objetos)
+    if direccion == SIGUIENTES:
+        if hay_mas:
+            pagina.siguiente = cursor_de(SIGUIENTES, objetos[-1])
+        if posicion is not None:
+            pagina.anterior = cursor_de(ANTERIORES, objetos[0])
+    else:
+        pagina.siguiente = cursor_de(SIGUIENTES, objetos[-1])
+        if hay_mas:
+            pagina.anterior = cursor_de(ANTERIORES, objetos[0])
+    return pagina
+
+
+def contar_estimado(queryset):
+    """
+    Cantidad de filas de `queryset`. Sin filtros, en PostgreSQL usa la
+    estimación del planificador (pg_class.reltuples) en lugar de COUNT(*),
+    que recorre toda la tabla.
+    """
+    if queryset.query.where or connection.vendor != "postgresql":
+        return queryset.count()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],  # noqa: SLF001
+        )
+        fila = cursor.fetchone()
+    # reltuples es -1 si la tabla nunca se analizó.
+    if fila is None or fila[0] < MINIMO_ESTIMACION:
+        return queryset.count()
+    return fila[0]
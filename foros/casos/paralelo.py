@@ -0,0 +1,110 @@
+"""
+Lectura en paralelo de los CSV de movimientos del SIPED.
+
+Reparar, parsear y normalizar las filas es Python puro y ocupa un solo
+núcleo. El archivo se parte en bloques que siempre empiezan en un registro
+nuevo (csv_siped.partir_en_bloques), cada bloque se procesa en un pool de
+procesos y los resultados vuelven en orden al proceso que importa, que es
+el único que escribe en la base de datos.
+"""
+
+import csv
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from .csv_siped import TAMANIO_BLOQUE_REGISTROS
+from .csv_siped import abrir_texto
+from .csv_siped import miembros_csv
+from .csv_siped import partir_en_bloques
+from .csv_siped import reparar_bloque
+from .csv_siped import reparar_bloques
+from .csv_siped import separar_cabecera
+from .importers import normalizar_movimientos
+
+logger = logging.getLogger(__name__)
+
+
+def leer_movimientos(
+    archivo,
+    procesos=1,
+    tamanio_bloque=TAMANIO_BLOQUE_REGISTROS,
+    filtro=None,
+):
+    """
+    Genera (número de expediente, datos) por cada fila del CSV de
+    movimientos, reparando las líneas cortadas. Con `procesos` > 1 el
+    trabajo se reparte en ese número de procesos; el resultado es el mismo
+    que leyendo el archivo en serie. `filtro` (un delta.FiltroDelta)
+    descarta los bloques de registros que no cambiaron.
+    """
+    if procesos > 1 and multiprocessing.current_process().daemon:
+        # Un proceso daemon de multiprocessing no puede tener hijos.
+        logger.warning("Proceso daemon: se leen los movimientos en serie")
+        procesos = 1
+
+    with abrir_texto(archivo) as texto:
+        bloques = partir_en_bloques(texto, tamanio_bloque)
+        if filtro is not None:
+            bloques = filtro.filtrar(bloques, tamanio_bloque)
+        if procesos <= 1:
+            yield from normalizar_movimientos(
+                csv.DictReader(reparar_bloques(bloques)),
+            )
+            return
+
+        primero = next(bloques, None)
+        segundo = next(bloques, None)
+        if segundo is None:
+            # Un archivo chico no justifica levantar el pool.
+            if primero is not None:
+                yield from _normalizar_bloque(primero)
+            return
+        yield from _normalizar_en_paralelo(
+            chain([primero, segundo], bloques),
+            separar_cabecera(primero)[0],
+            procesos,
+        )
+
+
+def leer_movimientos_zip(
+    archivo,
+    procesos=1,
+    tamanio_bloque=TAMANIO_BLOQUE_REGISTROS,
+    filtro=None,
+):
+    """Como leer_movimientos(), para cada CSV de un archivo ZIP."""
+    for miembro in miembros_csv(archivo):
+        yield from leer_movimientos(miembro, procesos, tamanio_bloque, filtro)
+
+
+def _normalizar_en_paralelo(bloques, cabecera, procesos):
+    # fork: los hijos heredan Django ya configurado y solo parsean; nunca
+    # usan la conexión a la base de datos heredada.
+    contexto = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+        # Se envían a lo sumo dos bloques por proceso por delante de lo que
+        # ya se escribió, para no cargar el archivo entero en memoria.
+        pendientes = deque()
+        for i, bloque in enumerate(bloques):
+            pendientes.append(
+                pool.submit(_normalizar_bloque, bloque, cabecera if i else None),
+            )
+            if len(pendientes) >= procesos * 2:
+                yield from pendientes.popleft().result()
+        while pendientes:
+            yield from pendientes.popleft().result()
+
+
+def _normalizar_bloque(bloque, cabecera=None):
+    """
+    Repara, parsea y normaliza un bloque. El primero trae el encabezado del
+    archivo; a los demás se les antepone `cabecera`.
+    """
+    if cabecera is None:
+        lineas = reparar_bloques([bloque])
+    else:
+        lineas = [cabecera, *reparar_bloque(bloque)]
+    return list(normalizar_movimientos(csv.DictReader(lineas)))
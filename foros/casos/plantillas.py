@@ -0,0 +1,67 @@
+"""
+Precarga de las plantillas al iniciar cada worker.
+
+En producción las plantillas se sirven con el cargador en caché, que compila
+cada una la primera vez que se usa y la guarda en memoria del proceso. Sin
+precarga, el primer pedido a cada página de cada worker paga esa compilación
+(y la de todo lo que extiende o incluye). precargar_plantillas() compila al
+arrancar todas las de DIRS y, recursivamente, las que extienden o incluyen
+con nombre fijo, también las de las apps (allauth, crispy-forms). Si alguna
+no existe o no compila, el worker no arranca en lugar de fallar en un pedido.
+"""
+
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateDoesNotExist
+from django.template import TemplateSyntaxError
+from django.template import engines
+from django.template.loader_tags import ExtendsNode
+from django.template.loader_tags import IncludeNode
+
+
+def nombres_plantillas(motor):
+    """Nombres de todas las plantillas de los DIRS del motor."""
+    return sorted(
+        ruta.relative_to(directorio).as_posix()
+        for directorio in map(Path, motor.dirs)
+        for ruta in directorio.rglob("*")
+        if ruta.is_file()
+    )
+
+
+def referencias(plantilla):
+    """Nombres fijos de las plantillas que `plantilla` extiende o incluye."""
+    for nodo in plantilla.nodelist.get_nodes_by_type(ExtendsNode):
+        if isinstance(nodo.parent_name.var, str) and not nodo.parent_name.filters:
+            yield nodo.parent_name.var
+    for nodo in plantilla.nodelist.get_nodes_by_type(IncludeNode):
+        if isinstance(nodo.template.var, str) and not nodo.template.filters:
+            yield nodo.template.var
+
+
+def precargar_plantillas(motor=None):
+    """
+    Compila las plantillas del motor de Django (ver el docstring del módulo)
+    y devuelve cuántas cargó. Lanza ImproperlyConfigured con la lista de las
+    que faltan o tienen errores.
+    """
+    motor = motor or engines["django"]
+    pendientes = nombres_plantillas(motor)
+    cargadas = set()
+    errores = []
+    while pendientes:
+        nombre = pendientes.pop()
+        if nombre in cargadas:
+            continue
+        cargadas.add(nombre)
+        try:
+            plantilla = motor.get_template(nombre)
+        except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+            errores.append(f"{nombre}: {error!r}")
+            continue
+        pendientes.extend(referencias(plantilla.template))
+    if errores:
+        msg = "Plantillas con errores:\n" + "\n".join(sorted(errores))
+        raise ImproperlyConfigured(msg)
+    return len(cargadas)
@@ -0,0 +1,130 @@
+"""
+Tareas generadas automáticamente a partir de los movimientos importados.
+
+Cada ReglaTarea activa compara tipo, estado y generado_por de los
+movimientos nuevos (un criterio vacío acepta cualquier valor) y, si
+coinciden, crea una Tarea para cada Caso vinculado al expediente, asignada
+al responsable del caso y con fecha límite a `dias_plazo` días de la
+presentación.
+
+La importación carga y compila las reglas una sola vez: quedan en un
+diccionario indexado por los valores que exigen, de modo que evaluar un
+movimiento son a lo sumo ocho búsquedas, sin importar cuántas reglas haya.
+Las tareas de cada lote se crean con un bulk_create dentro de la misma
+transacción que los movimientos, en lugar de una señal por fila.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Caso
+from .models import ReglaTarea
+from .models import Tarea
+
+CRITERIOS = ("tipo", "estado", "generado_por")
+
+# Largo máximo de la descripción del movimiento que se copia en la tarea.
+LARGO_DESCRIPCION = 500
+
+
+def _normalizar(valor):
+    return (valor or "").strip().upper()
+
+
+class MotorReglas:
+    """Las reglas activas, compiladas en un índice por criterios."""
+
+    def __init__(self, reglas):
+        # (tipo, estado, generado_por) -> reglas; "" es cualquier valor.
+        self.indice = defaultdict(list)
+        # Qué combinaciones de criterios usan las reglas, para buscar solo
+        # esas claves en el índice.
+        self.mascaras = set()
+        for regla in reglas:
+            clave = tuple(_normalizar(getattr(regla, campo)) for campo in CRITERIOS)
+            self.indice[clave].append(regla)
+            self.mascaras.add(tuple(map(bool, clave)))
+
+    @classmethod
+    def cargar(cls):
+        return cls(ReglaTarea.objects.filter(activa=True))
+
+    def __bool__(self):
+        return bool(self.indice)
+
+    def reglas_para(self, movimiento):
+        """Reglas que coinciden con el movimiento."""
+        valores = [_normalizar(getattr(movimiento, campo)) for campo in CRITERIOS]
+        for mascara in self.mascaras:
+            clave = tuple(
+                valor if usado else ""
+                for valor, usado in zip(valores, mascara, strict=True)
+            )
+            yield from self.indice.get(clave, ())
+
+    def generar_tareas(self, movimientos, hoy=None):
+        """
+        Crea con un bulk_create las tareas de los movimientos (ya guardados)
+        que coinciden con alguna regla y que no existían, y devuelve cuántas
+        se crearon. Sin coincidencias no hace ninguna consulta.
+        """
+        if not self:
+            return 0
+        hoy = hoy or timezone.localdate()
+        coincidencias = []
+        for movimiento in movimientos:
+            presentacion = (
+                timezone.localdate(movimiento.fecha_presentacion)
+                if movimiento.fecha_presentacion
+                else hoy
+            )
+            for regla in self.reglas_para(movimiento):
+                antiguedad = regla.antiguedad_maxima
+                if antiguedad is None or (hoy - presentacion).days <= antiguedad:
+                    coincidencias.append((movimiento, regla, presentacion))
+        if not coincidencias:
+            return 0
+
+        casos = defaultdict(list)
+        for caso_id, expediente_id, responsable_id in Caso.objects.filter(
+            expediente_id__in={
+                movimiento.expediente_id for movimiento, *_ in coincidencias
+            },
+        ).values_list("pk", "expediente_id", "responsable_id"):
+            casos[expediente_id].append((caso_id, responsable_id))
+
+        # Las que ya existen (por ejemplo, si se vuelven a pasar los mismos
+        # movimientos) no se cuentan como creadas.
+        existentes = set(
+            Tarea.objects.filter(
+                movimiento__in={movimiento.pk for movimiento, *_ in coincidencias},
+            ).values_list("regla_id", "movimiento_id", "caso_id"),
+        )
+        tareas = [
+            Tarea(
+                caso_id=caso_id,
+                responsable_id=responsable_id,
+                regla=regla,
+                movimiento=movimiento,
+                titulo=regla.titulo,
+                descripcion=_descripcion(movimiento),
+                fecha_inicio=presentacion,
+                fecha_limite=presentacion + timedelta(days=regla.dias_plazo),
+            )
+            for movimiento, regla, presentacion in coincidencias
+            for caso_id, responsable_id in casos[movimiento.expediente_id]
+            if (regla.pk, movimiento.pk, caso_id) not in existentes
+        ]
+        # Si otra transacción crea las mismas entretanto, la restricción única
+        # de regla, movimiento y caso evita el duplicado.
+        Tarea.objects.bulk_create(tareas, ignore_conflicts=True)
+        return len(tareas)
+
+
+def _descripcion(movimiento):
+    encabezado = " - ".join(
+        filter(None, [movimiento.tipo, movimiento.nombre_escrito, movimiento.estado]),
+    )
+    return f"{encabezado}\n{movimiento.descripcion[:LARGO_DESCRIPCION]}".strip()
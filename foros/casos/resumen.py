@@ -0,0 +1,82 @@
+"""
+Resumen de movimientos guardado en cada ExpedienteSiped.
+
+Cantidad de movimientos y fecha, tipo y estado del último (el de fecha de
+presentación más reciente, como en el historial) se guardan como columnas
+del expediente, para que listados y tableros puedan ordenar y filtrar sin
+agregar casos_movimiento. La importación los actualiza en la misma
+transacción de cada lote y las señales cuando se guarda o borra un
+movimiento por el ORM.
+"""
+
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import ExpedienteSiped
+from .models import Movimiento
+
+
+def _ultimo_movimiento(campo):
+    # Usa el índice (expediente, fecha_presentacion DESC NULLS LAST, id DESC).
+    ultimo = Movimiento.objects.filter(expediente=OuterRef("pk")).order_by(
+        F("fecha_presentacion").desc(nulls_last=True),
+        "-pk",
+    )
+    return Subquery(ultimo.values(campo)[:1])
+
+
+def _campos_ultimo_movimiento():
+    return {
+        "ultimo_movimiento_fecha": _ultimo_movimiento("fecha_presentacion"),
+        "ultimo_movimiento_tipo": Coalesce(_ultimo_movimiento("tipo"), Value("")),
+        "ultimo_movimiento_estado": Coalesce(
+            _ultimo_movimiento("estado"),
+            Value(""),
+        ),
+    }
+
+
+def actualizar_resumen(expediente_ids, creados_por_expediente):
+    """
+    Actualiza en un solo UPDATE el resumen de los expedientes cuyos
+    movimientos se acaban de escribir. La cantidad se incrementa con
+    `creados_por_expediente` (expediente_id -> movimientos nuevos) en lugar
+    de volver a contar; el último movimiento se busca por índice.
+    """
+    if not expediente_ids:
+        return 0
+    incremento = Case(
+        *(
+            When(pk=expediente_id, then=Value(creados))
+            for expediente_id, creados in creados_por_expediente.items()
+        ),
+        default=Value(0),
+    )
+    return ExpedienteSiped.objects.filter(pk__in=expediente_ids).update(
+        cantidad_movimientos=F("cantidad_movimientos") + incremento,
+        actualizado=timezone.now(),
+        **_campos_ultimo_movimiento(),
+    )
+
+
+def recalcular_resumen(expedientes):
+    """Recalcula desde cero el resumen de los expedientes del queryset."""
+    cantidad = (
+        Movimiento.objects.filter(expediente=OuterRef("pk"))
+        .order_by()
+        .values("expediente")
+        .annotate(cantidad=Count("pk"))
+        .values("cantidad")
+    )
+    return expedientes.update(
+        cantidad_movimientos=Coalesce(Subquery(cantidad), Value(0)),
+        actualizado=timezone.now(),
+        **_campos_ultimo_movimiento(),
+    )
@@ -0,0 +1,83 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_init
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .busqueda import CAMPOS_VECTOR_EXPEDIENTE
+from .busqueda import CAMPOS_VECTOR_MOVIMIENTO
+from .busqueda import actualizar_busqueda_expedientes
+from .busqueda import actualizar_busqueda_movimientos
+from .cache import invalidar_al_confirmar
+from .cambios import registrar_eliminacion
+from .models import Caso
+from .models import ExpedienteSiped
+from .models import Movimiento
+from .models import Tarea
+from .resumen import actualizar_resumen
+from .resumen import recalcular_resumen
+
+
+@receiver(post_save, sender=ExpedienteSiped)
+def actualizar_busqueda_expediente(sender, instance, update_fields, **kwargs):
+    if update_fields is None or CAMPOS_VECTOR_EXPEDIENTE & set(update_fields):
+        actualizar_busqueda_expedientes(sender.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Movimiento)
+def actualizar_busqueda_movimiento(sender, instance, update_fields, **kwargs):
+    if update_fields is None or CAMPOS_VECTOR_MOVIMIENTO & set(update_fields):
+        actualizar_busqueda_movimientos(sender.objects.filter(pk=instance.pk))
+
+
+def _expedientes_del_movimiento(instance):
+    """El expediente del movimiento y, si se lo cambió, el que tenía."""
+    return {instance.expediente_id, instance.expediente_id_guardado} - {None}
+
+
+@receiver(post_save, sender=Movimiento)
+def actualizar_resumen_expediente(sender, instance, created, **kwargs):
+    expediente_ids = _expedientes_del_movimiento(instance)
+    if created or len(expediente_ids) == 1:
+        actualizar_resumen(
+            {instance.expediente_id},
+            {instance.expediente_id: 1} if created else {},
+        )
+    else:
+        # Pasó a otro expediente: uno tiene un movimiento menos y el otro uno más.
+        recalcular_resumen(ExpedienteSiped.objects.filter(pk__in=expediente_ids))
+
+
+@receiver(post_delete, sender=Movimiento)
+def recalcular_resumen_expediente(sender, instance, origin=None, **kwargs):
+    # Si se borra el expediente entero no hay resumen que mantener.
+    if not isinstance(origin, ExpedienteSiped):
+        recalcular_resumen(ExpedienteSiped.objects.filter(pk=instance.expediente_id))
+
+
+@receiver(post_save, sender=ExpedienteSiped)
+@receiver(post_delete, sender=ExpedienteSiped)
+def invalidar_cache_expediente(sender, instance, **kwargs):
+    invalidar_al_confirmar([instance.pk])
+
+
+@receiver(post_save, sender=Movimiento)
+@receiver(post_delete, sender=Movimiento)
+def invalidar_cache_movimiento(sender, instance, **kwargs):
+    invalidar_al_confirmar(_expedientes_del_movimiento(instance))
+
+
+@receiver(post_delete, sender=ExpedienteSiped)
+@receiver(post_delete, sender=Movimiento)
+@receiver(post_delete, sender=Caso)
+@receiver(post_delete, sender=Tarea)
+def registrar_eliminacion_para_feed(sender, instance, **kwargs):
+    registrar_eliminacion(instance)
+
+
+# Los receptores de post_save de arriba comparan con este valor, así que va
+# después de ellos.
+@receiver(post_init, sender=Movimiento)
+@receiver(post_save, sender=Movimiento)
+def recordar_expediente_guardado(sender, instance, **kwargs):
+    # Por __dict__ para no hacer una consulta si el campo se difirió.
+    instance.expediente_id_guardado = instance.__dict__.get("expediente_id")
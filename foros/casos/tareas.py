@@ -0,0 +1,131 @@
+"""
+Consultas de los tableros de tareas pendientes.
+
+Las tareas realizadas se acumulan sin límite, pero los tableros muestran
+solo las pendientes (cualquier estado salvo REALIZADA). Los índices
+parciales casos_tarea_resp_pend_idx y casos_tarea_caso_pend_idx cubren
+(responsable o caso, fecha_limite, fecha_creacion DESC), que es el orden
+por defecto de Tarea, únicamente para las pendientes: el costo de estas
+consultas depende de cuántas tareas abiertas hay y no del historial.
+
+Los filtros usan exclude(estado=REALIZADA), la misma condición que los
+índices, para que PostgreSQL pueda usarlos.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Tarea
+
+# Tareas de cada lista del tablero.
+LIMITE_TABLERO = 50
+
+# Días hacia adelante que se cuentan como "próximos a vencer".
+DIAS_PROXIMAS = 7
+
+
+def pendientes():
+    return Tarea.objects.exclude(estado=Tarea.Estado.REALIZADA)
+
+
+def pendientes_de(responsable):
+    """Tareas pendientes de un usuario, con su caso, por fecha límite."""
+    return (
+        pendientes()
+        .filter(responsable=responsable)
+        .select_related("caso")
+        .only(
+            "titulo",
+            "estado",
+            "fecha_limite",
+            "fecha_creacion",
+            "caso__titulo_interno",
+        )
+    )
+
+
+def pendientes_del_caso(caso_id):
+    """Tareas pendientes de un caso, con su responsable, por fecha límite."""
+    return (
+        pendientes()
+        .filter(caso_id=caso_id)
+        .select_related("responsable")
+        .only(
+            "titulo",
+            "estado",
+            "fecha_inicio",
+            "fecha_limite",
+            "fecha_creacion",
+            "responsable__username",
+        )
+    )
+
+
+def vencidas(tareas, hoy):
+    return tareas.filter(fecha_limite__lt=hoy)
+
+
+def por_vencer(tareas, hoy):
+    """Las que vencen desde hoy en adelante, y al final las sin fecha límite."""
+    return tareas.filter(Q(fecha_limite__gte=hoy) | Q(fecha_limite__isnull=True))
+
+
+def conteos(tareas, hoy):
+    """
+    Cantidad de tareas pendientes de `tareas` en total, vencidas, que vencen
+    hoy y en los próximos DIAS_PROXIMAS días, en una sola consulta.
+    """
+    return tareas.order_by().aggregate(
+        total=Count("pk"),
+        vencidas=Count("pk", filter=Q(fecha_limite__lt=hoy)),
+        hoy=Count("pk", filter=Q(fecha_limite=hoy)),
+        proximas=Count(
+            "pk",
+            filter=Q(
+                fecha_limite__gt=hoy,
+                fecha_limite__lte=hoy + timedelta(days=DIAS_PROXIMAS),
+            ),
+        ),
+    )
+
+
+def actualizar_tareas(tareas, cambios, hoy):
+    """
+    Aplica `cambios` (estado, responsable y/o fecha_limite) a las tareas del
+    queryset y devuelve cuántas se actualizaron.
+
+    Si cambia el estado se hacen dos UPDATE: uno para las que pasan de
+    pendiente a REALIZADA (o al revés), que además completa o borra
+    fecha_terminacion y da el conteo de completadas (o reabiertas), y otro
+    para el resto. Las realizadas que se marcan otra vez como realizadas
+    conservan su fecha de terminación.
+    """
+    # update() no pasa por save(), que es quien asigna auto_now.
+    cambios = {**cambios, "actualizado": timezone.now()}
+    if "estado" not in cambios:
+        return {"actualizadas": tareas.update(**cambios)}
+
+    realizada = Tarea.Estado.REALIZADA
+    if cambios["estado"] == realizada:
+        cambian = tareas.exclude(estado=realizada)
+        resto = tareas.filter(estado=realizada)
+        clave, terminacion = "completadas", hoy
+    else:
+        cambian = tareas.filter(estado=realizada)
+        resto = tareas.exclude(estado=realizada)
+        clave, terminacion = "reabiertas", None
+
+    with transaction.atomic():
+        # Primero el resto: ese UPDATE no cambia qué tareas están realizadas,
+        # así que no altera cuáles cumplen el filtro de `cambian`.
+        if cambios.keys() == {"estado", "actualizado"} and terminacion is not None:
+            # Marcar como realizadas las que ya lo están no cambia nada.
+            otras = 0
+        else:
+            otras = resto.update(**cambios)
+        cambiadas = cambian.update(**cambios, fecha_terminacion=terminacion)
+    return {"actualizadas": cambiadas + otras, clave: cambiadas}
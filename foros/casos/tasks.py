@@ -0,0 +1,203 @@
+import logging
+from functools import partial
+
+from celery import shared_task
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db import transaction
+from django.utils import timezone
+
+from .csv_siped import leer_filas
+from .delta import FiltroDelta
+from .delta import fuente_de
+from .delta import guardar_fuente
+from .delta import huella_archivo
+from .importers import ResultadoImportacion
+from .importers import importar_expedientes
+from .importers import importar_movimientos
+from .importers import importar_movimientos_global
+from .models import ImportJob
+from .paralelo import leer_movimientos
+from .paralelo import leer_movimientos_zip
+
+logger = logging.getLogger(__name__)
+
+# Un archivo grande puede superar el CELERY_TASK_TIME_LIMIT global (5 minutos).
+IMPORTACION_TIME_LIMIT = 60 * 60
+
+# Alias de DATABASES con otra conexión a la misma base.
+BASE_PROGRESO = "progreso"
+
+
+class ImportacionConErroresError(Exception):
+    """Alguna fila falló en una importación que debía ser todo o nada."""
+
+    def __init__(self, resultado):
+        primero = resultado.errores[0]
+        super().__init__(
+            f"{resultado.fallidas} filas con errores "
+            f"(fila {primero['fila']}: {primero['error']})",
+        )
+
+
+@shared_task(
+    time_limit=IMPORTACION_TIME_LIMIT,
+    soft_time_limit=IMPORTACION_TIME_LIMIT - 60,
+    # Si el worker muere, la tarea se reentrega y retoma desde
+    # ImportJob.ultima_fila_confirmada.
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def procesar_importacion(import_job_id):
+    """Procesa el CSV de un ImportJob, registrando el progreso de cada lote."""
+    job = ImportJob.objects.select_related("expediente").get(pk=import_job_id)
+    if job.terminado:
+        logger.warning("La importación %s ya fue procesada", job.pk)
+        return
+
+    if job.estado == ImportJob.Estado.EN_PROCESO:
+        logger.info(
+            "Retomando la importación %s desde la fila %s",
+            job.pk,
+            job.ultima_fila_confirmada,
+        )
+    else:
+        job.estado = ImportJob.Estado.EN_PROCESO
+        job.fecha_inicio = timezone.now()
+        job.save(update_fields=["estado", "fecha_inicio"])
+
+    # Al retomar, los contadores continúan los de la ejecución anterior.
+    creados_previos = job.creados
+    actualizados_previos = job.actualizados
+    sin_cambios_previos = job.sin_cambios
+    tareas_previas = job.tareas_creadas
+    con_error_previas = job.filas_con_error
+    errores_previos = job.errores
+
+    def registrar_progreso(resultado, base=DEFAULT_DB_ALIAS):
+        creados = creados_previos + resultado.creados
+        actualizados = actualizados_previos + resultado.actualizados
+        sin_cambios = sin_cambios_previos + resultado.sin_cambios
+        valores = {
+            "filas_procesadas": creados + actualizados + sin_cambios,
+            "creados": creados,
+            "actualizados": actualizados,
+            "sin_cambios": sin_cambios,
+            "tareas_creadas": tareas_previas + resultado.tareas,
+            "filas_con_error": con_error_previas + resultado.fallidas,
+            "ultima_fila_confirmada": resultado.ultima_fila,
+            "errores": [*errores_previos, *resultado.errores],
+        }
+        ImportJob.objects.using(base).filter(pk=job.pk).update(**valores)
+
+    filtro = None
+    try:
+        with job.archivo.open("rb") as archivo:
+            huella = huella_archivo(archivo)
+            fuente = None if job.completa else fuente_de(job)
+            if fuente is None or fuente.huella != huella:
+                # Solo se procesan los bloques que no estaban en la fuente.
+                filtro = FiltroDelta(fuente.bloques if fuente else ())
+                if job.tipo == ImportJob.Tipo.EXPEDIENTES:
+                    importar_expedientes(
+                        leer_filas(archivo, filtro=filtro),
+                        al_guardar_lote=registrar_progreso,
+                        desde_fila=job.ultima_fila_confirmada,
+                    )
+                else:
+                    _importar_movimientos(job, archivo, registrar_progreso, filtro)
+    except Exception as e:
+        logger.exception("Falló la importación %s", job.pk)
+        job.refresh_from_db(fields=["errores"])
+        job.estado = ImportJob.Estado.FALLIDO
+        job.errores = [*job.errores, {"fila": None, "error": str(e)}]
+        job.fecha_fin = timezone.now()
+        job.save(update_fields=["estado", "errores", "fecha_fin"])
+        return
+
+    _completar(job, huella, fuente, filtro)
+
+
+def _completar(job, huella, fuente, filtro):
+    """
+    Marca el ImportJob como completado con sus conteos de bloques y guarda la
+    huella del archivo en su fuente. `filtro` es None si el archivo era
+    igual al de `fuente` y no se leyó.
+    """
+    if filtro is None:
+        logger.info("La importación %s es igual a la anterior de su fuente", job.pk)
+        job.bloques_totales = job.bloques_omitidos = len(fuente.bloques)
+    else:
+        job.bloques_totales = len(filtro.huellas)
+        job.bloques_omitidos = filtro.omitidos
+    job.estado = ImportJob.Estado.COMPLETADO
+    job.fecha_fin = timezone.now()
+    job.save(
+        update_fields=["estado", "fecha_fin", "bloques_totales", "bloques_omitidos"],
+    )
+
+    # Con filas fallidas no se guarda la huella: sus bloques se vuelven a
+    # procesar en la próxima importación.
+    job.refresh_from_db(fields=["filas_con_error"])
+    if filtro is not None and not job.filas_con_error:
+        guardar_fuente(job, huella, filtro)
+
+
+def _importar_movimientos(job, archivo, registrar_progreso, filtro=None):
+    """
+    Confirma cada CASOS_IMPORTACION_COMMIT_CADA filas, retomando desde la
+    última fila confirmada. Con 0 usa una única transacción que se revierte
+    entera si alguna fila falla; el progreso de cada lote se escribe por la
+    conexión BASE_PROGRESO, en autocommit, para que se vea mientras tanto.
+    El archivo se lee con CASOS_IMPORTACION_PROCESOS procesos, pasando por
+    `filtro`.
+    """
+    procesos = settings.CASOS_IMPORTACION_PROCESOS
+    if job.tipo == ImportJob.Tipo.MOVIMIENTOS_GLOBAL:
+        if job.archivo.name.lower().endswith(".zip"):
+            movimientos = leer_movimientos_zip(archivo, procesos, filtro=filtro)
+        else:
+            movimientos = leer_movimientos(archivo, procesos, filtro=filtro)
+        importar = partial(
+            importar_movimientos_global,
+            movimientos,
+            normalizadas=True,
+        )
+    else:
+        importar = partial(
+            importar_movimientos,
+            job.expediente,
+            leer_movimientos(archivo, procesos, filtro=filtro),
+            normalizadas=True,
+        )
+
+    commit_cada = settings.CASOS_IMPORTACION_COMMIT_CADA
+    if commit_cada:
+        return importar(
+            batch_size=commit_cada,
+            al_guardar_lote=registrar_progreso,
+            desde_fila=job.ultima_fila_confirmada,
+        )
+
+    try:
+        resultado = _importar_todo_o_nada(
+            importar,
+            partial(registrar_progreso, base=BASE_PROGRESO),
+        )
+    except Exception:
+        # Se revirtió todo lo que el progreso ya mostraba.
+        registrar_progreso(ResultadoImportacion())
+        raise
+    finally:
+        connections[BASE_PROGRESO].close()
+    registrar_progreso(resultado)
+    return resultado
+
+
+def _importar_todo_o_nada(importar, al_guardar_lote):
+    with transaction.atomic():
+        resultado = importar(al_guardar_lote=al_guardar_lote)
+        if resultado.errores:
+            raise ImportacionConErroresError(resultado)
+    return resultado
@@ -0,0 +1,252 @@
+from datetime import date
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from foros.casos.models import Tarea
+from foros.casos.tests.factories import CasoFactory
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.factories import MovimientoFactory
+from foros.casos.tests.factories import TareaFactory
+from foros.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = "api:tarea-masivo"
+
+
+def masivo(client, filtro, cambios):
+    return client.post(
+        reverse(URL),
+        {"filtro": filtro, "cambios": cambios},
+        content_type="application/json",
+    )
+
+
+class TestTareasMasivo:
+    def test_reasigna_las_de_un_responsable(self, admin_client):
+        anterior = UserFactory()
+        nuevo = UserFactory()
+        tareas = TareaFactory.create_batch(3, responsable=anterior)
+        otra = TareaFactory()
+
+        response = masivo(
+            admin_client,
+            {"responsable": anterior.pk},
+            {"responsable": nuevo.pk},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {"actualizadas": 3}
+        assert set(nuevo.tareas_asignadas.all()) == set(tareas)
+        otra.refresh_from_db()
+        assert otra.responsable != nuevo
+
+    def test_completar_fija_fecha_de_terminacion(
+        self,
+        admin_client,
+        django_assert_num_queries,
+    ):
+        caso = CasoFactory()
+        pendientes = TareaFactory.create_batch(2, caso=caso)
+        terminada = TareaFactory(
+            caso=caso,
+            estado=Tarea.Estado.REALIZADA,
+            fecha_terminacion=date(2024, 1, 1),
+        )
+
+        # Sesión, usuario, validación del caso y un único UPDATE para las
+        # pendientes, más los savepoints de ATOMIC_REQUESTS y del bloque
+        # atómico.
+        with django_assert_num_queries(8):
+            response = masivo(
+                admin_client,
+                {"caso": caso.pk},
+                {"estado": Tarea.Estado.REALIZADA},
+            )
+
+        assert response.json() == {"actualizadas": 2, "completadas": 2}
+        for tarea in pendientes:
+            tarea.refresh_from_db()
+            assert tarea.estado == Tarea.Estado.REALIZADA
+            assert tarea.fecha_terminacion == timezone.localdate()
+        terminada.refresh_from_db()
+        assert terminada.fecha_terminacion == date(2024, 1, 1)
+
+    def test_reabrir_borra_fecha_de_terminacion(self, admin_client):
+        terminada = TareaFactory(
+            estado=Tarea.Estado.REALIZADA,
+            fecha_terminacion=date(2024, 1, 1),
+        )
+        pendiente = TareaFactory(estado=Tarea.Estado.ESPERANDO)
+        limite = timezone.localdate() + timedelta(days=5)
+
+        response = masivo(
+            admin_client,
+            {"ids": [terminada.pk, pendiente.pk]},
+            {"estado": Tarea.Estado.A_CONTROLAR, "fecha_limite": limite.isoformat()},
+        )
+
+        assert response.json() == {"actualizadas": 2, "reabiertas": 1}
+        terminada.refresh_from_db()
+        assert terminada.estado == Tarea.Estado.A_CONTROLAR
+        assert terminada.fecha_terminacion is None
+        assert terminada.fecha_limite == limite
+
+    def test_filtro_por_estado_y_vencimiento(self, admin_client):
+        hoy = timezone.localdate()
+        vencida = TareaFactory(fecha_limite=hoy - timedelta(days=1))
+        TareaFactory(fecha_limite=hoy + timedelta(days=1))
+        TareaFactory(
+            fecha_limite=hoy - timedelta(days=1),
+            estado=Tarea.Estado.REALIZADA,
+        )
+
+        response = masivo(
+            admin_client,
+            {
+                "estado": [Tarea.Estado.A_REALIZAR],
+                "fecha_limite_hasta": (hoy - timedelta(days=1)).isoformat(),
+            },
+            {"fecha_limite": hoy.isoformat()},
+        )
+
+        assert response.json() == {"actualizadas": 1}
+        vencida.refresh_from_db()
+        assert vencida.fecha_limite == hoy
+
+    def test_exige_filtro_y_cambios(self, admin_client):
+        TareaFactory()
+
+        response = masivo(admin_client, {}, {})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.json()) == {"filtro", "cambios"}
+        assert not Tarea.objects.filter(estado=Tarea.Estado.REALIZADA).exists()
+
+    def test_solo_staff(self, client, user):
+        client.force_login(user)
+
+        response = masivo(client, {"ids": [1]}, {"estado": Tarea.Estado.REALIZADA})
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+class TestLectura:
+    def test_casos_en_una_sola_consulta(self, admin_client, django_assert_num_queries):
+        expediente = ExpedienteSipedFactory()
+        CasoFactory.create_batch(3, expediente=expediente)
+        CasoFactory(expediente=None, responsable=None)
+
+        # Sesión, usuario, última modificación y última baja para
+        # Last-Modified y la página con sus relaciones, más los savepoints de
+        # ATOMIC_REQUESTS.
+        with django_assert_num_queries(7):
+            response = admin_client.get(reverse("api:caso-list"))
+
+        casos = response.json()["results"]
+        assert len(casos) == 4  # noqa: PLR2004
+        assert casos[0]["expediente_numero"] == expediente.expediente
+        assert casos[-1]["expediente_numero"] is None
+        assert casos[-1]["responsable_username"] is None
+
+    def test_paginacion_por_cursor(self, admin_client):
+        expedientes = ExpedienteSipedFactory.create_batch(5)
+
+        vistos = []
+        url = reverse("api:expediente-list") + "?page_size=2"
+        while url:
+            pagina = admin_client.get(url).json()
+            vistos += [expediente["id"] for expediente in pagina["results"]]
+            url = pagina["next"]
+
+        assert vistos == [expediente.pk for expediente in expedientes]
+
+    def test_seleccion_de_campos(self, admin_client):
+        tarea = TareaFactory()
+
+        response = admin_client.get(
+            reverse("api:tarea-detail", args=[tarea.pk]),
+            {"fields": "id,estado"},
+        )
+
+        assert response.json() == {"id": tarea.pk, "estado": tarea.estado}
+
+    def test_movimientos_de_un_expediente(self, admin_client):
+        movimiento = MovimientoFactory()
+        MovimientoFactory()
+
+        response = admin_client.get(
+            reverse("api:movimiento-list"),
+            {"expediente": movimiento.expediente_id},
+        )
+
+        assert [m["id"] for m in response.json()["results"]] == [movimiento.pk]
+
+    def test_filtro_invalido(self, admin_client):
+        response = admin_client.get(reverse("api:movimiento-list"), {"expediente": "x"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_etag_devuelve_304_si_no_cambio(self, admin_client):
+        cliente = CasoFactory().cliente
+        url = reverse("api:cliente-detail", args=[cliente.pk])
+        etag = admin_client.get(url)["ETag"]
+
+        response = admin_client.get(url, headers={"if-none-match": etag})
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert not response.content
+        cliente.telefono = "123"
+        cliente.save()
+        response = admin_client.get(url, headers={"if-none-match": etag})
+        assert response.status_code == HTTPStatus.OK
+        assert response["ETag"] != etag
+
+    def test_requiere_usuario(self, client):
+        response = client.get(reverse("api:caso-list"))
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+class TestCambios:
+    # El feed solo lee filas de transacciones terminadas (ver cambios.py).
+    @pytest.mark.django_db(transaction=True)
+    def test_sincronizacion_incremental(self, admin_client):
+        url = reverse("api:cambios-list")
+        tarea = TareaFactory()
+        otra = TareaFactory()
+
+        inicial = admin_client.get(url).json()
+        assert [t["id"] for t in inicial["tareas"]] == [tarea.pk, otra.pk]
+        assert len(inicial["casos"]) == 2  # noqa: PLR2004
+        assert not inicial["hay_mas"]
+
+        tarea.estado = Tarea.Estado.REALIZADA
+        tarea.save()
+        otra_id = otra.pk
+        otra.delete()
+        datos = admin_client.get(url, {"since": inicial["cursor"]}).json()
+
+        assert [t["id"] for t in datos["tareas"]] == [tarea.pk]
+        assert datos["eliminados"] == [{"modelo": "tareas", "id": otra_id}]
+        assert datos["casos"] == datos["expedientes"] == datos["movimientos"] == []
+        siguiente = admin_client.get(url, {"since": datos["cursor"]}).json()
+        assert siguiente["tareas"] == siguiente["eliminados"] == []
+
+    def test_cursor_invalido(self, admin_client):
+        response = admin_client.get(reverse("api:cambios-list"), {"since": "x"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_last_modified_en_el_detalle(self, admin_client):
+        tarea = TareaFactory()
+        url = reverse("api:tarea-detail", args=[tarea.pk])
+        ultima = admin_client.get(url)["Last-Modified"]
+
+        response = admin_client.get(url, headers={"if-modified-since": ultima})
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,68 @@
+from factory import Faker
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+from factory.django import FileField
+
+from foros.casos.models import Caso
+from foros.casos.models import ExpedienteSiped
+from foros.casos.models import ImportJob
+from foros.casos.models import Movimiento
+from foros.casos.models import Tarea
+from foros.clientes.models import Cliente
+from foros.users.tests.factories import UserFactory
+
+
+class ExpedienteSipedFactory(DjangoModelFactory[ExpedienteSiped]):
+    expediente = Sequence(lambda n: f"{n + 1}/2025")
+    caratula = Faker("sentence", nb_words=6)
+    dependencia = "Juzgado Civil Nro 1"
+    estado = "A DESPACHO"
+
+    class Meta:
+        model = ExpedienteSiped
+        django_get_or_create = ["expediente"]
+
+
+class MovimientoFactory(DjangoModelFactory[Movimiento]):
+    expediente = SubFactory(ExpedienteSipedFactory)
+    nombre_escrito = Sequence(lambda n: f"ESC-{n}")
+    tipo = "ESCRITO"
+    estado = "PUBLICADO"
+
+    class Meta:
+        model = Movimiento
+
+
+class ClienteFactory(DjangoModelFactory[Cliente]):
+    nombre_razon_social = Faker("name")
+
+    class Meta:
+        model = Cliente
+
+
+class CasoFactory(DjangoModelFactory[Caso]):
+    cliente = SubFactory(ClienteFactory)
+    expediente = SubFactory(ExpedienteSipedFactory)
+    responsable = SubFactory(UserFactory)
+    titulo_interno = Faker("sentence", nb_words=3)
+
+    class Meta:
+        model = Caso
+
+
+class TareaFactory(DjangoModelFactory[Tarea]):
+    caso = SubFactory(CasoFactory)
+    responsable = SubFactory(UserFactory)
+    titulo = Faker("sentence", nb_words=4)
+
+    class Meta:
+        model = Tarea
+
+
+class ImportJobFactory(DjangoModelFactory[ImportJob]):
+    tipo = ImportJob.Tipo.EXPEDIENTES
+    archivo = FileField(filename="expedientes_completos.csv", data=b"expediente\n")
+
+    class Meta:
+        model = ImportJob
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from foros.casos.benchmarks import ESCENARIOS
+from foros.casos.benchmarks import MODOS_PLANTILLAS
+from foros.casos.benchmarks import correr_escenarios
+from foros.casos.benchmarks import generar_movimientos
+from foros.casos.benchmarks import guardar_corrida
+from foros.casos.benchmarks import medir_plantillas
+from foros.casos.csv_siped import leer_filas
+
+
+def test_generar_movimientos_con_lineas_cortadas(tmp_path):
+    ruta = tmp_path / "movimientos.csv"
+
+    generar_movimientos(ruta, 200, expedientes=3)
+
+    contenido = ruta.read_bytes()
+    assert contenido.count(b"\n") > 201  # noqa: PLR2004
+    with ruta.open("rb") as archivo:
+        filas = list(leer_filas(archivo, reparar=True))
+    assert len(filas) == 200  # noqa: PLR2004
+    assert {f["expediente"] for f in filas} == {"1/2025", "2/2025", "3/2025"}
+    assert all(f["fecha_publicacion"] for f in filas)
+
+
+@pytest.mark.django_db
+def test_correr_escenarios(user, tmp_path):
+    resultados = correr_escenarios(user, tmp_path, [20])
+
+    assert [r["escenario"] for r in resultados] == list(ESCENARIOS)
+    assert [r["resultado"] for r in resultados] == [
+        "20 filas",
+        "COMPLETADO",
+        "COMPLETADO",
+        "COMPLETADO",
+    ]
+    assert all(r["consultas"] > 0 for r in resultados[1:])
+    assert all(r["filas_por_segundo"] > 0 for r in resultados)
+    assert list(tmp_path.glob("*.csv")) == []
+
+
+@pytest.mark.django_db
+def test_medir_plantillas(user):
+    resultados = medir_plantillas(user, repeticiones=1)
+
+    assert [(r["modo"], r["plantilla"]) for r in resultados] == [
+        (modo, plantilla)
+        for modo in MODOS_PLANTILLAS
+        for plantilla in (
+            "casos/caso_list.html",
+            "casos/expediente_siped_detail.html",
+        )
+    ]
+    assert all(r["primer_pedido_ms"] > 0 for r in resultados)
+    assert [r["precarga_ms"] > 0 for r in resultados] == [False] * 4 + [True] * 2
+
+
+def test_guardar_corrida_acumula_por_etiqueta(tmp_path):
+    ruta = tmp_path / "benchmark.json"
+    ruta.write_text(
+        json.dumps({"etiqueta": "", "fecha": "2025-01-01", "resultados": []}),
+    )
+
+    guardar_corrida(ruta, "antes", {"fecha": "2025-01-02", "resultados": [1]})
+    guardar_corrida(ruta, "despues", {"fecha": "2025-01-03", "resultados": [2]})
+    guardar_corrida(ruta, "despues", {"fecha": "2025-01-04", "resultados": [3]})
+
+    corridas = json.loads(ruta.read_text())["corridas"]
+    assert list(corridas) == ["2025-01-01", "antes", "despues"]
+    assert corridas["antes"]["resultados"] == [1]
+    assert corridas["despues"]["resultados"] == [3]
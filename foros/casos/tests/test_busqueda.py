@@ -0,0 +1,84 @@
+import pytest
+
+from foros.casos.busqueda import buscar_expedientes
+from foros.casos.busqueda import buscar_movimientos
+from foros.casos.busqueda import resaltar
+from foros.casos.importers import importar_expedientes
+from foros.casos.importers import importar_movimientos
+from foros.casos.models import ExpedienteSiped
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.factories import MovimientoFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBuscarExpedientes:
+    def test_por_caratula_ordenado_por_relevancia(self):
+        dependencia = ExpedienteSipedFactory(
+            caratula="LOPEZ C/ GIMENEZ S/ EJECUTIVO",
+            dependencia="Juzgado Civil Perez",
+        )
+        caratula = ExpedienteSipedFactory(caratula="PEREZ C/ GOMEZ S/ ALIMENTOS")
+        ExpedienteSipedFactory(caratula="ACUÑA S/ SUCESION")
+
+        resultados = list(buscar_expedientes("perez"))
+
+        assert resultados == [caratula, dependencia]
+
+    def test_por_numero_parcial(self):
+        expediente = ExpedienteSipedFactory(expediente="19827/2025")
+        ExpedienteSipedFactory(expediente="2/2025")
+
+        assert list(buscar_expedientes("19827")) == [expediente]
+        assert list(buscar_expedientes("19827/2025")) == [expediente]
+
+    def test_se_actualiza_al_guardar(self):
+        expediente = ExpedienteSipedFactory(caratula="PEREZ S/ SUCESION")
+
+        expediente.caratula = "GOMEZ S/ SUCESION"
+        expediente.save()
+
+        assert list(buscar_expedientes("perez")) == []
+        assert list(buscar_expedientes("gomez")) == [expediente]
+
+    def test_importacion_actualiza_vectores(self):
+        importar_expedientes([{"expediente": "1/2025", "caratula": "PEREZ C/ GOMEZ"}])
+        importar_expedientes([{"expediente": "1/2025", "caratula": "LOPEZ C/ GOMEZ"}])
+
+        assert not buscar_expedientes("perez")
+        assert list(buscar_expedientes("lopez")) == [
+            ExpedienteSiped.objects.get(expediente="1/2025"),
+        ]
+
+
+class TestBuscarMovimientos:
+    def test_por_descripcion_con_fragmento(self):
+        movimiento = MovimientoFactory(
+            descripcion="Córrase traslado a la contraria <por el término de ley>",
+        )
+        MovimientoFactory(descripcion="Agréguese y hágase saber")
+
+        resultados = list(buscar_movimientos("traslado"))
+
+        assert resultados == [movimiento]
+        fragmento = resaltar(resultados[0].fragmento)
+        assert "<mark>traslado</mark> a la contraria &lt;por el" in fragmento
+
+    def test_ordena_todas_las_coincidencias(self):
+        # La mejor coincidencia es la última fila de la tabla.
+        debiles = MovimientoFactory.create_batch(5, descripcion="Córrase traslado")
+        mejor = MovimientoFactory(descripcion="Traslado. Córrase traslado")
+
+        resultados = buscar_movimientos("traslado", limite=3)
+
+        assert resultados == [mejor, debiles[-1], debiles[-2]]
+
+    def test_importacion_actualiza_vectores(self):
+        expediente = ExpedienteSipedFactory()
+        fila = {"nombre_escrito": "E-1", "descripcion": "Solicita audiencia"}
+
+        importar_movimientos(expediente, [fila])
+        importar_movimientos(expediente, [{**fila, "descripcion": "Acompaña prueba"}])
+
+        assert not buscar_movimientos("audiencia")
+        assert [m.nombre_escrito for m in buscar_movimientos("prueba")] == ["E-1"]
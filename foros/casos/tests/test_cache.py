@@ -0,0 +1,185 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from foros.casos.cache import TIEMPO
+from foros.casos.cache import TIEMPO_VERSION
+from foros.casos.cache import cacheado
+from foros.casos.cache import clave_version_expediente
+from foros.casos.cache import invalidar_expedientes
+from foros.casos.cache import version_expediente
+from foros.casos.cache import version_listado
+from foros.casos.importers import importar_expedientes
+from foros.casos.importers import importar_movimientos
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.test_importers import CABECERA_MOVIMIENTOS
+from foros.casos.tests.test_importers import filas_csv
+
+pytestmark = pytest.mark.django_db
+
+
+def test_cacheado_por_version_y_partes():
+    calculos = []
+
+    def calcular():
+        calculos.append(1)
+        return len(calculos)
+
+    assert cacheado("prueba", 1, calcular, "a") == 1
+    assert cacheado("prueba", 1, calcular, "a") == 1
+    assert cacheado("prueba", 1, calcular, "b") == 2  # noqa: PLR2004
+    assert cacheado("prueba", 2, calcular, "a") == 3  # noqa: PLR2004
+
+
+def test_version_perdida_no_recupera_entradas_viejas():
+    expediente = ExpedienteSipedFactory()
+    version = version_expediente(expediente.pk)
+    cacheado("prueba", version, lambda: "viejo")
+
+    cache.clear()
+
+    assert version_expediente(expediente.pk) != version
+
+
+def test_las_versiones_duran_mas_que_las_entradas(monkeypatch):
+    expediente = ExpedienteSipedFactory()
+    version = version_expediente(expediente.pk)
+    ahora = time.time()
+
+    monkeypatch.setattr(time, "time", lambda: ahora + TIEMPO + 1)
+    assert version_expediente(expediente.pk) == version
+
+    monkeypatch.setattr(time, "time", lambda: ahora + TIEMPO_VERSION + 1)
+    assert version_expediente(expediente.pk) != version
+
+
+def test_sin_version_para_expedientes_inexistentes():
+    expediente = ExpedienteSipedFactory()
+    pk = expediente.pk
+    expediente.delete()
+
+    assert version_expediente(pk) is None
+    assert cache.get(clave_version_expediente(pk)) is None
+
+
+def test_invalidar_solo_los_expedientes_tocados():
+    uno, dos = ExpedienteSipedFactory(), ExpedienteSipedFactory()
+    listado = version_listado()
+    antes_uno, antes_dos = version_expediente(uno.pk), version_expediente(dos.pk)
+
+    invalidar_expedientes([uno.pk])
+
+    assert version_expediente(uno.pk) != antes_uno
+    assert version_expediente(dos.pk) == antes_dos
+    assert version_listado() != listado
+
+
+def test_importar_invalida_al_confirmar(django_capture_on_commit_callbacks):
+    expediente = ExpedienteSipedFactory(expediente="1/2025")
+    otro = ExpedienteSipedFactory(expediente="2/2025")
+    antes = version_expediente(expediente.pk)
+    otro_antes = version_expediente(otro.pk)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        importar_movimientos(
+            expediente,
+            filas_csv(
+                "1/2025,E-1,,01/02/2025 10:00,ESCRITO,PUBLICADO,JUZGADO,Nuevo,,",
+                cabecera=CABECERA_MOVIMIENTOS,
+            ),
+        )
+        # Hasta el COMMIT las versiones no cambian.
+        assert version_expediente(expediente.pk) == antes
+
+    assert callbacks
+    assert version_expediente(expediente.pk) != antes
+    assert version_expediente(otro.pk) == otro_antes
+
+
+def test_importar_expedientes_invalida_los_actualizados(
+    django_capture_on_commit_callbacks,
+):
+    expediente = ExpedienteSipedFactory(expediente="1/2025")
+    antes = version_expediente(expediente.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        importar_expedientes(
+            filas_csv("1/2025,,NUEVA,2,PUBLICADO,05/03/2025,Posadas,Juzgado 1,"),
+        )
+
+    assert version_expediente(expediente.pk) != antes
+
+
+class TestVistas:
+    def test_listado_desde_la_cache(self, client, user, django_assert_num_queries):
+        expediente = ExpedienteSipedFactory(caratula="ANTES")
+        client.force_login(user)
+        client.get(reverse("casos:expediente_list"))
+        expediente.caratula = "DESPUES"
+        expediente.save()
+
+        # Sesión y usuario, más el savepoint de ATOMIC_REQUESTS.
+        with django_assert_num_queries(4):
+            response = client.get(reverse("casos:expediente_list"))
+        assert "ANTES" in response.text
+
+        invalidar_expedientes([expediente.pk])
+        response = client.get(reverse("casos:expediente_list"))
+        assert "DESPUES" in response.text
+
+    def test_cursores_invalidos_usan_la_primera_pagina(
+        self,
+        client,
+        user,
+        django_assert_num_queries,
+    ):
+        ExpedienteSipedFactory()
+        client.force_login(user)
+        url = reverse("casos:expediente_list")
+        client.get(url)
+
+        # Un cursor que no se puede decodificar no agrega entradas a la caché.
+        for cursor in ["basura", "otra-basura", "W10"]:
+            with django_assert_num_queries(4):
+                response = client.get(url, {"cursor": cursor})
+            assert response.status_code == 200  # noqa: PLR2004
+
+    def test_detalle_e_historial_por_expediente(
+        self,
+        client,
+        user,
+        django_assert_num_queries,
+    ):
+        expediente = ExpedienteSipedFactory()
+        otro = ExpedienteSipedFactory()
+        client.force_login(user)
+        urls = [
+            reverse("casos:expediente_detail", args=[expediente.pk]),
+            reverse("casos:expediente_movimientos", args=[expediente.pk]),
+        ]
+        for url in urls:
+            client.get(url)
+
+        for url in urls:
+            with django_assert_num_queries(4):
+                client.get(url)
+        invalidar_expedientes([otro.pk])
+        for url in urls:
+            with django_assert_num_queries(4):
+                client.get(url)
+        invalidar_expedientes([expediente.pk])
+        with django_assert_num_queries(5):
+            client.get(urls[0])
+
+    def test_expediente_inexistente_sin_version(self, client, user):
+        expediente = ExpedienteSipedFactory()
+        pk = expediente.pk
+        expediente.delete()
+        client.force_login(user)
+
+        for nombre in ["casos:expediente_detail", "casos:expediente_movimientos"]:
+            response = client.get(reverse(nombre, args=[pk]))
+            assert response.status_code == 404  # noqa: PLR2004
+        assert cache.get(clave_version_expediente(pk)) is None
@@ -0,0 +1,191 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from foros.casos import cambios
+from foros.casos.cambios import ELIMINADOS
+from foros.casos.cambios import codificar_cursor
+from foros.casos.cambios import decodificar_cursor
+from foros.casos.cambios import leer_cambios
+from foros.casos.importers import importar_expedientes
+from foros.casos.importers import importar_movimientos
+from foros.casos.models import Eliminacion
+from foros.casos.models import ExpedienteSiped
+from foros.casos.models import Movimiento
+from foros.casos.models import Tarea
+from foros.casos.tareas import actualizar_tareas
+from foros.casos.tests.factories import CasoFactory
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.factories import MovimientoFactory
+from foros.casos.tests.factories import TareaFactory
+from foros.casos.tests.test_importers import CABECERA_MOVIMIENTOS
+from foros.casos.tests.test_importers import filas_csv
+
+pytestmark = pytest.mark.django_db
+
+
+def tareas(posiciones=None, limite=cambios.LIMITE_CAMBIOS):
+    lectura = leer_cambios({"tareas": Tarea.objects.all()}, posiciones, limite)
+    return lectura, lectura.filas["tareas"]
+
+
+def hace_un_rato(modelo, **filtro):
+    """Atrasa `actualizado` para ver que una escritura lo vuelve a mover."""
+    antes = timezone.now() - timedelta(hours=1)
+    modelo.objects.filter(**filtro).update(actualizado=antes)
+    return antes
+
+
+class TestActualizado:
+    def test_importar_movimientos_lo_mueve(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        sin_cambios = MovimientoFactory(expediente=expediente, nombre_escrito="E-1")
+        modificado = MovimientoFactory(expediente=expediente, nombre_escrito="E-2")
+        antes = hace_un_rato(Movimiento)
+        hace_un_rato(ExpedienteSiped)
+        importar_movimientos(
+            expediente,
+            filas_csv(
+                "1/2025,E-2,,01/02/2025 10:00,ESCRITO,PUBLICADO,JUZGADO,Otra,,",
+                cabecera=CABECERA_MOVIMIENTOS,
+            ),
+        )
+
+        sin_cambios.refresh_from_db()
+        modificado.refresh_from_db()
+        expediente.refresh_from_db()
+        assert sin_cambios.actualizado == antes
+        assert modificado.actualizado > antes
+        # El resumen del expediente cambió.
+        assert expediente.actualizado > antes
+
+    def test_importar_expedientes_lo_mueve(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        antes = hace_un_rato(ExpedienteSiped)
+
+        importar_expedientes(
+            filas_csv(
+                "1/2025,,NUEVA C/ OTRO,2,PUBLICADO,05/03/2025,Posadas,Juzgado 1,",
+            ),
+        )
+
+        expediente.refresh_from_db()
+        assert expediente.actualizado > antes
+
+    def test_cambio_masivo_de_tareas_lo_mueve(self):
+        tarea = TareaFactory()
+        antes = hace_un_rato(Tarea)
+
+        actualizar_tareas(
+            Tarea.objects.all(),
+            {"estado": Tarea.Estado.REALIZADA},
+            timezone.localdate(),
+        )
+
+        tarea.refresh_from_db()
+        assert tarea.actualizado > antes
+
+
+# El feed solo lee filas de transacciones terminadas: sin transaction=True
+# todo lo que escribe la prueba queda en su transacción, todavía abierta.
+@pytest.mark.django_db(transaction=True)
+class TestLeerCambios:
+    def test_solo_lo_escrito_desde_el_cursor(self):
+        primera, segunda = TareaFactory.create_batch(2)
+        lectura, filas = tareas()
+        assert filas == [primera, segunda]
+
+        posiciones = decodificar_cursor(lectura.cursor)
+        assert tareas(posiciones)[1] == []
+
+        primera.titulo = "Otro"
+        primera.save()
+        lectura, filas = tareas(posiciones)
+        assert filas == [primera]
+        assert not lectura.hay_mas
+
+    def test_empates_en_la_transaccion(self):
+        TareaFactory.create_batch(5)
+        # Un UPDATE masivo deja la misma transacción en todas las filas.
+        Tarea.objects.update(titulo="Otro")
+
+        vistas = []
+        posiciones = None
+        while True:
+            lectura, filas = tareas(posiciones, limite=2)
+            vistas += filas
+            posiciones = decodificar_cursor(lectura.cursor)
+            if not lectura.hay_mas:
+                break
+
+        assert vistas == list(Tarea.objects.order_by("pk"))
+
+    def test_no_pierde_las_transacciones_largas(self):
+        previa = TareaFactory()
+        escrita = threading.Event()
+        confirmar = threading.Event()
+
+        def transaccion_larga():
+            try:
+                with transaction.atomic():
+                    TareaFactory(titulo="larga")
+                    escrita.set()
+                    confirmar.wait(timeout=10)
+            finally:
+                connection.close()
+
+        hilo = threading.Thread(target=transaccion_larga)
+        hilo.start()
+        assert escrita.wait(timeout=10)
+        # Escrita después que la larga pero confirmada antes.
+        corta = TareaFactory(titulo="corta")
+        lectura, filas = tareas()
+        # La larga sigue abierta: no se pasa de ella.
+        assert filas == [previa]
+        confirmar.set()
+        hilo.join()
+
+        larga = Tarea.objects.get(titulo="larga")
+        assert larga.actualizado < corta.actualizado
+        assert tareas(decodificar_cursor(lectura.cursor))[1] == [larga, corta]
+
+    def test_registra_las_bajas(self):
+        caso = CasoFactory()
+        tarea = TareaFactory(caso=caso)
+        caso_id = caso.pk
+
+        caso.delete()
+
+        lectura = leer_cambios({ELIMINADOS: Eliminacion.objects.all()})
+        assert {(e.modelo, e.objeto_id) for e in lectura.filas[ELIMINADOS]} == {
+            ("casos", caso_id),
+            ("tareas", tarea.pk),
+        }
+
+
+def test_cursor_invalido():
+    assert decodificar_cursor(codificar_cursor({"tareas": (740, 3)})) == {
+        "tareas": (740, 3),
+    }
+    assert decodificar_cursor("no es un cursor") is None
+    assert decodificar_cursor(codificar_cursor({"tareas": (740, "3")})) is None
+    # Los cursores anteriores guardaban una fecha.
+    fecha = codificar_cursor({"tareas": (timezone.now().isoformat(), 3)})
+    assert decodificar_cursor(fecha) is None
+
+
+def test_el_trigger_asigna_la_transaccion():
+    tarea = TareaFactory()
+    tarea.refresh_from_db()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_current_xact_id()::text::bigint")
+        actual = cursor.fetchone()[0]
+
+    assert tarea.transaccion == actual
+    Tarea.objects.update(titulo="Otro")
+    tarea.refresh_from_db()
+    assert tarea.transaccion == actual
@@ -0,0 +1,190 @@
+import io
+import random
+import re
+import zipfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from foros.casos.csv_siped import detectar_codificacion
+from foros.casos.csv_siped import leer_filas
+from foros.casos.csv_siped import leer_filas_zip
+from foros.casos.csv_siped import partir_en_bloques
+from foros.casos.csv_siped import reparar_bloque
+from foros.casos.csv_siped import reparar_bloques
+from foros.casos.csv_siped import separar_cabecera
+
+
+def reparar_csv_legado(content_str):
+    """Implementación original (en memoria) usada como referencia."""
+    lines = content_str.splitlines()
+    if not lines:
+        return io.StringIO("")
+    fixed_lines = [lines[0]]
+    exp_pattern = re.compile(r"^\d+/\d+,")
+    current_line = ""
+    for raw_line in lines[1:]:
+        line = raw_line.strip()
+        if not line:
+            continue
+        if exp_pattern.match(line):
+            if current_line:
+                fixed_lines.append(current_line)
+            current_line = line
+        else:
+            current_line += " " + line
+    if current_line:
+        fixed_lines.append(current_line)
+    return io.StringIO("\n".join(fixed_lines))
+
+
+CSV_ROTO = (
+    " expediente,nombre_escrito,descripcion \r\n"
+    "suelta antes del primer registro\n"
+    "1/2025,E-1,Primera parte\n"
+    "   de la descripción  \n"
+    "\n"
+    "  y final\n"
+    "  2/2025,E-2,Otra\x0bcon tab vertical\n"
+    "3/2025,E-3,Última"
+)
+
+
+def csv_roto_al_azar(semilla):
+    """CSV con cortes, blancos y todos los saltos que reconoce splitlines()."""
+    azar = random.Random(semilla)  # noqa: S311
+    piezas = ["1/2025,a", "22/2024,b c", "12", "/2025,", "2 copias", "x", "", "ñ"]
+    espacios = ["", " ", "\t", "\xa0"]
+    saltos = ["\n", "\r\n", "\r", "\x0b", "\x0c", "\x1c", "\x85", "\u2028"]
+    return "".join(
+        azar.choice(espacios)
+        + azar.choice(piezas)
+        + azar.choice(espacios)
+        + azar.choice(saltos)
+        for _ in range(azar.randrange(60))
+    )
+
+
+class TestRepararBloques:
+    def test_une_lineas_cortadas(self):
+        assert list(reparar_bloques([CSV_ROTO])) == [
+            " expediente,nombre_escrito,descripcion ",
+            " suelta antes del primer registro",
+            "1/2025,E-1,Primera parte de la descripción y final",
+            "2/2025,E-2,Otra con tab vertical",
+            "3/2025,E-3,Última",
+        ]
+
+    def test_compatible_con_implementacion_anterior(self):
+        casos = [CSV_ROTO, "", "solo cabecera", "\n\n1/2,a\nb\n", "c\r\n \n"]
+        casos += [csv_roto_al_azar(semilla) for semilla in range(300)]
+        for contenido in casos:
+            esperado = reparar_csv_legado(contenido).getvalue()
+            assert "\n".join(reparar_bloques([contenido])) == esperado, contenido
+
+    def test_bloque_sin_registros(self):
+        assert reparar_bloque(" \n\t\r\n") == []
+        assert reparar_bloque("a\n b") == [" a b"]
+
+    def test_separar_cabecera(self):
+        assert (
+            separar_cabecera(CSV_ROTO)[0] == " expediente,nombre_escrito,descripcion "
+        )
+        assert separar_cabecera("a\x0bb\nc") == ("a", "b\nc")
+        assert separar_cabecera("a\r\nb") == ("a", "b")
+        assert separar_cabecera("\nc") == ("", "c")
+        assert separar_cabecera("") == ("", "")
+
+
+class TestLeerFilas:
+    def test_utf8_con_bom(self):
+        archivo = SimpleUploadedFile(
+            "a.csv",
+            "\ufeffexpediente,caratula\n1/2025,ÑANDÚ\n".encode(),
+        )
+
+        filas = list(leer_filas(archivo))
+
+        assert filas == [{"expediente": "1/2025", "caratula": "ÑANDÚ"}]
+
+    def test_latin1(self):
+        archivo = SimpleUploadedFile(
+            "a.csv",
+            "expediente,caratula\n1/2025,PEÑA\n".encode("latin-1"),
+        )
+
+        assert detectar_codificacion(archivo) == "latin-1"
+        assert list(leer_filas(archivo)) == [
+            {"expediente": "1/2025", "caratula": "PEÑA"},
+        ]
+
+    def test_caracteres_multibyte_entre_bloques(self):
+        lineas = [f"{n}/2025,{'ñ' * (n % 7 + 1)}" for n in range(1, 5000)]
+        archivo = SimpleUploadedFile(
+            "a.csv",
+            "\n".join(["expediente,caratula", *lineas]).encode(),
+        )
+
+        filas = list(leer_filas(archivo))
+
+        assert [f"{f['expediente']},{f['caratula']}" for f in filas] == lineas
+
+    def test_reparar(self):
+        archivo = SimpleUploadedFile("a.csv", CSV_ROTO.encode())
+
+        filas = list(leer_filas(archivo, reparar=True))
+
+        assert [f[" expediente"] for f in filas] == [
+            " suelta antes del primer registro",
+            "1/2025",
+            "2/2025",
+            "3/2025",
+        ]
+        assert filas[1]["descripcion "] == "Primera parte de la descripción y final"
+
+
+def zip_con(**archivos):
+    contenido = io.BytesIO()
+    with zipfile.ZipFile(contenido, "w") as zip_file:
+        for nombre, datos in archivos.items():
+            zip_file.writestr(nombre, datos)
+    return SimpleUploadedFile("movimientos.zip", contenido.getvalue())
+
+
+class TestLeerFilasZip:
+    def test_lee_todos_los_csv(self):
+        archivo = zip_con(
+            **{
+                "b.csv": "expediente,tipo\n2/2025,B\n".encode("latin-1"),
+                "a.csv": "\ufeffexpediente,tipo\n1/2025,Ñ\ncontinúa\n".encode(),
+                "LEAME.txt": b"no es un csv",
+            },
+        )
+
+        filas = list(leer_filas_zip(archivo, reparar=True))
+
+        assert filas == [
+            {"expediente": "1/2025", "tipo": "Ñ continúa"},
+            {"expediente": "2/2025", "tipo": "B"},
+        ]
+
+
+class TestPartirEnBloques:
+    def test_corta_solo_al_inicio_de_un_registro(self):
+        contenido = CSV_ROTO * 20
+
+        bloques = list(partir_en_bloques(io.StringIO(contenido, newline=""), 16))
+
+        assert "".join(bloques) == contenido
+        assert len(bloques) > 1
+        for bloque in bloques[1:]:
+            assert re.match(r"\d+/\d+,", bloque)
+        assert list(reparar_bloques(bloques)) == list(reparar_bloques([contenido]))
+
+    def test_compatible_con_implementacion_anterior(self):
+        for semilla in range(50):
+            contenido = csv_roto_al_azar(semilla) * 5
+            bloques = partir_en_bloques(io.StringIO(contenido, newline=""), 8)
+
+            reparado = "\n".join(reparar_bloques(bloques))
+
+            assert reparado == reparar_csv_legado(contenido).getvalue()
@@ -0,0 +1,97 @@
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from foros.casos.csv_siped import partir_en_bloques
+from foros.casos.delta import FiltroDelta
+from foros.casos.delta import fines_de_registro
+from foros.casos.delta import huella_archivo
+from foros.casos.paralelo import leer_movimientos
+from foros.casos.tests.test_paralelo import csv_movimientos
+
+
+def filtrar(texto, conocidos=(), tamanio=1024):
+    filtro = FiltroDelta(conocidos)
+    bloques = list(
+        filtro.filtrar(partir_en_bloques(io.StringIO(texto), tamanio), tamanio),
+    )
+    return filtro, bloques
+
+
+def test_huella_archivo():
+    archivo = SimpleUploadedFile("a.csv", b"expediente\n1/2025\n")
+
+    huella = huella_archivo(archivo)
+
+    assert len(huella) == 64  # noqa: PLR2004
+    assert huella != huella_archivo(SimpleUploadedFile("b.csv", b"expediente\n"))
+    assert archivo.tell() == 0
+
+
+def test_fines_de_registro_con_continuaciones():
+    datos = b"1/2025,A\n  sigue\n2/2025,B\n3/2025,C"
+
+    assert fines_de_registro(datos) == [17, 26, len(datos)]
+    assert fines_de_registro(datos + b"\n") == [17, 26, len(datos) + 1]
+    assert fines_de_registro(b"") == []
+
+
+class TestFiltroDelta:
+    def test_sin_huellas_previas_deja_pasar_todo(self):
+        texto = csv_movimientos(2000).decode()
+
+        filtro, bloques = filtrar(texto)
+
+        assert "".join(bloques) == texto
+        assert filtro.omitidos == 0
+        assert len(filtro.huellas) > 1
+
+    def test_mismo_archivo_no_deja_pasar_registros(self):
+        texto = csv_movimientos(2000).decode()
+        anterior, _ = filtrar(texto)
+
+        filtro, bloques = filtrar(texto, anterior.huellas)
+
+        assert bloques == [texto[: texto.index("\n") + 1]]
+        assert filtro.omitidos == len(filtro.huellas)
+
+    def test_un_registro_nuevo_cambia_un_solo_bloque(self):
+        texto = csv_movimientos(2000).decode()
+        anterior, _ = filtrar(texto)
+        nuevo = "7/2025,NUEVO,,01/04/2025 10:00,ESCRITO,PUBLICADO,JUZGADO,Nuevo\n"
+        medio = texto.rindex("\n", 0, texto.index(",E-1000,")) + 1
+        texto = texto[:medio] + nuevo + texto[medio:]
+
+        filtro, bloques = filtrar(texto, anterior.huellas)
+
+        assert filtro.omitidos == len(filtro.huellas) - 1
+        assert nuevo in "".join(bloques)
+        # El encabezado y el bloque del registro nuevo.
+        assert len("".join(bloques)) < len(texto) / 10
+
+    def test_otro_encabezado_deja_pasar_todo(self):
+        texto = csv_movimientos(500).decode()
+        anterior, _ = filtrar(texto)
+        texto = texto.replace("expediente,", "EXPEDIENTE,", 1)
+
+        filtro, bloques = filtrar(texto, anterior.huellas)
+
+        assert filtro.omitidos == 0
+        assert "".join(bloques) == texto
+
+    def test_lectura_de_movimientos_filtrada(self):
+        contenido = csv_movimientos(500)
+        anterior = FiltroDelta()
+        list(leer_movimientos(SimpleUploadedFile("a.csv", contenido), filtro=anterior))
+        cambiado = contenido.replace(b",Descripci\xc3\xb3n 250\n", b",Otra\n")
+
+        filtro = FiltroDelta(anterior.huellas)
+        filas = list(
+            leer_movimientos(SimpleUploadedFile("a.csv", cambiado), filtro=filtro),
+        )
+
+        assert ("6/2025", "E-250") in [
+            (numero, datos["nombre_escrito"]) for numero, datos in filas
+        ]
+        assert len(filas) < 50  # noqa: PLR2004
+        assert filtro.omitidos == len(filtro.huellas) - 1
@@ -0,0 +1,96 @@
+import contextlib
+from datetime import date
+from datetime import datetime
+
+import pytest
+from django.utils.timezone import make_aware
+
+from foros.casos.fechas import FORMATOS_FECHA_HORA
+from foros.casos.fechas import ColumnaFecha
+from foros.casos.fechas import parsear_fecha
+
+
+def parsear_fecha_hora_legado(date_str):
+    """La implementación con strptime que reemplaza fechas.py."""
+    if not date_str:
+        return None
+    date_str = " ".join(date_str.split())
+    if not date_str:
+        return None
+    for fmt in [
+        "%d/%m/%Y %H:%M:%S",
+        "%d/%m/%Y %H:%M",
+        "%d/%m/%Y",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d",
+    ]:
+        with contextlib.suppress(ValueError):
+            return make_aware(datetime.strptime(date_str, fmt))  # noqa: DTZ007
+    return None
+
+
+VALORES = [
+    None,
+    "",
+    "   ",
+    "05/03/2025 14:30:15",
+    "05/03/2025 14:30",
+    "  05/03/2025   14:30 ",
+    "5/3/2025 9:05",
+    "05/03/2025",
+    "2025-03-05 14:30:15",
+    "2025-03-05",
+    "2025-3-5",
+    "31/02/2025",
+    "05/03/2025 24:00",
+    "05/03/2025 14:60",
+    "05/03/25",
+    "05-03-2025",
+    "05/03/2025T14:30",
+    "sin fecha",
+]
+
+
+class TestColumnaFecha:
+    @pytest.mark.parametrize("valor", VALORES)
+    def test_igual_que_strptime(self, valor):
+        assert ColumnaFecha()(valor) == parsear_fecha_hora_legado(valor)
+
+    def test_igual_que_strptime_con_formato_detectado(self):
+        columna = ColumnaFecha()
+        columna("05/03/2025 14:30")
+
+        for valor in VALORES:
+            assert columna(valor) == parsear_fecha_hora_legado(valor)
+
+    def test_detecta_el_formato(self):
+        columna = ColumnaFecha()
+
+        columna("2025-03-05")
+
+        assert columna.formato is FORMATOS_FECHA_HORA[-1]
+
+    def test_cache_acotada(self):
+        columna = ColumnaFecha(tamanio_cache=2)
+
+        for dia in range(1, 6):
+            columna(f"{dia:02}/03/2025")
+
+        assert columna._parsear.cache_info().currsize == 2  # noqa: PLR2004, SLF001
+
+
+class TestParsearFecha:
+    @pytest.mark.parametrize(
+        ("valor", "esperado"),
+        [
+            ("05/03/2025", date(2025, 3, 5)),
+            ("5/3/2025", date(2025, 3, 5)),
+            (" 05/03/2025", None),
+            ("05/03/2025 10:00", None),
+            ("31/02/2025", None),
+            ("", None),
+            (None, None),
+        ],
+    )
+    def test_parsear_fecha(self, valor, esperado):
+        assert parsear_fecha(valor) == esperado
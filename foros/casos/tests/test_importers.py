@@ -0,0 +1,305 @@
+import csv
+import io
+from datetime import date
+
+import pytest
+
+from foros.casos.importers import importar_expedientes
+from foros.casos.importers import importar_movimientos
+from foros.casos.importers import importar_movimientos_global
+from foros.casos.models import ExpedienteSiped
+from foros.casos.models import Movimiento
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.factories import MovimientoFactory
+
+pytestmark = pytest.mark.django_db
+
+CABECERA_EXPEDIENTES = (
+    "expediente,link_detalle,caratula,partes,estado,"
+    "fec_ult_mov,localidad,dependencia,secretaria"
+)
+
+CABECERA_MOVIMIENTOS = (
+    "expediente,nombre_escrito,link_escrito,fecha_presentacion,tipo,estado,"
+    "generado_por,descripcion,fecha_firma,fecha_publicacion"
+)
+
+
+def filas_csv(*lineas, cabecera=CABECERA_EXPEDIENTES):
+    return csv.DictReader(io.StringIO("\n".join([cabecera, *lineas])))
+
+
+class TestImportarExpedientes:
+    def test_crea_y_actualiza(self):
+        ExpedienteSipedFactory(expediente="1/2025", caratula="VIEJA")
+        filas = filas_csv(
+            "1/2025,,NUEVA C/ OTRO,2,PUBLICADO,05/03/2025,Posadas,Juzgado 1,Sec 1",
+            "2/2025,,PEREZ C/ GOMEZ,x,A DESPACHO,,Posadas,Juzgado 2,",
+            ",,SIN NUMERO,,,,,,",
+        )
+
+        resultado = importar_expedientes(filas)
+
+        assert (resultado.creados, resultado.actualizados) == (1, 1)
+        actualizado = ExpedienteSiped.objects.get(expediente="1/2025")
+        assert actualizado.caratula == "NUEVA C/ OTRO"
+        assert actualizado.partes == 2  # noqa: PLR2004
+        assert actualizado.fec_ult_mov == date(2025, 3, 5)
+        creado = ExpedienteSiped.objects.get(expediente="2/2025")
+        assert creado.partes is None
+        assert creado.fec_ult_mov is None
+
+    def test_repetidos_cuentan_como_actualizados(self):
+        filas = filas_csv(
+            "1/2025,,PRIMERA,,,,,,",
+            "2/2025,,OTRO,,,,,,",
+            "1/2025,,SEGUNDA,,,,,,",
+        )
+
+        resultado = importar_expedientes(filas, batch_size=2)
+
+        assert (resultado.creados, resultado.actualizados) == (2, 1)
+        assert ExpedienteSiped.objects.get(expediente="1/2025").caratula == "SEGUNDA"
+
+    def test_reimportar_sin_cambios(self, django_assert_num_queries):
+        lineas = [f"{n}/2025,,CARATULA {n},,,,,," for n in range(1, 5)]
+        importar_expedientes(filas_csv(*lineas))
+        lineas[0] = "1/2025,,OTRA CARATULA,,,,,,"
+
+        resultado = importar_expedientes(filas_csv(*lineas))
+
+        assert (resultado.creados, resultado.actualizados) == (0, 1)
+        assert resultado.sin_cambios == 3  # noqa: PLR2004
+        assert ExpedienteSiped.objects.get(expediente="1/2025").caratula == (
+            "OTRA CARATULA"
+        )
+        # Si nada cambió, solo se consultan los hashes, dentro del SAVEPOINT
+        # del lote.
+        with django_assert_num_queries(3):
+            resultado = importar_expedientes(filas_csv(*lineas))
+        assert resultado.sin_cambios == 4  # noqa: PLR2004
+
+    def test_consultas_por_lote(self, django_assert_num_queries):
+        filas = filas_csv(*(f"{n}/2025,,CARATULA {n},,,,,," for n in range(1, 11)))
+
+        # Por lote: SELECT de existentes, INSERT ... ON CONFLICT y el UPDATE
+        # del vector de búsqueda, dentro del SAVEPOINT del lote (que incluye
+        # el progreso) y el de la escritura.
+        with django_assert_num_queries(14):
+            resultado = importar_expedientes(filas, batch_size=5)
+
+        assert resultado.creados == 10  # noqa: PLR2004
+
+
+class TestImportarMovimientos:
+    def filas(self, *lineas):
+        return filas_csv(*lineas, cabecera=CABECERA_MOVIMIENTOS)
+
+    def test_crea_y_actualiza_por_clave_natural(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        MovimientoFactory(expediente=expediente, nombre_escrito="E-1", tipo="VIEJO")
+        filas = self.filas(
+            "1/2025,E-1,,01/02/2025 10:00,ESCRITO,PUBLICADO,JUZGADO,Actualizado,,",
+            "1/2025,,,02/02/2025 11:30,ESTESE,PUBLICADO,JUZGADO,Sin escrito,,",
+            "1/2025,,,,NOTA,,,Sin clave,,",
+        )
+
+        resultado = importar_movimientos(expediente, filas)
+
+        assert (resultado.creados, resultado.actualizados) == (2, 1)
+        assert expediente.movimientos.count() == 3  # noqa: PLR2004
+        escrito = expediente.movimientos.get(nombre_escrito="E-1")
+        assert escrito.tipo == "ESCRITO"
+        assert escrito.descripcion == "Actualizado"
+
+    def test_reimportar_no_duplica(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        lineas = [
+            "1/2025,E-1,,01/02/2025,ESCRITO,,,Uno,,",
+            "1/2025,,,02/02/2025 11:30,ESTESE,,,Dos,,",
+        ]
+        importar_movimientos(expediente, self.filas(*lineas))
+
+        resultado = importar_movimientos(expediente, self.filas(*lineas))
+
+        assert (resultado.creados, resultado.actualizados) == (0, 0)
+        assert resultado.sin_cambios == 2  # noqa: PLR2004
+        assert Movimiento.objects.count() == 2  # noqa: PLR2004
+
+    def test_solo_escribe_filas_cambiadas(self, django_assert_num_queries):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        lineas = [f"1/2025,E-{n},,01/02/2025,ESCRITO,,,Uno,," for n in range(5)]
+        importar_movimientos(expediente, self.filas(*lineas))
+        lineas[2] = "1/2025,E-2,,01/02/2025,ESCRITO,,,Cambiada,,"
+
+        resultado = importar_movimientos(expediente, self.filas(*lineas))
+
+        assert (resultado.creados, resultado.actualizados) == (0, 1)
+        assert resultado.sin_cambios == 4  # noqa: PLR2004
+        assert expediente.movimientos.get(nombre_escrito="E-2").descripcion == (
+            "Cambiada"
+        )
+        # Un lote sin cambios solo lee las reglas de tareas y las claves
+        # existentes, más el SAVEPOINT del lote.
+        with django_assert_num_queries(4):
+            resultado = importar_movimientos(expediente, self.filas(*lineas))
+        assert resultado.sin_cambios == 5  # noqa: PLR2004
+
+    def test_repetido_vuelve_al_valor_guardado(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        original = "1/2025,E-1,,01/02/2025,ESCRITO,,,Original,,"
+        importar_movimientos(expediente, self.filas(original))
+
+        resultado = importar_movimientos(
+            expediente,
+            self.filas("1/2025,E-1,,01/02/2025,ESCRITO,,,Cambiada,,", original),
+        )
+
+        assert (resultado.actualizados, resultado.sin_cambios) == (2, 0)
+        assert expediente.movimientos.get().descripcion == "Original"
+
+    def test_repetidos_en_el_archivo(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        filas = self.filas(
+            "1/2025,E-1,,01/02/2025,ESCRITO,,,Primera,,",
+            "1/2025,E-1,,01/02/2025,ESCRITO,,,Segunda,,",
+        )
+
+        resultado = importar_movimientos(expediente, filas)
+
+        assert (resultado.creados, resultado.actualizados) == (1, 1)
+        assert expediente.movimientos.get().descripcion == "Segunda"
+
+    def test_consultas_constantes(self, django_assert_num_queries):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        MovimientoFactory.create_batch(5, expediente=expediente)
+        existentes = [
+            f"1/2025,{m.nombre_escrito},,,ESCRITO,,,Nueva,,"
+            for m in expediente.movimientos.all()
+        ]
+        nuevos = [f"1/2025,N-{n},,,ESCRITO,,,,," for n in range(20)]
+
+        # SELECT de las reglas de tareas (una vez por importación) y de
+        # existentes, INSERT de altas, UPDATE de modificaciones y UPDATE del
+        # vector de búsqueda y del resumen del expediente, más los SAVEPOINT
+        # del lote y de su escritura (los tests corren dentro de una
+        # transacción). Sin reglas que coincidan no se consultan los casos.
+        with django_assert_num_queries(10):
+            resultado = importar_movimientos(
+                expediente,
+                self.filas(*existentes, *nuevos),
+            )
+
+        assert (resultado.creados, resultado.actualizados) == (20, 5)
+
+    def test_filas_con_error_no_frenan_el_lote(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        filas = self.filas(
+            "1/2025,E-1,,,ESCRITO,,,Uno,,",
+            "1/2025,E-2,,,ESCRITO,,,Con NUL \x00,,",
+            "1/2025,E-3,,,ESCRITO,,,Tres,,",
+        )
+
+        resultado = importar_movimientos(expediente, filas, batch_size=2)
+
+        assert (resultado.creados, resultado.fallidas) == (2, 1)
+        assert [e["fila"] for e in resultado.errores] == [2]
+        assert resultado.ultima_fila == 3  # noqa: PLR2004
+        assert set(
+            expediente.movimientos.values_list("nombre_escrito", flat=True),
+        ) == {"E-1", "E-3"}
+
+    def test_retoma_desde_fila(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        filas = self.filas(
+            "1/2025,E-1,,,ESCRITO,,,Uno,,",
+            "1/2025,E-2,,,ESCRITO,,,Dos,,",
+        )
+
+        resultado = importar_movimientos(expediente, filas, desde_fila=1)
+
+        assert resultado.creados == 1
+        assert expediente.movimientos.get().nombre_escrito == "E-2"
+
+    def test_el_lote_se_confirma_con_su_progreso(self):
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        # Sin clave natural: reprocesar el lote los duplicaría.
+        filas = self.filas("1/2025,,,,ESCRITO,,,Uno,,", "1/2025,,,,ESCRITO,,,Dos,,")
+        progreso = []
+
+        def registrar(resultado):
+            progreso.append(resultado.ultima_fila)
+            if len(progreso) == 2:  # noqa: PLR2004
+                msg = "El worker murió"
+                raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError):
+            importar_movimientos(
+                expediente,
+                filas,
+                batch_size=1,
+                al_guardar_lote=registrar,
+            )
+
+        # El segundo lote se revirtió junto con su progreso.
+        assert progreso == [1, 2]
+        assert list(expediente.movimientos.values_list("descripcion", flat=True)) == [
+            "Uno",
+        ]
+
+
+class TestImportarMovimientosGlobal:
+    def filas(self, *lineas):
+        return filas_csv(*lineas, cabecera=CABECERA_MOVIMIENTOS)
+
+    def test_agrupa_por_expediente(self):
+        uno = ExpedienteSipedFactory(expediente="1/2025")
+        dos = ExpedienteSipedFactory(expediente="2/2025")
+        MovimientoFactory(expediente=dos, nombre_escrito="E-1", tipo="VIEJO")
+        filas = self.filas(
+            "1/2025,E-1,,,ESCRITO,,,Uno,,",
+            "2/2025,E-1,,,ESCRITO,,,Actualizado,,",
+            "1/2025,E-2,,,ESCRITO,,,Dos,,",
+        )
+
+        resultado = importar_movimientos_global(filas)
+
+        assert (resultado.creados, resultado.actualizados) == (2, 1)
+        assert sorted(uno.movimientos.values_list("nombre_escrito", flat=True)) == [
+            "E-1",
+            "E-2",
+        ]
+        assert dos.movimientos.get().descripcion == "Actualizado"
+
+    def test_informa_expedientes_desconocidos(self):
+        ExpedienteSipedFactory(expediente="1/2025")
+        filas = self.filas(
+            "9/2025,E-1,,,ESCRITO,,,,,",
+            "1/2025,E-2,,,ESCRITO,,,,,",
+            "9/2025,E-3,,,ESCRITO,,,,,",
+        )
+
+        resultado = importar_movimientos_global(filas)
+
+        assert (resultado.creados, resultado.fallidas) == (1, 2)
+        assert resultado.errores == [
+            {"fila": 1, "error": "Expediente inexistente: 9/2025"},
+        ]
+
+    def test_consultas_por_lote(self, django_assert_num_queries):
+        for n in range(1, 5):
+            ExpedienteSipedFactory(expediente=f"{n}/2025")
+        filas = self.filas(
+            *(f"{n % 4 + 1}/2025,E-{n},,,ESCRITO,,,,," for n in range(40)),
+        )
+
+        # SELECT de las reglas de tareas y de los números de expediente y,
+        # por cada uno de los dos lotes, SELECT de claves, dos SAVEPOINT (el
+        # del lote y el de su escritura), INSERT, UPDATE del vector de
+        # búsqueda, UPDATE del resumen de los expedientes y dos RELEASE. El
+        # segundo lote no vuelve a cargar claves porque ya vio los cuatro
+        # expedientes.
+        with django_assert_num_queries(17):
+            resultado = importar_movimientos_global(filas, batch_size=20)
+
+        assert resultado.creados == 40  # noqa: PLR2004
@@ -0,0 +1,93 @@
+from datetime import date
+
+import pytest
+
+from foros.casos.models import ExpedienteSiped
+from foros.casos.paginacion import contar_estimado
+from foros.casos.paginacion import paginar_keyset
+from foros.casos.tests.factories import ExpedienteSipedFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def expedientes():
+    # Fechas repetidas y nulas para probar el desempate por id.
+    fechas = [date(2025, 1, 1 + n % 3) for n in range(10)] + [None] * 3
+    return [ExpedienteSipedFactory(fec_ult_mov=fecha) for fecha in fechas]
+
+
+def orden_esperado(expedientes):
+    def clave(expediente):
+        fecha = expediente.fec_ult_mov
+        return (fecha is not None, fecha or date.min, expediente.pk)
+
+    return [e.pk for e in sorted(expedientes, key=clave, reverse=True)]
+
+
+def recorrer(cursor=None, direccion="siguiente"):
+    paginas = []
+    while True:
+        pagina = paginar_keyset(
+            ExpedienteSiped.objects.all(),
+            "fec_ult_mov",
+            cursor,
+            tamanio=4,
+        )
+        paginas.append([e.pk for e in pagina])
+        cursor = getattr(pagina, direccion)
+        if cursor is None:
+            return paginas, pagina
+
+
+class TestPaginarKeyset:
+    def test_recorre_todo_en_orden(self, expedientes):
+        paginas, _ = recorrer()
+
+        assert [pk for pagina in paginas for pk in pagina] == orden_esperado(
+            expedientes,
+        )
+        assert [len(pagina) for pagina in paginas] == [4, 4, 4, 1]
+
+    def test_vuelve_hacia_atras(self, expedientes):
+        paginas, ultima = recorrer()
+
+        hacia_atras, primera = recorrer(ultima.anterior, "anterior")
+
+        assert hacia_atras == paginas[-2::-1]
+        assert primera.anterior is None
+        assert primera.siguiente is not None
+
+    def test_primera_pagina_sin_anterior(self, expedientes):
+        pagina = paginar_keyset(ExpedienteSiped.objects.all(), "fec_ult_mov")
+
+        assert pagina.anterior is None
+        assert len(pagina) == len(expedientes)
+        assert not pagina.tiene_otras_paginas
+
+    @pytest.mark.parametrize("cursor", ["basura", "WyJ4IiwxLDJd", "WyJzIiwieCIsMV0"])
+    def test_cursor_invalido_lleva_al_principio(self, expedientes, cursor):
+        pagina = paginar_keyset(
+            ExpedienteSiped.objects.all(),
+            "fec_ult_mov",
+            cursor,
+            tamanio=4,
+        )
+
+        assert [e.pk for e in pagina] == orden_esperado(expedientes)[:4]
+
+    def test_queryset_vacio(self):
+        pagina = paginar_keyset(ExpedienteSiped.objects.all(), "fec_ult_mov")
+
+        assert list(pagina) == []
+        assert not pagina.tiene_otras_paginas
+
+
+class TestContarEstimado:
+    def test_tabla_chica_cuenta_exacto(self, expedientes):
+        assert contar_estimado(ExpedienteSiped.objects.all()) == len(expedientes)
+
+    def test_con_filtros_cuenta_exacto(self, expedientes):
+        queryset = ExpedienteSiped.objects.filter(fec_ult_mov__isnull=True)
+
+        assert contar_estimado(queryset) == 3  # noqa: PLR2004
@@ -0,0 +1,74 @@
+import io
+import zipfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from foros.casos.paralelo import leer_movimientos
+from foros.casos.paralelo import leer_movimientos_zip
+
+CABECERA = (
+    "expediente,nombre_escrito,link_escrito,fecha_presentacion,tipo,estado,"
+    "generado_por,descripcion,fecha_firma,fecha_publicacion"
+)
+
+
+def csv_movimientos(cantidad):
+    lineas = [CABECERA, "continuación suelta antes del primer registro"]
+    for n in range(cantidad):
+        lineas.append(
+            f"{n % 7 + 1}/2025,E-{n},,{n % 28 + 1:02}/03/2025 10:{n % 60:02},"
+            f"ESCRITO,PUBLICADO,JUZGADO,Descripción {n}",
+        )
+        if n % 3 == 0:
+            lineas.append(f"  que sigue en otra línea {n}\r")
+        if n % 5 == 0:
+            lineas.append("")
+    return "\n".join(lineas).encode()
+
+
+class TestLeerMovimientos:
+    def test_en_paralelo_igual_que_en_serie(self):
+        contenido = csv_movimientos(500)
+
+        serie = list(leer_movimientos(SimpleUploadedFile("a.csv", contenido)))
+        paralelo = list(
+            leer_movimientos(
+                SimpleUploadedFile("a.csv", contenido),
+                procesos=2,
+                tamanio_bloque=1024,
+            ),
+        )
+
+        assert len(serie) == 501  # noqa: PLR2004
+        assert paralelo == serie
+
+    def test_archivo_chico_sin_pool(self):
+        contenido = csv_movimientos(3)
+
+        filas = list(
+            leer_movimientos(SimpleUploadedFile("a.csv", contenido), procesos=4),
+        )
+
+        # La continuación suelta queda como una fila propia, igual que en serie.
+        assert [f[0] for f in filas] == [
+            "continuación suelta antes del primer registro",
+            "1/2025",
+            "2/2025",
+            "3/2025",
+        ]
+
+    def test_zip(self):
+        contenido = io.BytesIO()
+        with zipfile.ZipFile(contenido, "w") as zip_file:
+            zip_file.writestr("a.csv", csv_movimientos(200))
+            zip_file.writestr("b.csv", csv_movimientos(100))
+
+        filas = list(
+            leer_movimientos_zip(
+                SimpleUploadedFile("m.zip", contenido.getvalue()),
+                procesos=2,
+                tamanio_bloque=1024,
+            ),
+        )
+
+        assert len(filas) == 302  # noqa: PLR2004
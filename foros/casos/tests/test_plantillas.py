@@ -0,0 +1,54 @@
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.template.backends.django import DjangoTemplates
+
+from foros.casos.plantillas import nombres_plantillas
+from foros.casos.plantillas import precargar_plantillas
+
+
+def motor(directorio):
+    return DjangoTemplates(
+        {
+            "NAME": "prueba",
+            "DIRS": [str(directorio)],
+            "APP_DIRS": False,
+            "OPTIONS": {},
+        },
+    )
+
+
+def test_precarga_las_del_proyecto_y_lo_que_extienden():
+    propias = list((settings.APPS_DIR / "templates").rglob("*.html"))
+
+    # account/base_manage_password.html extiende una plantilla de allauth.
+    assert precargar_plantillas() > len(propias)
+
+
+def test_sigue_extends_e_include(tmp_path):
+    (tmp_path / "base.html").write_text("{% block contenido %}{% endblock %}")
+    (tmp_path / "parciales").mkdir()
+    (tmp_path / "parciales" / "fila.html").write_text("fila")
+    (tmp_path / "pagina.html").write_text(
+        '{% extends "base.html" %}{% block contenido %}'
+        '{% include "parciales/fila.html" %}{% include nombre %}'
+        "{% endblock %}",
+    )
+
+    assert nombres_plantillas(motor(tmp_path)) == [
+        "base.html",
+        "pagina.html",
+        "parciales/fila.html",
+    ]
+    assert precargar_plantillas(motor(tmp_path)) == 3  # noqa: PLR2004
+
+
+def test_falla_con_plantillas_faltantes_o_invalidas(tmp_path):
+    (tmp_path / "pagina.html").write_text('{% include "no_existe.html" %}')
+    (tmp_path / "rota.html").write_text("{% if %}")
+
+    with pytest.raises(ImproperlyConfigured) as error:
+        precargar_plantillas(motor(tmp_path))
+
+    assert "no_existe.html" in str(error.value)
+    assert "rota.html" in str(error.value)
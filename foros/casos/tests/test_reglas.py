@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from foros.casos.importers import importar_movimientos
+from foros.casos.models import Movimiento
+from foros.casos.models import ReglaTarea
+from foros.casos.models import Tarea
+from foros.casos.reglas import MotorReglas
+from foros.casos.tests.factories import CasoFactory
+from foros.casos.tests.factories import ExpedienteSipedFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def fila(escrito, fecha, tipo="ESTESE", estado="PUBLICADO"):
+    return {
+        "nombre_escrito": escrito,
+        "fecha_presentacion": f"{fecha:%d/%m/%Y}",
+        "tipo": tipo,
+        "estado": estado,
+        "descripcion": "Estése a lo proveído",
+    }
+
+
+class TestMotorReglas:
+    def test_criterios_vacios_aceptan_cualquier_valor(self):
+        por_tipo = ReglaTarea(nombre="a", tipo="estese", titulo="Revisar")
+        por_estado = ReglaTarea(nombre="b", estado="PUBLICADO", titulo="Leer")
+        ambos = ReglaTarea(
+            nombre="c",
+            tipo="CEDULA",
+            estado="PUBLICADO",
+            titulo="Notificar",
+        )
+        motor = MotorReglas([por_tipo, por_estado, ambos])
+
+        def reglas(**datos):
+            return {r.nombre for r in motor.reglas_para(Movimiento(**datos))}
+
+        assert reglas(tipo=" ESTESE ", estado="PUBLICADO") == {"a", "b"}
+        assert reglas(tipo="CEDULA", estado="publicado") == {"b", "c"}
+        assert reglas(tipo="DECRETO", estado="FIRMADO") == set()
+
+    def test_sin_reglas_no_consulta(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert MotorReglas([]).generar_tareas([Movimiento(tipo="ESTESE")]) == 0
+
+
+class TestTareasAlImportar:
+    def test_crea_una_tarea_por_caso_del_expediente(self, django_assert_num_queries):
+        hoy = timezone.localdate()
+        expediente = ExpedienteSipedFactory()
+        caso = CasoFactory(expediente=expediente)
+        sin_responsable = CasoFactory(expediente=expediente, responsable=None)
+        regla = ReglaTarea.objects.create(
+            nombre="Estese",
+            tipo="ESTESE",
+            titulo="Revisar el estese",
+            dias_plazo=5,
+        )
+        filas = [
+            fila("E-1", hoy - timedelta(days=1)),
+            # Más viejo que antiguedad_maxima: es historial.
+            fila("E-2", hoy - timedelta(days=90)),
+            fila("E-3", hoy, tipo="DECRETO"),
+        ]
+
+        # Reglas, existentes, INSERT de movimientos, vector, resumen, casos
+        # del expediente, tareas existentes e INSERT de tareas, dentro de los
+        # SAVEPOINT del lote y de su escritura.
+        with django_assert_num_queries(12):
+            resultado = importar_movimientos(expediente, filas)
+
+        assert resultado.tareas == 2  # noqa: PLR2004
+        tareas = Tarea.objects.filter(regla=regla)
+        assert {t.caso for t in tareas} == {caso, sin_responsable}
+        tarea = tareas.get(caso=caso)
+        assert tarea.responsable == caso.responsable
+        assert tarea.movimiento.nombre_escrito == "E-1"
+        assert tarea.fecha_limite == hoy + timedelta(days=4)
+        assert tarea.descripcion.startswith("ESTESE - E-1 - PUBLICADO")
+
+    def test_reimportar_no_duplica(self):
+        expediente = ExpedienteSipedFactory()
+        CasoFactory(expediente=expediente)
+        ReglaTarea.objects.create(nombre="Todo", titulo="Leer")
+        filas = [fila("E-1", timezone.localdate())]
+        importar_movimientos(expediente, filas)
+
+        resultado = importar_movimientos(expediente, filas)
+
+        assert resultado.tareas == 0
+        assert Tarea.objects.count() == 1
+
+    def test_no_cuenta_las_tareas_que_ya_existian(self):
+        expediente = ExpedienteSipedFactory()
+        CasoFactory.create_batch(2, expediente=expediente)
+        ReglaTarea.objects.create(nombre="Todo", titulo="Leer")
+        importar_movimientos(expediente, [fila("E-1", timezone.localdate())])
+        movimiento = Movimiento.objects.get()
+        Tarea.objects.filter(caso=expediente.casos.first()).delete()
+        motor = MotorReglas.cargar()
+
+        # Solo falta la tarea de uno de los dos casos.
+        assert motor.generar_tareas([movimiento]) == 1
+        assert motor.generar_tareas([movimiento]) == 0
+        assert Tarea.objects.count() == 2  # noqa: PLR2004
+
+    def test_reglas_inactivas_no_crean_tareas(self):
+        expediente = ExpedienteSipedFactory()
+        CasoFactory(expediente=expediente)
+        ReglaTarea.objects.create(nombre="Todo", titulo="Leer", activa=False)
+
+        importar_movimientos(expediente, [fila("E-1", timezone.localdate())])
+
+        assert not Tarea.objects.exists()
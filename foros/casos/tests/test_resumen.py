@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import pytest
+from django.utils.timezone import make_aware
+
+from foros.casos.importers import importar_movimientos
+from foros.casos.importers import importar_movimientos_global
+from foros.casos.models import ExpedienteSiped
+from foros.casos.resumen import recalcular_resumen
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.factories import MovimientoFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def fila(escrito, fecha, tipo="ESCRITO", estado="PUBLICADO", expediente=""):
+    return {
+        "expediente": expediente,
+        "nombre_escrito": escrito,
+        "fecha_presentacion": fecha,
+        "tipo": tipo,
+        "estado": estado,
+    }
+
+
+def resumen(expediente):
+    expediente.refresh_from_db()
+    return (
+        expediente.cantidad_movimientos,
+        expediente.ultimo_movimiento_fecha,
+        expediente.ultimo_movimiento_tipo,
+        expediente.ultimo_movimiento_estado,
+    )
+
+
+class TestResumenImportacion:
+    def test_cuenta_y_ultimo_movimiento(self):
+        expediente = ExpedienteSipedFactory()
+
+        importar_movimientos(
+            expediente,
+            [
+                fila("E-1", "01/02/2025 10:00"),
+                fila("E-2", "03/02/2025 10:00", "DECRETO", "A DESPACHO"),
+                fila("E-3", ""),
+                fila("E-4", "02/02/2025 10:00"),
+            ],
+            batch_size=2,
+        )
+
+        assert resumen(expediente) == (
+            4,
+            make_aware(datetime(2025, 2, 3, 10)),  # noqa: DTZ001
+            "DECRETO",
+            "A DESPACHO",
+        )
+
+    def test_actualizaciones_no_suman(self):
+        expediente = ExpedienteSipedFactory()
+        importar_movimientos(expediente, [fila("E-1", "01/02/2025 10:00")])
+
+        importar_movimientos(
+            expediente,
+            [fila("E-1", "01/02/2025 10:00", estado="FIRMADO")],
+        )
+
+        assert resumen(expediente)[0] == 1
+        assert resumen(expediente)[3] == "FIRMADO"
+
+    def test_global_por_expediente(self):
+        uno = ExpedienteSipedFactory(expediente="1/2025")
+        dos = ExpedienteSipedFactory(expediente="2/2025")
+        sin_movimientos = ExpedienteSipedFactory(expediente="3/2025")
+
+        importar_movimientos_global(
+            [
+                fila("E-1", "01/02/2025 10:00", expediente="1/2025"),
+                fila("E-2", "02/02/2025 10:00", expediente="2/2025"),
+                fila("E-3", "03/02/2025 10:00", expediente="1/2025"),
+            ],
+        )
+
+        assert resumen(uno)[:2] == (2, make_aware(datetime(2025, 2, 3, 10)))  # noqa: DTZ001
+        assert resumen(dos)[:2] == (1, make_aware(datetime(2025, 2, 2, 10)))  # noqa: DTZ001
+        assert resumen(sin_movimientos) == (0, None, "", "")
+
+
+class TestResumenSenales:
+    def test_guardar_y_borrar(self):
+        expediente = ExpedienteSipedFactory()
+        movimiento = MovimientoFactory(expediente=expediente, tipo="CEDULA")
+        MovimientoFactory(expediente=expediente)
+
+        assert resumen(expediente)[0] == 2  # noqa: PLR2004
+
+        movimiento.delete()
+
+        assert resumen(expediente)[0] == 1
+
+    def test_cambiar_de_expediente(self):
+        anterior = ExpedienteSipedFactory()
+        nuevo = ExpedienteSipedFactory()
+        movimiento = MovimientoFactory(expediente=anterior, tipo="CEDULA")
+        MovimientoFactory(expediente=nuevo, tipo="DECRETO")
+
+        movimiento.expediente = nuevo
+        movimiento.save()
+
+        assert resumen(anterior) == (0, None, "", "")
+        assert resumen(nuevo)[0] == 2  # noqa: PLR2004
+
+        # Guardar de nuevo sin cambiarlo ya no toca el anterior.
+        movimiento.save()
+        assert resumen(nuevo)[0] == 2  # noqa: PLR2004
+
+    def test_recalcular_coincide(self):
+        expediente = ExpedienteSipedFactory()
+        MovimientoFactory.create_batch(3, expediente=expediente)
+        esperado = resumen(expediente)
+        ExpedienteSiped.objects.update(cantidad_movimientos=0)
+
+        recalcular_resumen(ExpedienteSiped.objects.all())
+
+        assert resumen(expediente) == esperado
@@ -0,0 +1,231 @@
+import io
+import zipfile
+
+import pytest
+from django.core.files.base import ContentFile
+
+from foros.casos import tasks
+from foros.casos.importers import importar_movimientos
+from foros.casos.models import FuenteImportacion
+from foros.casos.models import ImportJob
+from foros.casos.models import Movimiento
+from foros.casos.tasks import BASE_PROGRESO
+from foros.casos.tasks import procesar_importacion
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.factories import ImportJobFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestProcesarImportacion:
+    def test_expedientes(self):
+        job = ImportJobFactory(
+            archivo=ContentFile(
+                b"expediente,caratula\n1/2025,UNO\n2/2025,DOS\n",
+                name="expedientes.csv",
+            ),
+        )
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert (job.filas_procesadas, job.creados, job.actualizados) == (2, 2, 0)
+        assert job.fecha_inicio <= job.fecha_fin
+        assert job.filas_por_segundo is not None
+
+    def test_retoma_expedientes_interrumpida(self):
+        # La primera ejecución confirmó la primera fila antes de morir.
+        ExpedienteSipedFactory(expediente="1/2025", caratula="UNO")
+        job = ImportJobFactory(
+            archivo=ContentFile(
+                b"expediente,caratula\n1/2025,UNO\n2/2025,DOS\n",
+                name="expedientes.csv",
+            ),
+            estado=ImportJob.Estado.EN_PROCESO,
+            ultima_fila_confirmada=1,
+            filas_procesadas=1,
+            creados=1,
+        )
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert (job.filas_procesadas, job.creados, job.sin_cambios) == (2, 2, 0)
+        assert job.ultima_fila_confirmada == 2  # noqa: PLR2004
+
+    def test_reimportar_cuenta_sin_cambios(self):
+        contenido = b"expediente,caratula\n1/2025,UNO\n2/2025,DOS\n"
+        procesar_importacion(
+            ImportJobFactory(archivo=ContentFile(contenido, name="a.csv")).pk,
+        )
+        job = ImportJobFactory(
+            archivo=ContentFile(
+                contenido.replace(b"DOS", b"OTRO"),
+                name="b.csv",
+            ),
+        )
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert (job.filas_procesadas, job.actualizados, job.sin_cambios) == (2, 1, 1)
+
+    def test_archivo_igual_al_anterior_no_se_procesa(self):
+        contenido = b"expediente,caratula\n1/2025,UNO\n2/2025,DOS\n"
+        primero = ImportJobFactory(archivo=ContentFile(contenido, name="a.csv"))
+        procesar_importacion(primero.pk)
+        fuente = FuenteImportacion.objects.get(tipo=ImportJob.Tipo.EXPEDIENTES)
+        assert fuente.ultima_importacion == primero
+        job = ImportJobFactory(archivo=ContentFile(contenido, name="b.csv"))
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert (job.filas_procesadas, job.sin_cambios) == (0, 0)
+        assert job.bloques_omitidos == job.bloques_totales == len(fuente.bloques)
+
+    def test_completa_procesa_todo_el_archivo(self):
+        contenido = b"expediente,caratula\n1/2025,UNO\n2/2025,DOS\n"
+        procesar_importacion(
+            ImportJobFactory(archivo=ContentFile(contenido, name="a.csv")).pk,
+        )
+        job = ImportJobFactory(
+            archivo=ContentFile(contenido, name="b.csv"),
+            completa=True,
+        )
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert (job.filas_procesadas, job.sin_cambios) == (2, 2)
+        assert job.bloques_omitidos == 0
+        assert FuenteImportacion.objects.get().ultima_importacion == job
+
+    def movimientos_job(self, **kwargs):
+        return ImportJobFactory(
+            tipo=ImportJob.Tipo.MOVIMIENTOS,
+            expediente=ExpedienteSipedFactory(expediente="1/2025"),
+            archivo=ContentFile(
+                # PostgreSQL rechaza el byte NUL en la segunda fila.
+                b"expediente,nombre_escrito,tipo\n"
+                b"1/2025,E-1,A\n1/2025,E-2,\x00\n1/2025,E-3,C\n",
+                name="movimientos.csv",
+            ),
+            **kwargs,
+        )
+
+    def test_movimientos_por_lotes_reporta_filas_con_error(self, settings):
+        settings.CASOS_IMPORTACION_COMMIT_CADA = 2
+        job = self.movimientos_job()
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert (job.creados, job.filas_con_error) == (2, 1)
+        assert job.ultima_fila_confirmada == 3  # noqa: PLR2004
+        assert [e["fila"] for e in job.errores] == [2]
+        # Con filas fallidas no se guarda la huella del archivo.
+        assert not FuenteImportacion.objects.exists()
+
+    @pytest.mark.django_db(databases=["default", BASE_PROGRESO])
+    def test_movimientos_todo_o_nada(self, settings):
+        settings.CASOS_IMPORTACION_COMMIT_CADA = 0
+        job = self.movimientos_job()
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.FALLIDO
+        assert job.errores[-1]["fila"] is None
+        assert (job.creados, job.ultima_fila_confirmada) == (0, 0)
+        assert not job.expediente.movimientos.exists()
+
+    @pytest.mark.django_db(transaction=True, databases=["default", BASE_PROGRESO])
+    def test_todo_o_nada_muestra_el_progreso_antes_del_commit(
+        self,
+        settings,
+        monkeypatch,
+    ):
+        settings.CASOS_IMPORTACION_COMMIT_CADA = 0
+        job = ImportJobFactory(
+            tipo=ImportJob.Tipo.MOVIMIENTOS,
+            expediente=ExpedienteSipedFactory(expediente="1/2025"),
+            archivo=ContentFile(
+                b"expediente,nombre_escrito,tipo\n1/2025,E-1,A\n1/2025,E-2,B\n",
+                name="movimientos.csv",
+            ),
+        )
+        vistos = []
+
+        def importar_y_mirar(*args, **kwargs):
+            resultado = importar_movimientos(*args, **kwargs)
+            # Todavía dentro de la transacción, desde otra conexión.
+            otra = ImportJob.objects.using(BASE_PROGRESO)
+            vistos.append(otra.get(pk=job.pk).creados)
+            vistos.append(Movimiento.objects.using(BASE_PROGRESO).count())
+            return resultado
+
+        monkeypatch.setattr(tasks, "importar_movimientos", importar_y_mirar)
+
+        procesar_importacion(job.pk)
+
+        # El progreso ya se veía; los movimientos todavía no.
+        assert vistos == [2, 0]
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert job.creados == 2  # noqa: PLR2004
+
+    def test_retoma_importacion_interrumpida(self):
+        job = self.movimientos_job(
+            estado=ImportJob.Estado.EN_PROCESO,
+            ultima_fila_confirmada=2,
+            creados=1,
+            filas_con_error=1,
+        )
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert (job.creados, job.filas_con_error) == (2, 1)
+        assert list(
+            job.expediente.movimientos.values_list("nombre_escrito", flat=True),
+        ) == ["E-3"]
+
+    def test_movimientos_global_zip(self):
+        ExpedienteSipedFactory(expediente="1/2025")
+        ExpedienteSipedFactory(expediente="2/2025")
+        contenido = io.BytesIO()
+        with zipfile.ZipFile(contenido, "w") as zip_file:
+            zip_file.writestr(
+                "a.csv",
+                "expediente,nombre_escrito,tipo\n1/2025,E-1,A\n2/2025,E-1,B\n",
+            )
+            zip_file.writestr(
+                "b.csv",
+                "expediente,nombre_escrito,tipo\n2/2025,E-2,C\n3/2025,E-3,D\n",
+            )
+        job = ImportJobFactory(
+            tipo=ImportJob.Tipo.MOVIMIENTOS_GLOBAL,
+            archivo=ContentFile(contenido.getvalue(), name="movimientos.zip"),
+        )
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert (job.creados, job.filas_con_error) == (3, 1)
+        assert job.errores == [{"fila": 4, "error": "Expediente inexistente: 3/2025"}]
+        assert Movimiento.objects.count() == 3  # noqa: PLR2004
+
+    def test_no_reprocesa(self):
+        job = ImportJobFactory(estado=ImportJob.Estado.COMPLETADO)
+
+        procesar_importacion(job.pk)
+
+        job.refresh_from_db()
+        assert job.fecha_inicio is None
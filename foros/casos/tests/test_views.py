@@ -0,0 +1,574 @@
+import csv
+import io
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+from foros.casos.importers import importar_expedientes
+from foros.casos.models import ExpedienteSiped
+from foros.casos.models import ImportJob
+from foros.casos.models import Tarea
+from foros.casos.tests.factories import CasoFactory
+from foros.casos.tests.factories import ExpedienteSipedFactory
+from foros.casos.tests.factories import ImportJobFactory
+from foros.casos.tests.factories import MovimientoFactory
+from foros.casos.tests.factories import TareaFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCasoListView:
+    def test_muestra_relaciones(self, client, user):
+        caso = CasoFactory(expediente=None, responsable=None)
+        client.force_login(user)
+
+        response = client.get(reverse("casos:caso_list"))
+
+        assert response.status_code == 200  # noqa: PLR2004
+        assert caso.cliente.nombre_razon_social in response.text
+        assert "N/A" in response.text
+
+    def test_consultas_constantes(self, client, user, django_assert_num_queries):
+        CasoFactory.create_batch(30)
+        client.force_login(user)
+
+        # Sesión, usuario, conteo del paginador y la página, más el savepoint
+        # de ATOMIC_REQUESTS. No depende de cuántos casos tenga la página.
+        with django_assert_num_queries(6):
+            response = client.get(reverse("casos:caso_list"))
+        with django_assert_num_queries(6):
+            client.get(reverse("casos:caso_list"), {"page": 2})
+
+        assert len(response.context["casos"]) == 25  # noqa: PLR2004
+
+
+class TestTareaTableroView:
+    def test_separa_vencidas_y_excluye_realizadas(self, client, user):
+        hoy = timezone.localdate()
+        vencida = TareaFactory(responsable=user, fecha_limite=hoy - timedelta(days=1))
+        manana = TareaFactory(responsable=user, fecha_limite=hoy + timedelta(days=1))
+        sin_fecha = TareaFactory(responsable=user, fecha_limite=None)
+        TareaFactory(
+            responsable=user,
+            fecha_limite=hoy - timedelta(days=3),
+            estado=Tarea.Estado.REALIZADA,
+        )
+        TareaFactory(fecha_limite=hoy)
+        client.force_login(user)
+
+        response = client.get(reverse("casos:tarea_tablero"))
+
+        assert response.status_code == 200  # noqa: PLR2004
+        assert list(response.context["vencidas"]) == [vencida]
+        assert list(response.context["por_vencer"]) == [manana, sin_fecha]
+        assert response.context["conteos"] == {
+            "total": 3,
+            "vencidas": 1,
+            "hoy": 0,
+            "proximas": 1,
+        }
+
+    def test_consultas_constantes(self, client, user, django_assert_num_queries):
+        TareaFactory.create_batch(10, responsable=user, fecha_limite=None)
+        client.force_login(user)
+
+        # Sesión, usuario, conteos y las dos listas, más el savepoint de
+        # ATOMIC_REQUESTS.
+        with django_assert_num_queries(7):
+            client.get(reverse("casos:tarea_tablero"))
+
+    def test_staff_ve_las_de_otro_usuario(self, client, admin_user, user):
+        tarea = TareaFactory(responsable=user, fecha_limite=None)
+        client.force_login(admin_user)
+
+        response = client.get(
+            reverse("casos:tarea_tablero"),
+            {"responsable": user.pk},
+        )
+
+        assert response.context["responsable"] == user
+        assert list(response.context["por_vencer"]) == [tarea]
+
+    def test_otros_usuarios_solo_ven_las_propias(self, client, user):
+        otro = TareaFactory(fecha_limite=None)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:tarea_tablero"),
+            {"responsable": otro.responsable.pk},
+        )
+
+        assert response.context["responsable"] == user
+        assert not response.context["por_vencer"]
+
+
+class TestCasoTareasView:
+    def test_json_con_pendientes(self, client, user):
+        caso = CasoFactory()
+        hoy = timezone.localdate()
+        segunda = TareaFactory(caso=caso, fecha_limite=hoy + timedelta(days=2))
+        primera = TareaFactory(caso=caso, fecha_limite=hoy)
+        TareaFactory(caso=caso, estado=Tarea.Estado.REALIZADA)
+        client.force_login(user)
+
+        response = client.get(reverse("casos:caso_tareas", kwargs={"pk": caso.pk}))
+
+        tareas = response.json()["tareas"]
+        assert [tarea["id"] for tarea in tareas] == [primera.pk, segunda.pk]
+        assert tareas[0]["responsable"] == primera.responsable.username
+
+    def test_filas_para_htmx(self, client, user):
+        tarea = TareaFactory()
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:caso_tareas", kwargs={"pk": tarea.caso_id}),
+            headers={"HX-Request": "true"},
+        )
+
+        assert tarea.titulo in response.text
+        assert "Sin fecha" in response.text
+
+
+class TestExpedienteSIPEDListView:
+    def test_pagina_por_cursor(self, client, user, django_assert_num_queries):
+        ExpedienteSipedFactory.create_batch(30)
+        client.force_login(user)
+
+        response = client.get(reverse("casos:expediente_list"))
+        pagina = response.context["pagina"]
+        # Sesión, usuario y página, más el savepoint de ATOMIC_REQUESTS. Sin
+        # OFFSET ni dependencia de la página pedida; el total quedó en la
+        # caché con la primera página.
+        with django_assert_num_queries(5):
+            siguiente = client.get(
+                reverse("casos:expediente_list"),
+                {"cursor": pagina.siguiente},
+            )
+
+        assert response.context["total_estimado"] == 30  # noqa: PLR2004
+        assert len(pagina) == 25  # noqa: PLR2004
+        assert len(siguiente.context["pagina"]) == 5  # noqa: PLR2004
+        assert siguiente.context["pagina"].siguiente is None
+        assert "Anteriores" in siguiente.text
+
+
+class TestExpedienteSIPEDDetailView:
+    def test_no_carga_movimientos(self, client, user, django_assert_num_queries):
+        expediente = ExpedienteSipedFactory()
+        MovimientoFactory.create_batch(3, expediente=expediente)
+        client.force_login(user)
+        url = reverse("casos:expediente_detail", kwargs={"pk": expediente.pk})
+
+        # Sesión, usuario, si el expediente existe (para crear su versión en la
+        # caché) y el expediente, más el savepoint de ATOMIC_REQUESTS.
+        with django_assert_num_queries(6):
+            response = client.get(url)
+
+        assert (
+            reverse(
+                "casos:expediente_movimientos",
+                kwargs={"pk": expediente.pk},
+            )
+            in response.text
+        )
+
+
+class TestExpedienteMovimientosView:
+    def test_json_por_paginas(self, client, user):
+        expediente = ExpedienteSipedFactory()
+        MovimientoFactory.create_batch(30, expediente=expediente)
+        MovimientoFactory()
+        client.force_login(user)
+        url = reverse("casos:expediente_movimientos", kwargs={"pk": expediente.pk})
+
+        primera = client.get(url).json()
+        segunda = client.get(url, {"cursor": primera["siguiente"]}).json()
+
+        assert len(primera["movimientos"]) == 25  # noqa: PLR2004
+        assert len(segunda["movimientos"]) == 5  # noqa: PLR2004
+        assert segunda["siguiente"] is None
+        assert "descripcion" not in primera["movimientos"][0]
+        vistos = {m["id"] for m in primera["movimientos"] + segunda["movimientos"]}
+        assert vistos == set(expediente.movimientos.values_list("pk", flat=True))
+
+    def test_difiere_descripcion(self, client, user):
+        expediente = ExpedienteSipedFactory()
+        MovimientoFactory.create_batch(2, expediente=expediente)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:expediente_movimientos", kwargs={"pk": expediente.pk}),
+            headers={"HX-Request": "true"},
+        )
+
+        movimientos = response.context["movimientos"]
+        assert all(
+            "descripcion" in movimiento.get_deferred_fields()
+            for movimiento in movimientos
+        )
+
+    def test_fragmento_htmx(self, client, user):
+        expediente = ExpedienteSipedFactory()
+        MovimientoFactory.create_batch(26, expediente=expediente)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:expediente_movimientos", kwargs={"pk": expediente.pk}),
+            headers={"HX-Request": "true"},
+        )
+
+        assert response.templates[0].name == "casos/partials/movimientos_pagina.html"
+        assert response.text.count("Ver descripción") == 25  # noqa: PLR2004
+        assert "Cargar más movimientos" in response.text
+
+    def test_sin_movimientos(self, client, user):
+        expediente = ExpedienteSipedFactory()
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:expediente_movimientos", kwargs={"pk": expediente.pk}),
+            headers={"HX-Request": "true"},
+        )
+
+        assert "No hay movimientos registrados." in response.text
+
+    def test_expediente_inexistente(self, client, user):
+        expediente = ExpedienteSipedFactory()
+        pk = expediente.pk
+        expediente.delete()
+        client.force_login(user)
+        url = reverse("casos:expediente_movimientos", kwargs={"pk": pk})
+
+        response = client.get(url)
+
+        assert response.status_code == 404  # noqa: PLR2004
+        # El 404 no quedó en la caché.
+        ExpedienteSipedFactory(pk=pk)
+        assert client.get(url).json()["movimientos"] == []
+
+
+class TestMovimientoDescripcionView:
+    def test_json(self, client, user):
+        movimiento = MovimientoFactory(descripcion="Téngase presente")
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:movimiento_descripcion", kwargs={"pk": movimiento.pk}),
+        )
+
+        assert response.json() == {
+            "id": movimiento.pk,
+            "descripcion": "Téngase presente",
+        }
+
+    def test_fragmento_htmx(self, client, user):
+        movimiento = MovimientoFactory(descripcion="Téngase presente")
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:movimiento_descripcion", kwargs={"pk": movimiento.pk}),
+            headers={"HX-Request": "true"},
+        )
+
+        assert "Téngase presente" in response.text
+
+
+class TestBusquedaView:
+    def test_busca_expedientes_y_movimientos(self, client, user):
+        expediente = ExpedienteSipedFactory(caratula="PEREZ C/ GOMEZ")
+        MovimientoFactory(descripcion="Notifíquese a Perez & Cia")
+        client.force_login(user)
+
+        response = client.get(reverse("casos:buscar"), {"q": "perez"})
+
+        assert list(response.context["expedientes"]) == [expediente]
+        assert len(response.context["movimientos"]) == 1
+        assert "<mark>Perez</mark> &amp; Cia" in response.text
+
+    def test_sin_texto(self, client, user):
+        client.force_login(user)
+
+        response = client.get(reverse("casos:buscar"))
+
+        assert "expedientes" not in response.context
+
+
+class TestExpedienteUploadView:
+    def test_encola_importacion(
+        self,
+        client,
+        user,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        client.force_login(user)
+        archivo = SimpleUploadedFile(
+            "expedientes_completos.csv",
+            (
+                "\ufeffexpediente,caratula,estado,fec_ult_mov\n"
+                "1/2025,PEREZ C/ GOMEZ,A DESPACHO,01/02/2025\n"
+                "2/2025,LOPEZ S/ SUCESION,PUBLICADO,\n"
+            ).encode(),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                reverse("casos:expediente_import"),
+                {"archivo_csv": archivo},
+            )
+
+        job = ImportJob.objects.get()
+        assert response.status_code == 302  # noqa: PLR2004
+        assert response.url == job.get_absolute_url()
+        assert job.creado_por == user
+        assert not job.completa
+        job.refresh_from_db()
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert (job.creados, job.actualizados) == (2, 0)
+        assert ExpedienteSiped.objects.count() == 2  # noqa: PLR2004
+
+    def test_importacion_completa(self, client, user):
+        client.force_login(user)
+        archivo = SimpleUploadedFile("expedientes.csv", b"expediente\n1/2025\n")
+
+        client.post(
+            reverse("casos:expediente_import"),
+            {"archivo_csv": archivo, "completa": "on"},
+        )
+
+        assert ImportJob.objects.get().completa
+
+    def test_rechaza_otras_extensiones(self, client, user):
+        client.force_login(user)
+        archivo = SimpleUploadedFile("expedientes.txt", b"expediente\n1/2025\n")
+
+        response = client.post(
+            reverse("casos:expediente_import"),
+            {"archivo_csv": archivo},
+        )
+
+        assert response.status_code == 200  # noqa: PLR2004
+        assert not ImportJob.objects.exists()
+
+
+class TestMovimientoExpedienteUploadView:
+    def test_importa_csv_con_lineas_cortadas(
+        self,
+        client,
+        user,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        expediente = ExpedienteSipedFactory(expediente="1/2025")
+        client.force_login(user)
+        archivo = SimpleUploadedFile(
+            "movimientos.csv",
+            (
+                "expediente,nombre_escrito,fecha_presentacion,tipo,descripcion\n"
+                "1/2025,E-1,01/02/2025 10:00,ESCRITO,Solicita\n"
+                "se provea\n"
+                "1/2025,E-2,02/02/2025,ESTESE,Téngase presente\n"
+            ).encode("latin-1"),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(
+                reverse(
+                    "casos:movimiento_expediente_import",
+                    kwargs={"pk": expediente.pk},
+                ),
+                {"archivo_csv": archivo},
+            )
+
+        job = ImportJob.objects.get(expediente=expediente)
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert expediente.movimientos.get(nombre_escrito="E-1").descripcion == (
+            "Solicita se provea"
+        )
+        assert expediente.movimientos.count() == 2  # noqa: PLR2004
+
+
+class TestMovimientoUploadView:
+    def test_importa_varios_expedientes(
+        self,
+        client,
+        user,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        uno = ExpedienteSipedFactory(expediente="1/2025")
+        dos = ExpedienteSipedFactory(expediente="2/2025")
+        client.force_login(user)
+        archivo = SimpleUploadedFile(
+            "movimientos.csv",
+            (
+                b"expediente,nombre_escrito,tipo\n"
+                b"1/2025,E-1,ESCRITO\n"
+                b"2/2025,E-1,ESCRITO\n"
+            ),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(reverse("casos:movimiento_import"), {"archivo_csv": archivo})
+
+        job = ImportJob.objects.get()
+        assert job.tipo == ImportJob.Tipo.MOVIMIENTOS_GLOBAL
+        assert job.estado == ImportJob.Estado.COMPLETADO
+        assert uno.movimientos.count() == dos.movimientos.count() == 1
+
+    def test_rechaza_zip_invalido(self, client, user):
+        client.force_login(user)
+        archivo = SimpleUploadedFile("movimientos.zip", b"no es un zip")
+
+        response = client.post(
+            reverse("casos:movimiento_import"),
+            {"archivo_csv": archivo},
+        )
+
+        assert response.status_code == 200  # noqa: PLR2004
+        assert not ImportJob.objects.exists()
+
+
+class TestImportJobEstadoView:
+    def test_json(self, client, user):
+        job = ImportJobFactory(filas_procesadas=10, creados=7, actualizados=3)
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:importacion_estado", kwargs={"pk": job.pk}),
+        )
+
+        datos = response.json()
+        assert datos["estado"] == ImportJob.Estado.PENDIENTE
+        assert datos["terminado"] is False
+        assert (datos["creados"], datos["actualizados"]) == (7, 3)
+
+    def test_fragmento_htmx(self, client, user):
+        job = ImportJobFactory()
+        client.force_login(user)
+
+        response = client.get(
+            reverse("casos:importacion_estado", kwargs={"pk": job.pk}),
+            headers={"HX-Request": "true"},
+        )
+
+        assert response.templates[0].name == "casos/partials/importjob_progreso.html"
+        assert b'hx-trigger="every 2s"' in response.content
+
+
+def contenido_csv(response):
+    assert response.streaming
+    texto = b"".join(response.streaming_content).decode("utf-8")
+    assert texto.startswith("\ufeff")
+    return list(csv.DictReader(io.StringIO(texto.removeprefix("\ufeff"))))
+
+
+class TestExportaciones:
+    def test_expedientes_se_pueden_volver_a_importar(self, client, user):
+        expediente = ExpedienteSipedFactory(
+            expediente="7/2025",
+            caratula='PEREZ C/ "GOMEZ", JUAN',
+            partes=3,
+            fec_ult_mov=date(2025, 3, 5),
+        )
+        client.force_login(user)
+
+        response = client.get(reverse("casos:expediente_export"))
+        filas = contenido_csv(response)
+        ExpedienteSiped.objects.all().delete()
+        importar_expedientes(filas)
+
+        assert filas[0]["fec_ult_mov"] == "05/03/2025"
+        importado = ExpedienteSiped.objects.get()
+        assert importado.caratula == expediente.caratula
+        assert importado.partes == expediente.partes
+        assert importado.fec_ult_mov == expediente.fec_ult_mov
+
+    def test_movimientos_de_un_expediente(
+        self,
+        client,
+        user,
+        django_assert_num_queries,
+    ):
+        expediente = ExpedienteSipedFactory(expediente="7/2025")
+        presentacion = datetime(
+            2025,
+            2,
+            1,
+            10,
+            30,
+            tzinfo=timezone.get_current_timezone(),
+        )
+        MovimientoFactory(
+            expediente=expediente,
+            nombre_escrito="E-1",
+            fecha_presentacion=presentacion,
+        )
+        MovimientoFactory(expediente=expediente, fecha_presentacion=None)
+        MovimientoFactory()
+        client.force_login(user)
+
+        # Sesión, usuario y expediente; las filas se leen al enviar.
+        with django_assert_num_queries(3):
+            response = client.get(
+                reverse("casos:movimiento_expediente_export", args=[expediente.pk]),
+            )
+        # Una sola consulta, dentro de su propio bloque atómico.
+        with django_assert_num_queries(3):
+            filas = contenido_csv(response)
+
+        assert "movimientos_7-2025.csv" in response["Content-Disposition"]
+        assert [fila["expediente"] for fila in filas] == ["7/2025", "7/2025"]
+        assert filas[0]["nombre_escrito"] == "E-1"
+        assert filas[0]["fecha_presentacion"] == "01/02/2025 10:30:00"
+        assert filas[1]["fecha_presentacion"] == ""
+
+    def test_tareas_propias_si_no_es_staff(self, client, user):
+        propia = TareaFactory(responsable=user)
+        TareaFactory()
+        client.force_login(user)
+
+        filas = contenido_csv(client.get(reverse("casos:tarea_export")))
+
+        assert [fila["id"] for fila in filas] == [str(propia.pk)]
+        assert filas[0]["caso"] == propia.caso.titulo_interno
+
+    def test_tareas_de_un_responsable_para_staff(self, admin_client, user):
+        TareaFactory.create_batch(2, responsable=user)
+        TareaFactory()
+
+        todas = contenido_csv(admin_client.get(reverse("casos:tarea_export")))
+        de_user = contenido_csv(
+            admin_client.get(reverse("casos:tarea_export"), {"responsable": user.pk}),
+        )
+
+        assert len(todas) == 3  # noqa: PLR2004
+        assert len(de_user) == 2  # noqa: PLR2004
+
+    def test_casos(self, client, user):
+        caso = CasoFactory(expediente=None)
+        client.force_login(user)
+
+        filas = contenido_csv(client.get(reverse("casos:caso_export")))
+
+        assert filas == [
+            {
+                "id": str(caso.pk),
+                "titulo_interno": caso.titulo_interno,
+                "naturaleza": caso.naturaleza,
+                "fecha_ingreso": f"{caso.fecha_ingreso:%d/%m/%Y}",
+                "cliente": caso.cliente.nombre_razon_social,
+                "cuit_cuil": caso.cliente.cuit_cuil or "",
+                "expediente": "",
+                "responsable": caso.responsable.username,
+            },
+        ]
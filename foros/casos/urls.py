@@ -1,21 +1,71 @@
 from django.urls import path
 
+from .views import BusquedaView
+from .views import CasoExportView
 from .views import CasoListView
+from .views import CasoTareasView
+from .views import ExpedienteExportView
+from .views import ExpedienteMovimientosView
 from .views import ExpedienteSIPEDDetailView
 from .views import ExpedienteSIPEDListView
 from .views import ExpedienteUploadView
+from .views import ImportJobDetailView
+from .views import ImportJobEstadoView
+from .views import MovimientoDescripcionView
+from .views import MovimientoExpedienteExportView
 from .views import MovimientoExpedienteUploadView
+from .views import MovimientoExportView
+from .views import MovimientoUploadView
+from .views import TareaExportView
+from .views import TareaTableroView
 
 app_name = "casos"
 
 urlpatterns = [
     path("internos/", CasoListView.as_view(), name="caso_list"),
+    # Tareas pendientes (JSON o filas para htmx)
+    path(
+        "internos/<int:pk>/tareas/",
+        CasoTareasView.as_view(),
+        name="caso_tareas",
+    ),
+    path("tareas/", TareaTableroView.as_view(), name="tarea_tablero"),
+    # Exportaciones en CSV
+    path("internos/exportar/", CasoExportView.as_view(), name="caso_export"),
+    path("tareas/exportar/", TareaExportView.as_view(), name="tarea_export"),
+    path(
+        "externos/exportar/",
+        ExpedienteExportView.as_view(),
+        name="expediente_export",
+    ),
+    path(
+        "externos/<int:pk>/movimientos/exportar/",
+        MovimientoExpedienteExportView.as_view(),
+        name="movimiento_expediente_export",
+    ),
+    path(
+        "externos/movimientos/exportar/",
+        MovimientoExportView.as_view(),
+        name="movimiento_export",
+    ),
     path("externos/", ExpedienteSIPEDListView.as_view(), name="expediente_list"),
+    path("buscar/", BusquedaView.as_view(), name="buscar"),
     path(
         "externos/<int:pk>/",
         ExpedienteSIPEDDetailView.as_view(),
         name="expediente_detail",
     ),
+    # Historial de movimientos, por páginas (JSON o filas para htmx)
+    path(
+        "externos/<int:pk>/movimientos/",
+        ExpedienteMovimientosView.as_view(),
+        name="expediente_movimientos",
+    ),
+    path(
+        "externos/movimientos/<int:pk>/descripcion/",
+        MovimientoDescripcionView.as_view(),
+        name="movimiento_descripcion",
+    ),
     # Carga de Expedientes (Lista Maestra)
     path(
         "externos/importar/",
@@ -28,4 +78,21 @@ urlpatterns = [
         MovimientoExpedienteUploadView.as_view(),
         name="movimiento_expediente_import",
     ),
+    # Carga de Movimientos (varios Expedientes en un CSV o ZIP)
+    path(
+        "externos/movimientos/importar/",
+        MovimientoUploadView.as_view(),
+        name="movimiento_import",
+    ),
+    # Progreso de las importaciones en segundo plano
+    path(
+        "importaciones/<int:pk>/",
+        ImportJobDetailView.as_view(),
+        name="importacion_detail",
+    ),
+    path(
+        "importaciones/<int:pk>/estado/",
+        ImportJobEstadoView.as_view(),
+        name="importacion_estado",
+    ),
 ]
@@ -1,26 +1,54 @@
-import contextlib
-import csv
-import io
 import logging
-import re
-from datetime import datetime
+import zipfile
+from functools import partial
 
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import transaction
+from django.http import Http404
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django.urls import reverse_lazy
-from django.utils.timezone import make_aware
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.generic import DetailView
 from django.views.generic import FormView
 from django.views.generic import ListView
-
+from django.views.generic import TemplateView
+from django.views.generic import View
+
+from .busqueda import buscar_expedientes
+from .busqueda import buscar_movimientos
+from .busqueda import resaltar
+from .cache import cacheado
+from .cache import version_expediente
+from .cache import version_listado
+from .exportar import COLUMNAS_CASOS
+from .exportar import COLUMNAS_EXPEDIENTES
+from .exportar import COLUMNAS_MOVIMIENTOS
+from .exportar import COLUMNAS_TAREAS
+from .exportar import respuesta_csv
 from .forms import ExpedienteUploadForm
+from .forms import MovimientoGlobalUploadForm
 from .forms import MovimientoUploadForm
 from .models import Caso
 from .models import ExpedienteSiped
+from .models import ImportJob
 from .models import Movimiento
+from .models import Tarea
+from .paginacion import codificar_cursor
+from .paginacion import contar_estimado
+from .paginacion import decodificar_cursor
+from .paginacion import ordenar_keyset
+from .paginacion import paginar_keyset
+from .tareas import LIMITE_TABLERO
+from .tareas import conteos
+from .tareas import pendientes_de
+from .tareas import pendientes_del_caso
+from .tareas import por_vencer
+from .tareas import vencidas
+from .tasks import procesar_importacion
 
 logger = logging.getLogger(__name__)
 
@@ -30,33 +58,373 @@ class CasoListView(LoginRequiredMixin, ListView):
     template_name = "casos/caso_list.html"
     context_object_name = "casos"
     paginate_by = 25
+    ordering = ["-fecha_ingreso", "-pk"]
+
+    def get_queryset(self):
+        # Una sola consulta por página: se unen las relaciones que muestra el
+        # listado y se traen solo las columnas que usa la plantilla.
+        return (
+            super()
+            .get_queryset()
+            .select_related("cliente", "responsable", "expediente")
+            .only(
+                "titulo_interno",
+                "naturaleza",
+                "fecha_ingreso",
+                "cliente__nombre_razon_social",
+                "responsable__username",
+                "expediente__expediente",
+            )
+        )
+
 
+class PaginacionKeysetMixin:
+    """
+    Pagina por clave (paginacion.paginar_keyset) con el cursor del parámetro
+    ?cursor=, en lugar de OFFSET y COUNT(*) como hace paginate_by.
+    """
 
-class ExpedienteSIPEDListView(LoginRequiredMixin, ListView):
+    campo_keyset = None
+    tamanio_pagina = 25
+
+    def cursor_normalizado(self, queryset):
+        """
+        El ?cursor= decodificado y vuelto a codificar, o "" si falta o no es
+        válido (paginar_keyset muestra entonces la primera página). Es lo que
+        va en la clave de la caché, así un texto cualquiera no crea entradas.
+        """
+        cursor = self.request.GET.get("cursor")
+        campo = queryset.model._meta.get_field(self.campo_keyset)  # noqa: SLF001
+        posicion = decodificar_cursor(cursor, campo) if cursor else None
+        return codificar_cursor(*posicion) if posicion else ""
+
+    def paginar(self, queryset):
+        return paginar_keyset(
+            queryset,
+            self.campo_keyset,
+            self.request.GET.get("cursor"),
+            self.tamanio_pagina,
+        )
+
+
+class ExpedienteSIPEDListView(LoginRequiredMixin, PaginacionKeysetMixin, ListView):
     model = ExpedienteSiped
     template_name = "casos/expediente_siped_list.html"
     context_object_name = "expedientes"
-    paginate_by = 25
-    ordering = ["-fec_ult_mov"]
+    campo_keyset = "fec_ult_mov"
+
+    def get_context_data(self, **kwargs):
+        # La página y el total se guardan en la caché hasta que una
+        # importación cambie algún expediente (ver cache.py).
+        version = version_listado()
+        pagina = cacheado(
+            "casos:listado:pagina",
+            version,
+            partial(self.paginar, self.object_list),
+            self.cursor_normalizado(self.object_list),
+        )
+        context = super().get_context_data(object_list=pagina, **kwargs)
+        context["pagina"] = pagina
+        context["total_estimado"] = cacheado(
+            "casos:listado:total",
+            version,
+            partial(contar_estimado, self.object_list),
+        )
+        return context
 
 
 class ExpedienteSIPEDDetailView(LoginRequiredMixin, DetailView):
+    """
+    Cabecera del expediente. El historial de movimientos lo carga la página
+    por partes desde ExpedienteMovimientosView.
+    """
+
     model = ExpedienteSiped
     template_name = "casos/expediente_siped_detail.html"
     context_object_name = "expediente"
 
+    def get_object(self, queryset=None):
+        pk = self.kwargs["pk"]
+        if (version := version_expediente(pk)) is None:
+            raise Http404
+        return cacheado(
+            f"casos:expediente:{pk}",
+            version,
+            partial(super().get_object, queryset),
+        )
+
+
+class ExpedienteMovimientosView(LoginRequiredMixin, PaginacionKeysetMixin, ListView):
+    """
+    Una página del historial de movimientos de un expediente. Devuelve JSON,
+    o las filas de la tabla si lo pide htmx. La descripción, que puede ser
+    larga, se pide aparte con MovimientoDescripcionView.
+    """
+
+    template_name = "casos/partials/movimientos_pagina.html"
+    context_object_name = "movimientos"
+    campo_keyset = "fecha_presentacion"
+
+    def get_queryset(self):
+        return Movimiento.objects.filter(expediente_id=self.kwargs["pk"]).defer(
+            "descripcion",
+        )
+
+    def pagina(self):
+        """
+        La página pedida. Si el expediente no existe es un 404, que no queda en
+        la caché; la consulta solo se hace cuando la página no estaba guardada.
+        """
+        if not ExpedienteSiped.objects.filter(pk=self.kwargs["pk"]).exists():
+            raise Http404
+        return self.paginar(self.object_list)
+
     def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context["movimientos"] = self.object.movimientos.all().order_by(
-            "-fecha_presentacion",
+        pk = self.kwargs["pk"]
+        if (version := version_expediente(pk)) is None:
+            raise Http404
+        pagina = cacheado(
+            f"casos:expediente:{pk}:movimientos",
+            version,
+            self.pagina,
+            self.cursor_normalizado(self.object_list),
         )
+        context = super().get_context_data(object_list=pagina, **kwargs)
+        context["pagina"] = pagina
+        context["expediente_id"] = pk
+        context["es_primera_pagina"] = "cursor" not in self.request.GET
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.headers.get("HX-Request"):
+            return super().render_to_response(context, **response_kwargs)
+        pagina = context["pagina"]
+        return JsonResponse(
+            {
+                "movimientos": [
+                    {
+                        "id": movimiento.pk,
+                        "nombre_escrito": movimiento.nombre_escrito,
+                        "link_escrito": movimiento.link_escrito,
+                        "fecha_presentacion": movimiento.fecha_presentacion,
+                        "tipo": movimiento.tipo,
+                        "estado": movimiento.estado,
+                        "generado_por": movimiento.generado_por,
+                        "fecha_firma": movimiento.fecha_firma,
+                        "fecha_publicacion": movimiento.fecha_publicacion,
+                        "descripcion_url": reverse(
+                            "casos:movimiento_descripcion",
+                            kwargs={"pk": movimiento.pk},
+                        ),
+                    }
+                    for movimiento in pagina
+                ],
+                "siguiente": pagina.siguiente,
+                "anterior": pagina.anterior,
+            },
+        )
+
+
+class MovimientoDescripcionView(LoginRequiredMixin, DetailView):
+    """
+    Descripción completa de un movimiento, para cuando se despliega su fila.
+    Devuelve JSON, o el fragmento HTML si lo pide htmx.
+    """
+
+    queryset = Movimiento.objects.only("descripcion")
+    template_name = "casos/partials/movimiento_descripcion.html"
+    context_object_name = "movimiento"
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.headers.get("HX-Request"):
+            return super().render_to_response(context, **response_kwargs)
+        return JsonResponse(
+            {"id": self.object.pk, "descripcion": self.object.descripcion},
+        )
+
+
+class BusquedaView(LoginRequiredMixin, TemplateView):
+    """Búsqueda de texto completo en expedientes y movimientos (?q=)."""
+
+    template_name = "casos/busqueda.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        texto = self.request.GET.get("q", "").strip()
+        context["q"] = texto
+        if texto:
+            context["expedientes"] = buscar_expedientes(texto)
+            context["movimientos"] = movimientos = list(buscar_movimientos(texto))
+            for movimiento in movimientos:
+                movimiento.fragmento = resaltar(movimiento.fragmento)
+        return context
+
+
+class TareaTableroView(LoginRequiredMixin, TemplateView):
+    """
+    Tablero de tareas pendientes de un usuario: las vencidas y las que
+    siguen por fecha límite. Muestra las propias; el staff puede ver las de
+    otro usuario con ?responsable=<id>.
+    """
+
+    template_name = "casos/tarea_tablero.html"
+
+    def get_responsable(self):
+        responsable_id = self.request.GET.get("responsable", "")
+        if self.request.user.is_staff and responsable_id.isdigit():
+            return get_object_or_404(get_user_model(), pk=responsable_id)
+        return self.request.user
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        hoy = timezone.localdate()
+        responsable = self.get_responsable()
+        tareas = pendientes_de(responsable)
+        context["responsable"] = responsable
+        context["hoy"] = hoy
+        context["conteos"] = conteos(tareas, hoy)
+        context["vencidas"] = vencidas(tareas, hoy)[:LIMITE_TABLERO]
+        context["por_vencer"] = por_vencer(tareas, hoy)[:LIMITE_TABLERO]
+        return context
+
+
+class CasoTareasView(LoginRequiredMixin, ListView):
+    """
+    Tareas pendientes de un caso, por fecha límite. Devuelve JSON, o las
+    filas de la tabla si lo pide htmx.
+    """
+
+    template_name = "casos/partials/tareas_caso.html"
+    context_object_name = "tareas"
+
+    def get_queryset(self):
+        return pendientes_del_caso(self.kwargs["pk"])
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.headers.get("HX-Request"):
+            return super().render_to_response(context, **response_kwargs)
+        return JsonResponse(
+            {
+                "tareas": [
+                    {
+                        "id": tarea.pk,
+                        "titulo": tarea.titulo,
+                        "estado": tarea.estado,
+                        "fecha_inicio": tarea.fecha_inicio,
+                        "fecha_limite": tarea.fecha_limite,
+                        "responsable": (
+                            tarea.responsable.username if tarea.responsable else None
+                        ),
+                    }
+                    for tarea in context["tareas"]
+                ],
+            },
+        )
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ExportacionView(LoginRequiredMixin, View):
+    """
+    Descarga en CSV de `queryset` (o de get_queryset()) con las `columnas` de
+    exportar.py, generada a medida que se envía.
+    """
+
+    queryset = None
+    columnas = None
+    nombre_archivo = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_nombre_archivo(self):
+        return self.nombre_archivo
 
-class ExpedienteUploadView(LoginRequiredMixin, FormView):
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        return respuesta_csv(self.get_nombre_archivo(), queryset, self.columnas)
+
+
+class ExpedienteExportView(ExportacionView):
+    queryset = ExpedienteSiped.objects.order_by("pk")
+    columnas = COLUMNAS_EXPEDIENTES
+    nombre_archivo = "expedientes_completos.csv"
+
+
+class MovimientoExpedienteExportView(ExportacionView):
+    # En el orden del historial, que sale del índice del expediente.
+    queryset = ordenar_keyset(Movimiento.objects.all(), "fecha_presentacion")
+    columnas = COLUMNAS_MOVIMIENTOS
+
+    def get_queryset(self):
+        self.expediente = get_object_or_404(ExpedienteSiped, pk=self.kwargs["pk"])
+        return super().get_queryset().filter(expediente=self.expediente)
+
+    def get_nombre_archivo(self):
+        numero = self.expediente.expediente.replace("/", "-")
+        return f"movimientos_{numero}.csv"
+
+
+class MovimientoExportView(ExportacionView):
+    queryset = Movimiento.objects.order_by("pk")
+    columnas = COLUMNAS_MOVIMIENTOS
+    nombre_archivo = "movimientos.csv"
+
+
+class CasoExportView(ExportacionView):
+    queryset = Caso.objects.order_by("pk")
+    columnas = COLUMNAS_CASOS
+    nombre_archivo = "casos.csv"
+
+
+class TareaExportView(ExportacionView):
+    """
+    Todas las tareas, o las de un usuario con ?responsable=<id>. Quien no es
+    staff exporta solo las propias.
+    """
+
+    queryset = Tarea.objects.order_by("pk")
+    columnas = COLUMNAS_TAREAS
+    nombre_archivo = "tareas.csv"
+
+    def get_queryset(self):
+        tareas = super().get_queryset()
+        if not self.request.user.is_staff:
+            return tareas.filter(responsable=self.request.user)
+        responsable_id = self.request.GET.get("responsable", "")
+        if responsable_id.isdigit():
+            return tareas.filter(responsable_id=responsable_id)
+        return tareas
+
+
+class ImportacionMixin:
+    """
+    Guarda el archivo subido como un ImportJob y encola su procesamiento en
+    Celery cuando se confirma la transacción del request. Redirige a la
+    página de progreso de la importación.
+    """
+
+    import_job = None
+
+    def encolar_importacion(self, form, **kwargs):
+        self.import_job = ImportJob.objects.create(
+            creado_por=self.request.user,
+            completa=form.cleaned_data["completa"],
+            **kwargs,
+        )
+        job_id = self.import_job.pk
+        transaction.on_commit(lambda: procesar_importacion.delay(job_id))
+        messages.info(
+            self.request,
+            f"Importación #{job_id} en cola. Esta página se actualiza con el progreso.",
+        )
+
+    def get_success_url(self):
+        return self.import_job.get_absolute_url()
+
+
+class ExpedienteUploadView(LoginRequiredMixin, ImportacionMixin, FormView):
     template_name = "casos/expediente_upload.html"
     form_class = ExpedienteUploadForm
-    success_url = reverse_lazy("casos:expediente_list")
 
     def form_valid(self, form):
         csv_file = form.cleaned_data["archivo_csv"]
@@ -65,76 +433,18 @@ class ExpedienteUploadView(LoginRequiredMixin, FormView):
             messages.error(self.request, "El archivo debe tener extensión .csv")
             return self.form_invalid(form)
 
-        try:
-            content = csv_file.read()
-            try:
-                data_set = content.decode("utf-8-sig")  # Soporte BOM
-            except UnicodeDecodeError:
-                data_set = content.decode("latin-1")
-
-            io_string = io.StringIO(data_set)
-            reader = csv.DictReader(io_string)
-
-            creados = 0
-            actualizados = 0
-
-            for row in reader:
-                expediente_nro = row.get("expediente", "").strip()
-                if not expediente_nro:
-                    continue
-
-                fec_ult_mov = None
-                fecha_str = row.get("fec_ult_mov", "")
-                if fecha_str:
-                    with contextlib.suppress(ValueError):
-                        fec_ult_mov = datetime.strptime(  # noqa: DTZ007
-                            fecha_str,
-                            "%d/%m/%Y",
-                        ).date()
-
-                partes = None
-                partes_str = row.get("partes", "")
-                if partes_str and partes_str.isdigit():
-                    partes = int(partes_str)
-
-                _, created = ExpedienteSiped.objects.update_or_create(
-                    expediente=expediente_nro,
-                    defaults={
-                        "caratula": row.get("caratula", "")[:500],
-                        "dependencia": row.get("dependencia", "")[:255],
-                        "estado": row.get("estado", "")[:100],
-                        "fec_ult_mov": fec_ult_mov,
-                        "link_detalle": row.get("link_detalle", "")[:500],
-                        "localidad": row.get("localidad", "")[:100],
-                        "secretaria": row.get("secretaria", "")[:100],
-                        "partes": partes,
-                    },
-                )
-
-                if created:
-                    creados += 1
-                else:
-                    actualizados += 1
-
-            messages.success(
-                self.request,
-                f"Importación exitosa: {creados} creados, {actualizados} actualizados.",
-            )
-
-        except Exception as e:  # noqa: BLE001
-            messages.error(self.request, f"Error procesando el archivo: {e}")
-            return self.form_invalid(form)
-
+        self.encolar_importacion(
+            form,
+            tipo=ImportJob.Tipo.EXPEDIENTES,
+            archivo=csv_file,
+        )
         return super().form_valid(form)
 
 
-class MovimientoExpedienteUploadView(LoginRequiredMixin, FormView):
+class MovimientoExpedienteUploadView(LoginRequiredMixin, ImportacionMixin, FormView):
     template_name = "casos/movimiento_upload.html"
     form_class = MovimientoUploadForm
 
-    def get_success_url(self):
-        return reverse("casos:expediente_detail", kwargs={"pk": self.kwargs["pk"]})
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         expediente = get_object_or_404(ExpedienteSiped, pk=self.kwargs["pk"])
@@ -145,69 +455,6 @@ class MovimientoExpedienteUploadView(LoginRequiredMixin, FormView):
         )
         return context
 
-    def parse_datetime(self, date_str):
-        if not date_str:
-            return None
-        # Limpiar espacios múltiples
-        date_str = " ".join(date_str.split())
-        if not date_str:
-            return None
-
-        formatos = [
-            "%d/%m/%Y %H:%M:%S",
-            "%d/%m/%Y %H:%M",
-            "%d/%m/%Y",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d",
-        ]
-        for fmt in formatos:
-            try:
-                dt = datetime.strptime(date_str, fmt)  # noqa: DTZ007
-                return make_aware(dt)
-            except ValueError:
-                continue
-        return None
-
-    def reparar_csv_en_memoria(self, content_str):
-        """
-        Une líneas que fueron cortadas incorrectamente en el CSV original.
-        Si una línea no empieza con el patrón de expediente (N/N,),
-        se anexa a la anterior.
-        """
-        lines = content_str.splitlines()
-        if not lines:
-            return io.StringIO("")
-
-        fixed_lines = []
-        # Patrón: Inicio de línea + dígitos + / + dígitos + ,
-        exp_pattern = re.compile(r"^\d+/\d+,")
-
-        # Siempre conservamos el encabezado
-        if len(lines) > 0:
-            fixed_lines.append(lines[0])
-
-        current_line = ""
-
-        for raw_line in lines[1:]:
-            line = raw_line.strip()
-            if not line:
-                continue
-
-            if exp_pattern.match(line):
-                # Es una línea nueva válida
-                if current_line:
-                    fixed_lines.append(current_line)
-                current_line = line
-            else:
-                # Es continuación de la línea anterior rota
-                current_line += " " + line
-
-        # Agregar la última línea pendiente
-        if current_line:
-            fixed_lines.append(current_line)
-
-        return io.StringIO("\n".join(fixed_lines))
-
     def form_valid(self, form):
         csv_file = form.cleaned_data["archivo_csv"]
         expediente = get_object_or_404(ExpedienteSiped, pk=self.kwargs["pk"])
@@ -216,73 +463,93 @@ class MovimientoExpedienteUploadView(LoginRequiredMixin, FormView):
             messages.error(self.request, "El archivo debe ser un CSV.")
             return self.form_invalid(form)
 
-        creados = 0
-        actualizados = 0
-
-        try:
-            content = csv_file.read()
-            try:
-                content_str = content.decode("utf-8-sig")
-            except UnicodeDecodeError:
-                content_str = content.decode("latin-1")
-
-            # Reparar líneas rotas antes de parsear
-            io_reparado = self.reparar_csv_en_memoria(content_str)
-            reader = csv.DictReader(io_reparado)
-
-            with transaction.atomic():
-                for row in reader:
-                    nombre_escrito = row.get("nombre_escrito", "").strip()
-
-                    f_pres = self.parse_datetime(row.get("fecha_presentacion"))
-                    f_firma = self.parse_datetime(row.get("fecha_firma"))
-                    f_pub = self.parse_datetime(row.get("fecha_publicacion"))
-
-                    defaults_data = {
-                        "link_escrito": row.get("link_escrito", "")[:500],
-                        "fecha_presentacion": f_pres,
-                        "tipo": row.get("tipo", "")[:100],
-                        "estado": row.get("estado", "")[:100],
-                        "generado_por": row.get("generado_por", "")[:255],
-                        "descripcion": row.get("descripcion", ""),
-                        "fecha_firma": f_firma,
-                        "fecha_publicacion": f_pub,
-                    }
+        self.encolar_importacion(
+            form,
+            tipo=ImportJob.Tipo.MOVIMIENTOS,
+            archivo=csv_file,
+            expediente=expediente,
+        )
+        return super().form_valid(form)
 
-                    if nombre_escrito:
-                        _, created = Movimiento.objects.update_or_create(
-                            expediente=expediente,
-                            nombre_escrito=nombre_escrito,
-                            defaults=defaults_data,
-                        )
-                    # Fallback si no hay ID de escrito
-                    elif f_pres:
-                        _, created = Movimiento.objects.update_or_create(
-                            expediente=expediente,
-                            fecha_presentacion=f_pres,
-                            tipo=row.get("tipo", "")[:100],
-                            defaults={**defaults_data, "nombre_escrito": ""},
-                        )
-                    else:
-                        Movimiento.objects.create(
-                            expediente=expediente,
-                            **defaults_data,
-                        )
-                        created = True
-
-                    if created:
-                        creados += 1
-                    else:
-                        actualizados += 1
-
-            messages.success(
-                self.request,
-                f"Proceso completado con corrección automática de líneas: "
-                f"{creados} nuevos, {actualizados} actualizados.",
-            )
 
-        except Exception as e:  # noqa: BLE001
-            messages.error(self.request, f"Error procesando archivo: {e}")
+class MovimientoUploadView(LoginRequiredMixin, ImportacionMixin, FormView):
+    """Importación de movimientos de varios expedientes en un solo archivo."""
+
+    template_name = "casos/movimiento_upload.html"
+    form_class = MovimientoGlobalUploadForm
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["titulo"] = "Importar Movimientos de varios Expedientes"
+        context["ayuda"] = (
+            "Sube un CSV combinado o un ZIP con varios CSV. "
+            "Los expedientes deben estar importados previamente; "
+            "las filas de expedientes desconocidos se informan como errores."
+        )
+        return context
+
+    def form_valid(self, form):
+        archivo = form.cleaned_data["archivo_csv"]
+        nombre = archivo.name.lower()
+
+        if nombre.endswith(".zip"):
+            es_zip_valido = zipfile.is_zipfile(archivo)
+            archivo.seek(0)
+            if not es_zip_valido:
+                messages.error(self.request, "El archivo ZIP no es válido.")
+                return self.form_invalid(form)
+        elif not nombre.endswith(".csv"):
+            messages.error(self.request, "El archivo debe ser un CSV o un ZIP.")
             return self.form_invalid(form)
 
+        self.encolar_importacion(
+            form,
+            tipo=ImportJob.Tipo.MOVIMIENTOS_GLOBAL,
+            archivo=archivo,
+        )
         return super().form_valid(form)
+
+
+class ImportJobDetailView(LoginRequiredMixin, DetailView):
+    model = ImportJob
+    template_name = "casos/importjob_detail.html"
+    context_object_name = "import_job"
+
+
+class ImportJobEstadoView(LoginRequiredMixin, DetailView):
+    """
+    Endpoint de consulta del progreso de una importación. Devuelve JSON, o
+    el fragmento HTML de progreso si lo pide htmx.
+    """
+
+    model = ImportJob
+    template_name = "casos/partials/importjob_progreso.html"
+    context_object_name = "import_job"
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.headers.get("HX-Request"):
+            return super().render_to_response(context, **response_kwargs)
+        job = self.object
+        return JsonResponse(
+            {
+                "id": job.pk,
+                "tipo": job.tipo,
+                "estado": job.estado,
+                "terminado": job.terminado,
+                "filas_procesadas": job.filas_procesadas,
+                "creados": job.creados,
+                "actualizados": job.actualizados,
+                "sin_cambios": job.sin_cambios,
+                "tareas_creadas": job.tareas_creadas,
+                "filas_con_error": job.filas_con_error,
+                "ultima_fila_confirmada": job.ultima_fila_confirmada,
+                "completa": job.completa,
+                "bloques_totales": job.bloques_totales,
+                "bloques_omitidos": job.bloques_omitidos,
+                "errores": job.errores,
+                "filas_por_segundo": job.filas_por_segundo,
+                "duracion": job.duracion,
+                "fecha_inicio": job.fecha_inicio,
+                "fecha_fin": job.fecha_fin,
+            },
+        )
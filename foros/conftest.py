@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 
 from foros.users.models import User
 from foros.users.tests.factories import UserFactory
@@ -9,6 +10,12 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _cache():
+    # La caché en memoria no vuelve atrás con la base de cada test.
+    cache.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()